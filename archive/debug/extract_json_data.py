@@ -1,35 +1,22 @@
-import requests
-from bs4 import BeautifulSoup
 import json
-import html
+import os
+import sys
+
+# Add clean_scrapers to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'clean_scrapers'))
+
+from wbsc_http import get_default_client
+from wbsc_page_data import fetch_page_data, get_default_page_cache
 
 def extract_react_data():
     """Extract the React data from the WBSC page"""
     url = "https://www.wbsceurope.org/en/events/2025-u-18-womens-softball-european-championship/schedule-and-results"
     
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-    }
-    
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
+        # Conditional GET - unchanged pages come from the page cache
+        page_data = fetch_page_data(get_default_client(), url, get_default_page_cache())
         
-        # Find the div with data-page attribute
-        data_div = soup.find('div', {'data-page': True})
-        
-        if data_div:
-            # Get the JSON data
-            data_page = data_div.get('data-page')
-            
-            # Decode HTML entities
-            decoded_data = html.unescape(data_page)
-            
-            # Parse JSON
-            page_data = json.loads(decoded_data)
-            
+        if page_data:
             print("=== EXTRACTED PAGE DATA ===")
             print(json.dumps(page_data, indent=2)[:2000] + "...")
             
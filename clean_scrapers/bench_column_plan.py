@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the stats table column plan
+Converts a synthetic 300-player table once with the former per-row alias
+lookup and once with a ColumnPlan built from the header row
+"""
+
+import argparse
+import random
+import time
+
+from wbsc_columns import ColumnPlan, HTML_FIELD_ALIASES, WBSC_FIELD_ALIASES
+from wbsc_text import fix_text_encoding
+
+HEADERS = ['#', 'Player', 'Team', 'G', 'AB', 'R', 'H', '2B', '3B', 'HR', 'RBI', 'TB',
+           'AVG', 'SLG', 'OBP', 'OPS', 'BB', 'HBP', 'SO', 'GDP', 'SF', 'SH', 'SB', 'CS']
+
+
+def build_table(players: int, seed: int = 1):
+    """Header row plus one row of cell texts per player"""
+    rng = random.Random(seed)
+    teams = ['CZE', 'NED', 'ITA', 'GER', 'ESP', 'GBR', 'FRA', 'BEL']
+
+    rows = []
+    for index in range(players):
+        cells = [str(index + 1), f"SURNAME{index}Firstname", rng.choice(teams)]
+        cells += [rng.choice(['-', str(rng.randint(0, 30))]) for _ in HEADERS[3:12]]
+        cells += [f".{rng.randint(0, 999):03d}" for _ in HEADERS[12:16]]
+        cells += [rng.choice(['', '-', str(rng.randint(0, 9))]) for _ in HEADERS[16:]]
+        rows.append(cells)
+
+    return HEADERS, rows
+
+
+def legacy_convert(headers, rows, field_aliases):
+    """Former behaviour: row dict per player, alias lists scanned for every row"""
+    headers = [header.lower() for header in headers]
+    players = []
+
+    for cells in rows:
+        player_data = {}
+        for i, cell_text in enumerate(cells):
+            if i < len(headers) and cell_text and cell_text not in ['-', '', '—']:
+                player_data[headers[i]] = cell_text
+
+        player_data_lower = {k.lower(): v for k, v in player_data.items()}
+        player = {}
+        for field, possible_names in field_aliases.items():
+            for name in possible_names:
+                if name.lower() in player_data_lower:
+                    value = player_data_lower[name.lower()]
+                    if isinstance(value, str) and field in ['name', 'team']:
+                        value = fix_text_encoding(value)
+                    player[field] = value
+                    break
+        players.append(player)
+
+    return players
+
+
+def plan_convert(headers, rows, field_aliases):
+    """Column plan built once from the header row"""
+    plan = ColumnPlan(headers, field_aliases, lowercase=True)
+    return [plan.convert(cells) for cells in rows]
+
+
+def best_ms(func, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the stats table column plan')
+    parser.add_argument('--players', type=int, default=300, help='Rows in the synthetic table (default: 300)')
+    parser.add_argument('--runs', type=int, default=20, help='Runs per variant, the best is reported (default: 20)')
+    args = parser.parse_args()
+
+    headers, rows = build_table(args.players)
+
+    print(f"⏱️  Column plan benchmark ({args.players} players, {len(headers)} columns)")
+    print("=" * 60)
+
+    for label, aliases in [('HTML aliases', HTML_FIELD_ALIASES), ('WBSC aliases', WBSC_FIELD_ALIASES)]:
+        assert legacy_convert(headers, rows, aliases) == plan_convert(headers, rows, aliases), \
+            f"Column plan result differs from the per-row lookup ({label})"
+
+        legacy_ms = best_ms(lambda: legacy_convert(headers, rows, aliases), args.runs)
+        plan_ms = best_ms(lambda: plan_convert(headers, rows, aliases), args.runs)
+        print(f"{label:<14} per-row lookup {legacy_ms:6.2f} ms   column plan {plan_ms:6.2f} ms   "
+              f"{legacy_ms / plan_ms:4.1f}x")
+
+
+if __name__ == "__main__":
+    main()
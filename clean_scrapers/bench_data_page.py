@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the data-page extraction
+Compares the byte-level extractor with parsing the page into a
+BeautifulSoup tree, on archive/debug/page_debug.html by default
+"""
+
+import argparse
+import html
+import json
+import os
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+from wbsc_html import backend_available, extract_data_page_attribute
+from wbsc_page_data import parse_data_page
+
+DEFAULT_FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'archive', 'debug', 'page_debug.html')
+
+
+def _soup_extract(content: bytes) -> dict:
+    """Previous behaviour: full html.parser tree, then unescape and json.loads"""
+    data_div = BeautifulSoup(content, 'html.parser').find('div', {'data-page': True})
+    return json.loads(html.unescape(data_div.get('data-page')))
+
+
+def measure(func, runs: int):
+    """Best wall time in ms and peak allocation in KB of a call"""
+    func()  # Warm up
+
+    best_ms = min(_timed(func) for _ in range(runs))
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return best_ms, peak // 1024
+
+
+def _timed(func) -> float:
+    started = time.perf_counter()
+    func()
+    return (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark data-page extraction')
+    parser.add_argument('--file', default=DEFAULT_FIXTURE, help='HTML page with a data-page attribute')
+    parser.add_argument('--runs', type=int, default=10, help='Runs per variant, the best is reported (default: 10)')
+    parser.add_argument('--only', nargs='+', default=['games', 'tournament'], help='Props for the partial decode')
+    args = parser.parse_args()
+
+    with open(args.file, 'rb') as f:
+        content = f.read()
+
+    expected = _soup_extract(content)
+    variants = [('html.parser tree', lambda: _soup_extract(content))]
+    if backend_available('lxml'):
+        variants.append(('lxml strainer', lambda: json.loads(extract_data_page_attribute(content, 'lxml'))))
+    variants.append(('byte-level', lambda: parse_data_page(content)))
+    variants.append((f"byte-level, only {','.join(args.only)}", lambda: parse_data_page(content, only=args.only)))
+
+    assert parse_data_page(content) == expected, "Byte-level extraction differs from the BeautifulSoup result"
+
+    print(f"⏱️  data-page extraction on {os.path.basename(args.file)} ({len(content) // 1024} KB)")
+    print("=" * 60)
+
+    baseline_ms = None
+    for name, func in variants:
+        best_ms, peak_kb = measure(func, args.runs)
+        baseline_ms = baseline_ms or best_ms
+        print(f"{name:<36} {best_ms:7.1f} ms  {baseline_ms / best_ms:5.1f}x  peak {peak_kb:6d} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark of the complete tournament scrape
+Replays a recorded cassette (see --record on the scrapers) through
+WBSCCompleteRoundScraper, with a fresh page cache every run so each run
+downloads and parses the same pages
+"""
+
+import argparse
+import logging
+import statistics
+import tempfile
+import time
+
+from wbsc_cassette import DEFAULT_CASSETTE_DIR, install_cassette
+from wbsc_http import WBSCHttpClient
+from wbsc_page_data import PageDataCache
+from wbsc_standings_scraper import WBSCCompleteRoundScraper
+
+
+def run_once(url: str, http_client: WBSCHttpClient, cache_dir: str) -> float:
+    """Wall time in ms of one complete scrape from a cold page cache"""
+    scraper = WBSCCompleteRoundScraper(url, 0, http_client)
+    scraper.games_scraper.page_cache = PageDataCache(cache_dir)
+
+    started = time.perf_counter()
+    complete_data = scraper.scrape_complete_tournament_with_rounds()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    assert complete_data['summary']['total_games'], f"No games replayed for {url} - was it recorded?"
+    return elapsed_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the complete scrape offline from a cassette')
+    parser.add_argument('url', help='Base URL of the recorded tournament')
+    parser.add_argument('--cassette-dir', default=DEFAULT_CASSETTE_DIR, help='Cassette directory (default: ../cassettes)')
+    parser.add_argument('--runs', type=int, default=10, help='Measured runs (default: 10)')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every replayed response (default: 0)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    http_client = WBSCHttpClient()
+    install_cassette(http_client, 'replay', args.cassette_dir, args.latency)
+
+    timings = []
+    for run in range(args.runs + 1):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            elapsed_ms = run_once(args.url.rstrip('/'), http_client, cache_dir)
+        # The first run warms up imports and the text caches
+        if run:
+            timings.append(elapsed_ms)
+
+    print(f"\n⏱️  Complete scrape replayed from cassette ({args.runs} runs, latency {args.latency}s)")
+    print("=" * 60)
+    print(f"best {min(timings):8.1f} ms   median {statistics.median(timings):8.1f} ms   worst {max(timings):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmark of the processing pipeline on synthetic tournaments
+Generates tournaments of growing size (see wbsc_synthetic) and times every
+stage after the download - game processing, standings, Instagram posts,
+stats and the save routines - per size. The growth exponent between the
+smallest and the largest size shows how a stage scales: about 1 is
+linear, about 2 is quadratic.
+"""
+
+import argparse
+import contextlib
+import io
+import logging
+import math
+import os
+import sys
+import tempfile
+import time
+
+from wbsc_http import WBSCHttpClient
+from wbsc_instagram_generator import create_comprehensive_tournament_posts
+from wbsc_page_data import parse_data_page
+from wbsc_standings_engine import StandingsEngine
+from wbsc_synthetic import generate_tournament
+
+BENCH_URL = 'https://www.wbsceurope.org/en/events/synthetic-tournament'
+
+
+def _timed(func) -> float:
+    started = time.perf_counter()
+    func()
+    return (time.perf_counter() - started) * 1000
+
+
+def best_ms(func, runs: int) -> float:
+    """Best wall time in ms of a call after a warm-up call (printed output is discarded)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        func()
+        return min(_timed(func) for _ in range(runs))
+
+
+def measure_size(games: int, players: int, rounds: int, runs: int, out_dir: str):
+    """
+    Time every stage on one generated tournament
+
+    Returns:
+        (stage name, unit, ms) per stage; unit is 'games' or 'players'
+    """
+    from wbsc_game_scraper import WBSCTournamentScraper
+    from wbsc_standings_scraper import WBSCCompleteRoundScraper
+    from wbsc_stats_scraper import WBSCStatscraper
+
+    tournament = generate_tournament(games, players, rounds)
+    games_html = tournament.games_html()
+
+    http_client = WBSCHttpClient()
+    scraper = WBSCCompleteRoundScraper(BENCH_URL, 0, http_client)
+    games_scraper = WBSCTournamentScraper(f"{BENCH_URL}/schedule-and-results", 0, http_client)
+    stats_scraper = WBSCStatscraper(f"{BENCH_URL}/stats", 0, http_client)
+
+    # Every stage runs on the output of the previous ones, as in the complete scrape
+    page = parse_data_page(games_html)
+    raw_games, tournament_props = page['props']['games'], page['props']['tournament']
+    processed = [games_scraper._process_game_data(game, tournament_props) for game in raw_games]
+    round_standings = scraper.parse_all_rounds_standings(tournament.standings_html)
+
+    def engine_standings() -> StandingsEngine:
+        engine = StandingsEngine()
+        engine.apply_games(processed)
+        engine.set_round_names({tab_id: name for name, tab_id in scraper.round_ids.items()})
+        engine.all_rounds_standings()
+        return engine
+
+    engine = engine_standings()
+    complete_data = {
+        'tournament_info': {'name': tournament_props['tournamentname'], 'base_url': BENCH_URL},
+        'games': processed,
+        'round_standings': round_standings,
+        'projected_positions': engine.all_projected_positions(seed=0),
+        'summary': {'total_games': len(processed), 'rounds': list(round_standings)}
+    }
+    assert not engine.reconcile(round_standings), "Generated standings page does not match the games"
+
+    def stats_from_props():
+        return {category: stats_scraper._extract_players_from_props({'stats': rows}, category)
+                for category, rows in tournament.stats.items()}
+
+    stats = stats_from_props()
+
+    stages = [
+        ('decode data-page', 'games', lambda: parse_data_page(games_html)),
+        ('_process_game_data', 'games',
+         lambda: [games_scraper._process_game_data(game, tournament_props) for game in raw_games]),
+        ('standings engine', 'games', engine_standings),
+        ('parse standings page', 'games', lambda: scraper.parse_all_rounds_standings(tournament.standings_html)),
+        ('reconcile', 'games', lambda: engine.reconcile(round_standings)),
+        ('projected positions', 'games', lambda: engine.all_projected_positions(seed=0)),
+        ('instagram posts', 'games', lambda: create_comprehensive_tournament_posts(complete_data)),
+        ('save complete tournament', 'games',
+         lambda: scraper.save_complete_tournament(complete_data, os.path.join(out_dir, 'complete'))),
+        ('save round standings', 'games',
+         lambda: scraper.save_round_based_standings(round_standings, os.path.join(out_dir, 'standings'))),
+        ('stats from props', 'players', stats_from_props),
+        ('save stats', 'players', lambda: stats_scraper.save_results(stats, os.path.join(out_dir, 'stats'))),
+    ]
+    return [(name, unit, best_ms(func, runs)) for name, unit, func in stages]
+
+
+def growth_exponent(sizes, timings) -> float:
+    """Slope of log(time) over log(size) between the smallest and the largest size"""
+    if timings[0] <= 0 or sizes[-1] == sizes[0]:
+        return 0.0
+    return math.log(timings[-1] / timings[0]) / math.log(sizes[-1] / sizes[0])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark how the pipeline scales with tournament size')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[250, 500, 1000, 2000],
+                        help='Games per generated tournament (default: 250 500 1000 2000)')
+    parser.add_argument('--players-per-game', type=float, default=5, help='Players per game (default: 5)')
+    parser.add_argument('--rounds', type=int, default=5, help='Rounds per tournament (default: 5)')
+    parser.add_argument('--runs', type=int, default=3, help='Runs per stage, the best is reported (default: 3)')
+    parser.add_argument('--max-exponent', type=float, default=1.5,
+                        help='Flag stages growing faster than size^x and exit with 1 (default: 1.5)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    sizes = sorted(set(args.sizes))
+    results = {}
+    units = {}
+    player_counts = [int(games * args.players_per_game) for games in sizes]
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        for games, players in zip(sizes, player_counts):
+            print(f"… {games} games, {players} players", file=sys.stderr)
+            for name, unit, ms in measure_size(games, players, args.rounds, args.runs, out_dir):
+                results.setdefault(name, []).append(ms)
+                units[name] = unit
+
+    print(f"\n⏱️  Pipeline stages by tournament size (best of {args.runs}, ms)")
+    print("=" * (28 + 11 * len(sizes) + 10))
+    print(f"{'games':<28}" + ''.join(f"{games:>11}" for games in sizes) + f"{'exponent':>10}")
+    print(f"{'players':<28}" + ''.join(f"{players:>11}" for players in player_counts))
+
+    flagged = []
+    for name, timings in results.items():
+        counts = sizes if units[name] == 'games' else player_counts
+        exponent = growth_exponent(counts, timings)
+        flag = ''
+        if exponent > args.max_exponent:
+            flag = '  ⚠️  superlinear'
+            flagged.append(name)
+        print(f"{name:<28}" + ''.join(f"{ms:>11.1f}" for ms in timings) + f"{exponent:>10.2f}{flag}")
+
+    if flagged:
+        print(f"\n⚠️  Growing faster than size^{args.max_exponent}: {', '.join(flagged)}")
+        sys.exit(1)
+    print(f"\n✅ All stages grow at most like size^{args.max_exponent}")
+
+
+if __name__ == "__main__":
+    main()
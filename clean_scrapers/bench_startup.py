@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Startup-time benchmark for the CLI scripts
+Measures the import time of every entry point with `python -X importtime`
+and compares it against a budget, so heavy imports do not creep back in
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import List, Tuple
+
+# Budget per entry point in milliseconds (cumulative import time of the module)
+STARTUP_BUDGETS_MS = {
+    'wbsc_game_scraper': 300,
+    'wbsc_standings_scraper': 300,
+    'wbsc_stats_scraper': 350,
+    'wbsc_instagram_generator': 50,
+    'wbsc_batch': 300
+}
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def measure_import(module: str) -> Tuple[float, List[Tuple[float, str]]]:
+    """
+    Import a module in a fresh interpreter with -X importtime
+
+    Returns:
+        (cumulative import time of the module in ms, slowest imports as (ms, name))
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=SCRIPTS_DIR, capture_output=True, text=True, check=True
+    )
+
+    total_ms = 0.0
+    imports = []
+    for line in result.stderr.splitlines():
+        # Format: "import time:  self [us] | cumulative | imported package"
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+
+        _, cumulative, name = line[len('import time:'):].split('|')
+        cumulative_ms = int(cumulative) / 1000
+        depth = len(name) - len(name.lstrip())
+        imports.append((cumulative_ms, name.strip(), depth))
+
+        if name.strip() == module:
+            total_ms = cumulative_ms
+
+    # Direct imports of the entry point show which dependency is heavy.
+    # importtime lists children before their parent, one indentation level deeper.
+    direct = []
+    module_index = next(i for i, (_, name, _) in enumerate(imports) if name == module)
+    module_depth = imports[module_index][2]
+    for ms, name, depth in reversed(imports[:module_index]):
+        if depth <= module_depth:
+            break
+        if depth == module_depth + 2:
+            direct.append((ms, name))
+
+    return total_ms, sorted(direct, reverse=True)[:5]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark CLI startup time against a budget')
+    parser.add_argument('--runs', type=int, default=5, help='Runs per entry point, the median is reported (default: 5)')
+    parser.add_argument('--verbose', action='store_true', help='Show the slowest imports of each entry point')
+    args = parser.parse_args()
+
+    print("⏱️  Startup benchmark (python -X importtime)")
+    print("=" * 60)
+
+    over_budget = []
+    for module, budget_ms in STARTUP_BUDGETS_MS.items():
+        runs = [measure_import(module) for _ in range(args.runs)]
+        median_ms = statistics.median(total for total, _ in runs)
+
+        status = "✅" if median_ms <= budget_ms else "❌"
+        print(f"{status} {module:<28} {median_ms:7.1f} ms  (budget {budget_ms} ms)")
+
+        if args.verbose:
+            for ms, name in runs[-1][1]:
+                print(f"      {ms:7.1f} ms  {name}")
+
+        if median_ms > budget_ms:
+            over_budget.append(module)
+
+    if over_budget:
+        print(f"\n❌ Over budget: {', '.join(over_budget)}")
+        sys.exit(1)
+
+    print("\n✅ All entry points within budget")
+
+
+if __name__ == "__main__":
+    main()
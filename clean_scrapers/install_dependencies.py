@@ -44,6 +44,12 @@ def main():
         ("webdriver-manager", "Automatisches ChromeDriver Management")
     ]
     
+    # Optional packages for the standings tiebreakers and faster parsing
+    performance_packages = [
+        ("numpy", "Tiebreaker-Matrizen (Direktvergleich, TQB) der lokalen Tabellen"),
+        ("selectolax", "Schnellerer HTML-Parser für data-page")
+    ]
+    
     print("📦 Installiere erforderliche Pakete...")
     success_count = 0
     for package in required_packages:
@@ -73,6 +79,18 @@ def main():
             print("   - brew install chromedriver  (macOS)")
             print("   - oder webdriver-manager wird es automatisch herunterladen")
     
+    print("\n⚡ Installiere optionale Pakete für Tiebreaker und schnelleres Parsen...")
+    response = input("Möchten Sie die Tiebreaker- und Performance-Pakete installieren? (j/n): ").lower().strip()
+    
+    if response in ['j', 'ja', 'y', 'yes']:
+        performance_success = 0
+        for package, description in performance_packages:
+            print(f"\n📥 Installiere {package} - {description}")
+            if install_package(package):
+                performance_success += 1
+        
+        print(f"\n✅ {performance_success}/{len(performance_packages)} Tiebreaker- und Performance-Pakete installiert")
+    
     print("\n🎉 Installation abgeschlossen!")
     print("\nSie können jetzt das Statistik-Scraping verwenden:")
     print("python wbsc_stats_scraper.py --url 'https://...' --debug")
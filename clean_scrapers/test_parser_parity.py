@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Parity test for the HTML parser backends
+Runs the data-page, standings and stats extraction on the archived debug
+pages with every installed backend and compares the results against a full
+html.parser parse (the previous behaviour)
+"""
+
+import glob
+import html
+import json
+import logging
+import os
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+from wbsc_html import PARSER_BACKENDS, backend_available, make_soup, STATS_STRAINER
+from wbsc_page_data import parse_data_page
+from wbsc_standings_scraper import WBSCRoundBasedStandingsScraper
+from wbsc_stats_scraper import WBSCStatscraper
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'archive', 'debug')
+
+# Fixture with a filled batting table, so the stats comparison is not vacuous
+STATS_FIXTURE = 'stats_page.html'
+
+
+def _without_timestamps(value):
+    """Drop the scraped_at fields, which differ between runs"""
+    if isinstance(value, dict):
+        return {key: _without_timestamps(item) for key, item in value.items() if key != 'scraped_at'}
+    if isinstance(value, list):
+        return [_without_timestamps(item) for item in value]
+    return value
+
+
+def _reference_results(content):
+    """Results with the whole document parsed by html.parser"""
+    data_div = BeautifulSoup(content, 'html.parser').find('div', {'data-page': True})
+    data_page = json.loads(html.unescape(data_div.get('data-page'))) if data_div else None
+
+    standings = WBSCRoundBasedStandingsScraper('http://fixture/standings', delay=0)
+    stats = WBSCStatscraper('http://fixture/stats')
+
+    return {
+        'data_page': data_page,
+        'standings': _without_timestamps(standings._extract_all_rounds_standings(BeautifulSoup(content, 'html.parser'))),
+        'stats': _without_timestamps(stats._extract_category_from_page(BeautifulSoup(content, 'html.parser'), 'batting'))
+    }
+
+
+def _backend_results(content, backend):
+    """Results with the partial parse of the given backend"""
+    standings = WBSCRoundBasedStandingsScraper('http://fixture/standings', delay=0)
+    stats = WBSCStatscraper('http://fixture/stats')
+
+    return {
+        'data_page': parse_data_page(content, backend),
+        'standings': _without_timestamps(standings.parse_all_rounds_standings(content, backend)),
+        'stats': _without_timestamps(stats._extract_category_from_page(make_soup(content, STATS_STRAINER, backend),
+                                                                       'batting'))
+    }
+
+
+def test_parser_parity():
+    """Every installed backend yields the same results as html.parser on all fixtures"""
+    fixtures = sorted(glob.glob(os.path.join(FIXTURES_DIR, '*.html')))
+    assert fixtures, f"No fixtures found in {FIXTURES_DIR}"
+    assert os.path.join(FIXTURES_DIR, STATS_FIXTURE) in fixtures, f"Missing stats fixture {STATS_FIXTURE}"
+
+    backends = [backend for backend in PARSER_BACKENDS if backend_available(backend)]
+    mismatches = []
+
+    for path in fixtures:
+        with open(path, 'rb') as f:
+            content = f.read()
+
+        reference = _reference_results(content)
+        print(f"\n📄 {os.path.basename(path)} ({len(content) // 1024} KB, {len(reference['stats'])} players)")
+        if os.path.basename(path) == STATS_FIXTURE:
+            assert reference['stats'], f"No players extracted from {STATS_FIXTURE}"
+
+        for backend in backends:
+            started = time.perf_counter()
+            results = _backend_results(content, backend)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+
+            for key, expected in reference.items():
+                if results[key] != expected:
+                    mismatches.append(f"{os.path.basename(path)}: {key} differs with {backend}")
+
+            status = "✅" if all(results[key] == reference[key] for key in reference) else "❌"
+            print(f"   {status} {backend:<12} {elapsed_ms:7.1f} ms")
+
+    assert not mismatches, "\n".join(mismatches)
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+
+    print("🧪 Test: Parser backend parity on archive/debug fixtures")
+    print("=" * 60)
+
+    try:
+        test_parser_parity()
+        tested_backends = [backend for backend in PARSER_BACKENDS if backend_available(backend)]
+        print(f"\n🎉 All fixtures identical with: {', '.join(tested_backends)}")
+    except AssertionError as e:
+        print(f"\n❌ Parity check failed:\n{e}")
+        sys.exit(1)
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Tests for the local standings engine and the WBSC tiebreakers
+The archived schedule (archive/debug/page_debug.html) must reproduce the
+archived standings page; small hand-made groups cover records, games
+behind, score corrections and the head-to-head/TQB ordering.
+"""
+
+import logging
+import os
+import sys
+
+import pytest
+
+from wbsc_page_data import parse_data_page
+from wbsc_standings_engine import NUMPY_AVAILABLE, StandingsEngine, innings_batted
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'archive', 'debug')
+
+requires_numpy = pytest.mark.skipif(not NUMPY_AVAILABLE, reason="tiebreakers need NumPy")
+
+
+def _fixture_games_and_standings():
+    """Processed games of page_debug.html and the parsed standings_page.html with its round names"""
+    from wbsc_game_scraper import WBSCTournamentScraper
+    from wbsc_standings_scraper import WBSCCompleteRoundScraper
+
+    with open(os.path.join(FIXTURES_DIR, 'page_debug.html'), 'rb') as f:
+        page = parse_data_page(f.read())
+    games_scraper = WBSCTournamentScraper('http://fixture/schedule-and-results', 0)
+    games = [games_scraper._process_game_data(game, page['props']['tournament']) for game in page['props']['games']]
+
+    scraper = WBSCCompleteRoundScraper('http://fixture', 0)
+    with open(os.path.join(FIXTURES_DIR, 'standings_page.html'), 'rb') as f:
+        standings = scraper.parse_all_rounds_standings(f.read())
+    round_names = {tab_id: name for name, tab_id in scraper.round_ids.items()}
+
+    return games, standings, round_names
+
+
+def _fixture_engine(tiebreakers: bool = True) -> StandingsEngine:
+    games, _, round_names = _fixture_games_and_standings()
+    engine = StandingsEngine()
+    engine.tiebreakers = tiebreakers and NUMPY_AVAILABLE
+    engine.apply_games(games)
+    engine.set_round_names(round_names)
+    return engine
+
+
+def _game(game_id, home, away, home_runs=0, away_runs=0, status='F', innings_played=7, group='Group A'):
+    """Processed game of round 1; all runs score in the first inning"""
+    innings = {'home': [home_runs] + [0] * (innings_played - 1), 'away': [away_runs] + [0] * (innings_played - 1)}
+    return {
+        'game_id': game_id, 'home_team': home, 'away_team': away, 'home_ioc': home, 'away_ioc': away,
+        'home_runs': home_runs, 'away_runs': away_runs, 'innings': innings, 'innings_played': innings_played,
+        'status': status, 'round_id': 1, 'round_name': 'Opening Round', 'group_name': group
+    }
+
+
+def _rows(engine: StandingsEngine, group: str = 'Group A'):
+    """team -> standings row of a group"""
+    return {row['team_ioc']: row for row in engine.group_standings(1, group)}
+
+
+def _order(engine: StandingsEngine, group: str = 'Group A'):
+    return [(row['position'], row['team_ioc']) for row in engine.group_standings(1, group)]
+
+
+def test_fixtures_reconcile_without_differences():
+    """The archived games reproduce every group of the archived standings page"""
+    games, standings, round_names = _fixture_games_and_standings()
+    engine = StandingsEngine()
+    engine.apply_games(games)
+    engine.set_round_names(round_names)
+
+    assert engine.all_rounds_standings()
+    assert engine.reconcile(standings) == []
+
+
+def test_reconcile_corrects_local_standings_to_the_page():
+    """A deliberate difference is reported once, repaired, and dropped when the games catch up"""
+    games, standings, round_names = _fixture_games_and_standings()
+    missing = next(game for game in games if game['round_name'] == 'Opening Round'
+                   and game['home_runs'] != game['away_runs'] and str(game['status']).upper() == 'F')
+    engine = StandingsEngine()
+    engine.apply_games([game for game in games if game is not missing])
+    engine.set_round_names(round_names)
+
+    discrepancies = engine.reconcile(standings)
+    assert {entry['team'] for entry in discrepancies} == {missing['home_ioc'], missing['away_ioc']}
+    assert engine.reconcile(standings) == []
+
+    # The corrections carry over to a new engine
+    restored = StandingsEngine()
+    restored.apply_games([game for game in games if game is not missing])
+    restored.set_round_names(round_names)
+    restored.load_corrections(engine.export_corrections())
+    assert restored.reconcile(standings) == []
+
+    # Once the missing game arrives the correction is taken out again
+    engine.apply_games([missing])
+    assert len(engine.reconcile(standings)) == 2
+    assert engine.export_corrections() == []
+    assert engine.reconcile(standings) == []
+
+
+@requires_numpy
+def test_head_to_head_ranks_ukraine_over_germany():
+    """UKR and GER are both 2-3 in Group Y; UKR won their game 9-2"""
+    rows = {row['team_ioc']: row for row in _fixture_engine().all_rounds_standings()['Opening Round']
+            if row['group'] == 'Group Y'}
+
+    assert rows['UKR']['statistics']['wins'] == rows['GER']['statistics']['wins'] == 2
+    assert rows['UKR']['statistics']['losses'] == rows['GER']['statistics']['losses'] == 3
+    assert (rows['UKR']['position'], rows['GER']['position']) == ('3', '4')
+
+
+def test_tie_shares_position_without_tiebreakers():
+    rows = {row['team_ioc']: row for row in _fixture_engine(tiebreakers=False).all_rounds_standings()['Opening Round']
+            if row['group'] == 'Group Y'}
+
+    assert rows['UKR']['position'] == rows['GER']['position'] == '3'
+
+
+def test_records_and_games_behind():
+    engine = StandingsEngine()
+    engine.apply_games([
+        _game(1, 'AAA', 'BBB', 5, 2),
+        _game(2, 'CCC', 'AAA', 3, 3),
+        _game(3, 'BBB', 'CCC', 4, 1),
+        _game(4, 'AAA', 'CCC', status='')
+    ])
+    rows = _rows(engine)
+
+    assert [rows[team]['statistics']['wins'] for team in ('AAA', 'BBB', 'CCC')] == [1, 1, 0]
+    assert [rows[team]['statistics']['losses'] for team in ('AAA', 'BBB', 'CCC')] == [0, 1, 1]
+    assert [rows[team]['statistics']['ties'] for team in ('AAA', 'BBB', 'CCC')] == [1, 0, 1]
+    assert rows['AAA']['statistics']['pct'] == 0.5
+    # Whole games behind are ints, half games floats
+    assert [rows[team]['statistics']['gb'] for team in ('AAA', 'BBB', 'CCC')] == [0, 0.5, 1]
+
+
+def test_scheduled_games_only_register_teams():
+    engine = StandingsEngine()
+    engine.apply_games([_game(1, 'AAA', 'BBB', status='')])
+    rows = _rows(engine)
+
+    assert set(rows) == {'AAA', 'BBB'}
+    assert all(row['statistics']['wins'] + row['statistics']['losses'] == 0 for row in rows.values())
+
+
+def test_score_correction_and_revert():
+    engine = StandingsEngine()
+    engine.apply_games([_game(1, 'AAA', 'BBB', 5, 2), _game(2, 'BBB', 'CCC', 1, 0)])
+
+    # A corrected final score replaces the applied result
+    assert engine.apply_game(_game(1, 'AAA', 'BBB', 2, 5)) == ('1', 'Group A')
+    rows = _rows(engine)
+    assert (rows['AAA']['statistics']['losses'], rows['BBB']['statistics']['wins']) == (1, 2)
+
+    # Applying the same game again changes nothing
+    assert engine.apply_game(_game(1, 'AAA', 'BBB', 2, 5)) is None
+
+    # A game set back to scheduled takes its result out again
+    engine.apply_game(_game(1, 'AAA', 'BBB', 2, 5, status=''))
+    rows = _rows(engine)
+    assert (rows['AAA']['statistics']['losses'], rows['BBB']['statistics']['wins']) == (0, 1)
+
+    # So does a game that disappeared from the schedule
+    assert engine.remove_game(2) == ('1', 'Group A')
+    assert all(row['statistics']['wins'] == 0 for row in _rows(engine).values())
+
+
+@requires_numpy
+def test_head_to_head_breaks_two_team_tie():
+    engine = StandingsEngine()
+    engine.apply_games([
+        _game(1, 'AAA', 'BBB', 1, 2),
+        _game(2, 'AAA', 'CCC', 4, 0),
+        _game(3, 'BBB', 'DDD', 0, 3)
+    ])
+
+    # AAA and BBB are both 1-1; BBB won their game
+    assert _order(engine) == [('1', 'DDD'), ('2', 'BBB'), ('3', 'AAA'), ('4', 'CCC')]
+
+    engine.tiebreakers = False
+    engine.set_round_names({})
+    assert _order(engine)[1:3] == [('2', 'AAA'), ('2', 'BBB')]
+
+
+@requires_numpy
+def test_tqb_then_head_to_head_break_three_team_circle():
+    engine = StandingsEngine()
+    engine.apply_games([
+        _game(1, 'AAA', 'BBB', 5, 0),
+        _game(2, 'BBB', 'CCC', 3, 0),
+        _game(3, 'CCC', 'AAA', 2, 1)
+    ])
+
+    # Head-to-head is 1-1 for everyone; AAA has the best TQB, BBB and CCC tie
+    # on TQB and start over with head-to-head, which BBB won
+    assert _order(engine) == [('1', 'AAA'), ('2', 'BBB'), ('3', 'CCC')]
+
+
+def test_innings_batted():
+    # The home team skips the bottom of the last inning when it leads
+    assert innings_batted(_game(1, 'AAA', 'BBB', 5, 2)) == ((6.0, 7.0) if NUMPY_AVAILABLE else (0.0, 0.0))
+    # A trailing home team bats every inning
+    assert innings_batted(_game(1, 'AAA', 'BBB', 2, 5)) == ((7.0, 7.0) if NUMPY_AVAILABLE else (0.0, 0.0))
+    # Unknown game length
+    assert innings_batted(_game(1, 'AAA', 'BBB', 2, 5, innings_played=0)) == (0.0, 0.0)
+
+
+@requires_numpy
+def test_innings_batted_walk_off_and_shortened_game():
+    from wbsc_tiebreakers import innings_batted as matrix_innings_batted
+
+    walk_off = _game(1, 'AAA', 'BBB', 0, 2, innings_played=9)
+    walk_off['innings']['home'][8] = 3
+    walk_off['home_runs'] = 3
+    assert matrix_innings_batted(walk_off) == (9.0, 9.0)
+
+    # Mercy rule after five innings; cells past the last inning are ignored
+    shortened = _game(1, 'AAA', 'BBB', 12, 0, innings_played=5)
+    shortened['innings']['home'] += ['X', '']
+    assert matrix_innings_batted(shortened) == (4.0, 5.0)
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    sys.exit(pytest.main([__file__, '-q']))
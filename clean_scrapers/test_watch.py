@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Tests for the incremental game sync and the live watch mode
+Hand-made raw games are synced against a state in a temporary directory;
+the poll scheduling and the watch loop run with a fixed clock and a
+recorded sleep instead of real time.
+"""
+
+import logging
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from wbsc_game_sync import GameSyncState, sync_games
+from wbsc_watch import (IDLE_INTERVAL, LIVE_INTERVAL, GameWatcher, change_set_events, is_live,
+                        next_poll_delay)
+
+NOW = datetime(2025, 7, 10, 12, 0, tzinfo=timezone.utc)
+
+
+def _raw_game(game_id, home_runs=0, away_runs=0, status='', start=NOW):
+    return {'id': game_id, 'homerun': home_runs, 'awayrun': away_runs, 'status': status,
+            'start': start.isoformat(), 'updated_at': 'volatile'}
+
+
+def _process(raw_game):
+    """Stand-in for WBSCTournamentScraper._process_game_data"""
+    return {'game_id': raw_game['id'], 'home_team': 'Home', 'away_team': 'Away',
+            'home_runs': raw_game['homerun'], 'away_runs': raw_game['awayrun'],
+            'status': raw_game['status'], 'start_utc': raw_game['start']}
+
+
+def _schedule(status='', start=NOW):
+    return {'status': status, 'start_utc': start.isoformat()}
+
+
+def test_sync_stages_until_commit(tmp_path):
+    state = GameSyncState('http://fixture/schedule-and-results', str(tmp_path))
+
+    change_set = sync_games([_raw_game(1), _raw_game(2)], state, _process)
+    assert [game['game_id'] for game in change_set['inserted']] == [1, 2]
+    # Nothing is seen before the change set is committed: the same games come again
+    assert state.games == {}
+    assert len(sync_games([_raw_game(1), _raw_game(2)], state, _process)['inserted']) == 2
+
+    state.commit()
+    assert set(GameSyncState(state.url, str(tmp_path)).games) == {'1', '2'}
+
+    # Volatile fields alone are no change; a new score is, and a missing game is removed
+    unchanged = _raw_game(1)
+    unchanged['updated_at'] = 'later'
+    change_set = sync_games([unchanged, _raw_game(3, 2, 1, 'T1')], state, _process)
+    assert (change_set['unchanged'], change_set['removed']) == (1, ['2'])
+    assert [game['game_id'] for game in change_set['inserted']] == [3]
+
+    state.commit()
+    change_set = sync_games([unchanged, _raw_game(3, 4, 1, 'T2')], state, _process)
+    assert change_set['changed'][0]['changes'] == ['score', 'status']
+    assert change_set['changed'][0]['previous']['home_runs'] == 2
+
+
+def test_is_live():
+    assert is_live(_schedule('T3'), NOW)
+    # From the pregame window until the longest game is over
+    assert is_live(_schedule(start=NOW + timedelta(minutes=10)), NOW)
+    assert not is_live(_schedule(start=NOW + timedelta(hours=1)), NOW)
+    assert not is_live(_schedule(start=NOW - timedelta(hours=5)), NOW)
+    assert not is_live(_schedule('F'), NOW)
+    assert not is_live(_schedule('POSTPONED'), NOW)
+    # Unscheduled games are only live with an in-game status
+    assert is_live({'status': 'B5'}, NOW)
+    assert not is_live({'status': ''}, NOW)
+
+
+def test_next_poll_delay():
+    assert next_poll_delay([_schedule('T3'), _schedule('F')], NOW) == (LIVE_INTERVAL, 'live')
+    assert next_poll_delay([_schedule(start=NOW + timedelta(hours=1))], NOW) == (IDLE_INTERVAL, 'between games')
+    # Polls stop close to the pregame window, but never faster than the live interval
+    assert next_poll_delay([_schedule(start=NOW + timedelta(minutes=15, seconds=5))], NOW) == (LIVE_INTERVAL, 'between games')
+    assert next_poll_delay([_schedule(start=NOW + timedelta(hours=10))], NOW) == (
+        timedelta(hours=9, minutes=45).total_seconds(), 'asleep')
+    assert next_poll_delay([_schedule('F'), _schedule('CANCELLED', NOW + timedelta(hours=1))], NOW) == (None, 'finished')
+    assert next_poll_delay([], NOW) == (None, 'finished')
+
+
+def test_change_set_events():
+    game = _process(_raw_game(1, 3, 2, 'F'))
+    change_set = {'synced_at': 'now', 'changed': [
+        {'game': game, 'changes': ['score', 'status'], 'previous': {'home_runs': 2, 'away_runs': 2, 'status': 'B7'}},
+        {'game': dict(game, status='T1'), 'changes': ['status'], 'previous': {'status': ''}},
+        {'game': dict(game, status='T2'), 'changes': ['score'], 'previous': {'status': 'T2'}},
+        {'game': game, 'changes': ['innings'], 'previous': {}}
+    ]}
+
+    events = change_set_events(change_set)
+    assert [event['type'] for event in events] == ['game_final', 'game_started', 'score_change']
+    assert (events[0]['previous_home_runs'], events[0]['summary']) == (2, 'Away 2-3 Home')
+
+
+class _Scraper:
+    """Scraper whose sync fails, raises or succeeds as scripted"""
+
+    base_url = 'http://fixture/schedule-and-results'
+
+    def __init__(self, results):
+        self.results = list(results)
+
+    def sync_games(self, state):
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        if result is None:
+            return None
+        return sync_games(result, state, _process)
+
+
+def _watcher(tmp_path, results):
+    watcher = GameWatcher(_Scraper(results))
+    watcher.state = GameSyncState(watcher.scraper.base_url, str(tmp_path))
+    watcher.now = lambda: NOW
+    watcher.sleeps = []
+    watcher.sleep = watcher.sleeps.append
+    return watcher
+
+
+def test_watch_retries_until_the_first_successful_sync(tmp_path):
+    watcher = _watcher(tmp_path, [None, RuntimeError('boom'), [], [_raw_game(1, status='F')]])
+    watcher.run(max_polls=10)
+
+    # Failed polls back off from the idle interval; finished only after the sync
+    assert watcher.polls == 4
+    assert watcher.sleeps == [IDLE_INTERVAL, 2 * IDLE_INTERVAL, 4 * IDLE_INTERVAL]
+
+
+def test_watch_polls_live_games_and_commits_events(tmp_path):
+    events = []
+    watcher = _watcher(tmp_path, [[_raw_game(1, status='T1')], None, [_raw_game(1, 1, 0, 'T2')],
+                                  [_raw_game(1, 1, 0, 'F')]])
+    watcher.on_event = events.append
+    watcher.run(max_polls=10)
+
+    assert watcher.sleeps == [LIVE_INTERVAL, IDLE_INTERVAL, LIVE_INTERVAL]
+    assert [event['type'] for event in events] == ['score_change', 'game_final']
+    assert GameSyncState(watcher.state.url, str(tmp_path)).games['1']['summary']['status'] == 'F'
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Batch scraping of several tournaments in one process
+Runs the complete round-based scrape for a list of tournament URLs with a
+bounded number of tournaments in flight per domain. All scrapers share one
+HTTP client (session, per-host rate limiter, prefetch buffer) and the page
+data cache; the results go to one run directory with a status summary.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+import threading
+import logging
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from wbsc_cassette import add_cassette_arguments, apply_cassette_arguments
+from wbsc_html import PARSER_BACKENDS, set_parser_backend
+from wbsc_http import WBSCHttpClient
+from wbsc_ratelimit import host_of
+
+# Tournaments scraped at the same time on one domain
+PER_DOMAIN_CONCURRENCY = 2
+
+# Requests one tournament scrape can have in flight (games and standings page)
+REQUESTS_PER_TOURNAMENT = 2
+
+OUTPUTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'outputs')
+
+
+def tournament_slug(url: str) -> str:
+    """File-name friendly tournament name from the last URL segment"""
+    url_parts = url.rstrip('/').split('/')
+    name = url_parts[-1] if url_parts and url_parts[-1] else 'tournament'
+    return name.replace('-', '_').replace(' ', '_')
+
+
+def read_url_file(path: str) -> List[str]:
+    """Tournament URLs of a file, one per line ('#' starts a comment)"""
+    urls = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            url = line.split('#', 1)[0].strip()
+            if url:
+                urls.append(url)
+    return urls
+
+
+class WBSCBatchScraper:
+    def __init__(self, urls: List[str], delay: float = 1.0, per_domain: int = PER_DOMAIN_CONCURRENCY,
+                 run_dir: Optional[str] = None, http_client: Optional[WBSCHttpClient] = None):
+        """
+        Initialize the batch
+
+        Args:
+            urls: Tournament base URLs (duplicates are scraped once)
+            delay: Starting interval between requests to a host in seconds
+            per_domain: Tournaments scraped at the same time per domain
+            run_dir: Directory for all results (default: ../outputs/<date>_batch_<time>)
+            http_client: Shared HTTP client (default: a new client sized for the batch)
+        """
+        self.urls = list(dict.fromkeys(url.rstrip('/') for url in urls))
+        self.delay = delay
+        self.per_domain = max(1, per_domain)
+
+        if not run_dir:
+            run_dir = os.path.join(OUTPUTS_DIR, f"{datetime.now().strftime('%Y-%m-%d')}_batch_"
+                                                f"{datetime.now().strftime('%H%M%S')}")
+        self.run_dir = run_dir
+
+        # Tournaments grouped by domain, in the given order
+        self.domains: Dict[str, deque] = OrderedDict()
+        for url in self.urls:
+            self.domains.setdefault(host_of(url), deque()).append(url)
+
+        self.lanes = sum(min(self.per_domain, len(queue)) for queue in self.domains.values())
+        if http_client is None:
+            http_client = WBSCHttpClient(max_concurrency=max(6, self.lanes * REQUESTS_PER_TOURNAMENT))
+        self.http = http_client
+
+        # One output name per tournament, unique within the run
+        self.output_names: Dict[str, str] = {}
+        for url in self.urls:
+            name = tournament_slug(url)
+            if name in self.output_names.values():
+                name = f"{name}_{re.sub(r'[^A-Za-z0-9]+', '_', host_of(url))}"
+            self.output_names[url] = name
+
+        self.results: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+        self.logger = logging.getLogger(__name__)
+
+    def scrape_tournament(self, url: str) -> Dict:
+        """Scrape and save one tournament; returns its status entry"""
+        from wbsc_standings_scraper import WBSCCompleteRoundScraper
+
+        name = self.output_names[url]
+        status = {'url': url, 'name': name, 'domain': host_of(url), 'status': 'failed'}
+        started = time.perf_counter()
+
+        try:
+            scraper = WBSCCompleteRoundScraper(url, self.delay, self.http)
+            complete_data = scraper.scrape_complete_tournament_with_rounds()
+            summary = complete_data['summary']
+
+            json_path = scraper.save_complete_tournament(complete_data, os.path.join(self.run_dir, f"complete_{name}"))
+
+            status.update({
+                'status': 'ok' if summary['total_games'] or summary['total_standings_entries'] else 'empty',
+                'output': os.path.relpath(json_path, self.run_dir),
+                'games': summary['total_games'],
+                'completed_games': summary['completed_games'],
+                'rounds': summary['rounds'],
+                'standings_entries': summary['total_standings_entries'],
+                'standings_source': summary['standings_source'],
+                'standings_discrepancies': summary['standings_discrepancies']
+            })
+
+        except Exception as e:
+            self.logger.error(f"Error scraping {url}: {e}")
+            status['error'] = f"{type(e).__name__}: {e}"
+
+        status['duration'] = round(time.perf_counter() - started, 2)
+        with self._lock:
+            self.results[url] = status
+        self.logger.info(f"{name}: {status['status']} in {status['duration']}s")
+        return status
+
+    def _run_lane(self, queue: deque):
+        """Scrape tournaments of one domain until its queue is empty"""
+        while True:
+            with self._lock:
+                if not queue:
+                    return
+                url = queue.popleft()
+            self.scrape_tournament(url)
+
+    def run(self) -> Dict:
+        """Scrape all tournaments and write the run summary"""
+        started = datetime.now()
+        os.makedirs(self.run_dir, exist_ok=True)
+        self.http.limiter.configure(self.delay)
+
+        # per_domain lanes per domain drain that domain's queue, so a busy
+        # domain never holds a worker another domain could use
+        with ThreadPoolExecutor(max_workers=max(1, self.lanes), thread_name_prefix='tournament') as executor:
+            futures = [
+                executor.submit(self._run_lane, queue)
+                for queue in self.domains.values()
+                for _ in range(min(self.per_domain, len(queue)))
+            ]
+            for future in futures:
+                future.result()
+
+        self.http.log_request_stats()
+
+        tournaments = [self.results[url] for url in self.urls]
+        summary = {
+            'started_at': started.isoformat(),
+            'finished_at': datetime.now().isoformat(),
+            'per_domain': self.per_domain,
+            'tournaments': tournaments,
+            'totals': {
+                status: len([t for t in tournaments if t['status'] == status])
+                for status in ('ok', 'empty', 'failed')
+            },
+            'requests': self.http.request_stats()
+        }
+
+        summary_path = os.path.join(self.run_dir, 'batch_summary.json')
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+        self.logger.info(f"Batch summary saved to {summary_path}")
+
+        return summary
+
+    def print_summary(self, summary: Dict):
+        """Print one status line per tournament"""
+        icons = {'ok': '✅', 'empty': '⚠️ ', 'failed': '❌'}
+
+        print(f"\n🏆 BATCH SUMMARY ({len(summary['tournaments'])} tournaments)")
+        print("=" * 60)
+        for tournament in summary['tournaments']:
+            line = f"{icons[tournament['status']]} {tournament['name']} ({tournament['domain']}, {tournament['duration']}s)"
+            if tournament['status'] == 'failed':
+                line += f" - {tournament.get('error', '')}"
+            else:
+                line += (f" - {tournament['games']} games ({tournament['completed_games']} completed), "
+                         f"{tournament['standings_entries']} standings entries")
+            print(line)
+
+        totals = summary['totals']
+        print(f"\n📈 {totals['ok']} ok, {totals['empty']} empty, {totals['failed']} failed")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Scrape complete data of several WBSC tournaments in one run')
+    parser.add_argument('urls', nargs='*', help='Base URLs of the tournaments')
+    parser.add_argument('--file', help='File with one tournament URL per line')
+    parser.add_argument('--delay', type=float, default=1.5, help='Starting interval between requests to a host in seconds, adapted to the server (default: 1.5)')
+    parser.add_argument('--per-domain', type=int, default=PER_DOMAIN_CONCURRENCY,
+                        help=f'Tournaments scraped at the same time per domain (default: {PER_DOMAIN_CONCURRENCY})')
+    parser.add_argument('--output-dir', help='Run directory (default: ../outputs/<date>_batch_<time>)')
+    parser.add_argument('--parser', choices=PARSER_BACKENDS, help='HTML parser backend (default: fastest installed)')
+    parser.add_argument('--base-url', help='Send all requests to this server instead, e.g. a local mock (http://127.0.0.1:8766)')
+    add_cassette_arguments(parser)
+
+    args = parser.parse_args()
+    if args.parser:
+        set_parser_backend(args.parser)
+
+    urls = list(args.urls)
+    if args.file:
+        urls.extend(read_url_file(args.file))
+    if not urls:
+        parser.error('no tournament URLs given')
+
+    logging.basicConfig(level=logging.INFO)
+
+    batch = WBSCBatchScraper(urls, delay=args.delay, per_domain=args.per_domain, run_dir=args.output_dir)
+    batch.http.base_url_override = args.base_url
+    apply_cassette_arguments(args, batch.http)
+    print(f"Scraping {len(batch.urls)} tournaments on {len(batch.domains)} domains into {batch.run_dir}")
+
+    summary = batch.run()
+    batch.print_summary(summary)
+
+    sys.exit(1 if summary['totals']['failed'] else 0)
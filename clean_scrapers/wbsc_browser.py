@@ -0,0 +1,158 @@
+"""
+Reusable headless Chrome pool for the Selenium based scrapers
+Drivers are started once and lent out per category/page fetch instead of
+launching a new browser every time
+"""
+
+import atexit
+import importlib.util
+import threading
+import logging
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+# Selenium is only looked up here and imported when the first browser starts
+SELENIUM_AVAILABLE = all(
+    importlib.util.find_spec(module) is not None
+    for module in ('selenium', 'webdriver_manager')
+)
+
+
+class ChromeDriverPool:
+    def __init__(self, max_size: int = 1, recycle_after: int = 50, long_lived: bool = False,
+                 network_logging: bool = False):
+        """
+        Initialize the browser pool
+
+        Args:
+            max_size: Maximum number of browsers alive at the same time
+            recycle_after: Quit and replace a browser after this many page loads
+            long_lived: Keep idle browsers open across scraping runs until exit
+            network_logging: Record DevTools network events (performance log)
+        """
+        self.max_size = max_size
+        self.recycle_after = recycle_after
+        self.long_lived = long_lived
+        self.network_logging = network_logging
+
+        self._idle: List = []
+        self._page_counts: Dict[int, int] = {}
+        self._alive = 0
+        self._driver_path: Optional[str] = None
+        self._condition = threading.Condition()
+
+        self.logger = logging.getLogger(__name__)
+
+        atexit.register(self.close)
+
+    def _create_driver(self):
+        """Start a new headless Chrome instance"""
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+        from webdriver_manager.chrome import ChromeDriverManager
+
+        options = Options()
+        options.add_argument('--headless')
+        options.add_argument('--no-sandbox')
+        options.add_argument('--disable-dev-shm-usage')
+        options.add_argument('--disable-gpu')
+        options.add_argument('--disable-blink-features=AutomationControlled')
+        options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        if self.network_logging:
+            options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+        # Resolve the ChromeDriver binary once per pool
+        if self._driver_path is None:
+            self._driver_path = ChromeDriverManager().install()
+
+        service = Service(self._driver_path)
+        driver = webdriver.Chrome(service=service, options=options)
+        self._page_counts[id(driver)] = 0
+
+        self.logger.info("Started new headless Chrome")
+        return driver
+
+    def _is_healthy(self, driver) -> bool:
+        """Check that the browser session still responds"""
+        try:
+            driver.execute_script("return 1;")
+            return True
+        except Exception:
+            return False
+
+    def _quit(self, driver):
+        """Quit a browser and forget its bookkeeping"""
+        self._page_counts.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception as e:
+            self.logger.warning(f"Error quitting browser: {e}")
+
+    def acquire(self):
+        """Borrow a warm, healthy browser (starting one if needed)"""
+        with self._condition:
+            while True:
+                while self._idle:
+                    driver = self._idle.pop()
+                    if self._is_healthy(driver):
+                        return driver
+
+                    self.logger.warning("Discarding unresponsive browser")
+                    self._quit(driver)
+                    self._alive -= 1
+
+                if self._alive < self.max_size:
+                    self._alive += 1
+                    break
+
+                self._condition.wait()
+
+        try:
+            return self._create_driver()
+        except Exception:
+            with self._condition:
+                self._alive -= 1
+                self._condition.notify()
+            raise
+
+    def count_page(self, driver):
+        """Record a page load on a borrowed browser"""
+        with self._condition:
+            self._page_counts[id(driver)] = self._page_counts.get(id(driver), 0) + 1
+
+    def release(self, driver):
+        """Return a browser to the pool, recycling it after recycle_after pages"""
+        with self._condition:
+            count = self._page_counts.get(id(driver), 0)
+
+            if count >= self.recycle_after:
+                self.logger.info(f"Recycling browser after {count} pages")
+                self._quit(driver)
+                self._alive -= 1
+            else:
+                self._idle.append(driver)
+
+            self._condition.notify()
+
+    @contextmanager
+    def borrow(self):
+        """Context manager around acquire()/release()"""
+        driver = self.acquire()
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def close(self):
+        """Quit all idle browsers"""
+        with self._condition:
+            while self._idle:
+                self._quit(self._idle.pop())
+                self._alive -= 1
+            self._condition.notify_all()
+
+    def finish_run(self):
+        """End of a scraping run - idle browsers stay open only in long-lived mode"""
+        if not self.long_lived:
+            self.close()
@@ -0,0 +1,344 @@
+"""
+Record/replay cassettes for offline runs of the scrapers
+In record mode every request/response pair sent through the shared HTTP
+session is kept, body and headers included, and written to a gzip
+compressed JSON cassette per tournament. In replay mode the same session
+is answered from the cassettes without any network access, optionally
+with an injected latency, so the pipeline can be benchmarked and
+regression-tested on machines without internet.
+
+Only traffic of the requests session is covered; browser page loads
+(Selenium, requests-html) are neither recorded nor replayed.
+"""
+
+import argparse
+import atexit
+import base64
+import gzip
+import json
+import os
+import re
+import threading
+import time
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from wbsc_http import BaseUrlOverrideAdapter
+
+DEFAULT_CASSETTE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'cassettes')
+
+CASSETTE_VERSION = 1
+
+# Path segments of the tournament pages; the segment before them names the tournament
+PAGE_SEGMENTS = frozenset(['schedule-and-results', 'standings', 'statistics', 'stats', 'box-score', 'games'])
+
+# Request headers that select a different response for the same URL
+VARIANT_HEADERS = ('X-Inertia', 'X-Inertia-Partial-Component', 'X-Inertia-Partial-Data')
+CONDITIONAL_HEADERS = ('If-None-Match', 'If-Modified-Since')
+
+# Request headers never written to a cassette
+PRIVATE_HEADERS = frozenset(['cookie', 'authorization', 'proxy-authorization'])
+
+# Response headers describing the transfer, not the (already decoded) body
+TRANSFER_HEADERS = frozenset(['content-encoding', 'transfer-encoding', 'content-length', 'connection', 'set-cookie'])
+
+logger = logging.getLogger(__name__)
+
+
+class CassetteMiss(requests.exceptions.ConnectionError):
+    """A replayed request has no recorded response (handled like a network error)"""
+
+
+def tournament_key(url: str) -> str:
+    """
+    Cassette name of the tournament a URL belongs to
+
+    The tournament is the path segment before the page segment, e.g.
+    .../events/<tournament>/standings -> <tournament>
+    """
+    segments = [segment for segment in urlparse(url).path.split('/') if segment]
+    for index, segment in enumerate(segments):
+        if segment in PAGE_SEGMENTS:
+            segments = segments[:index]
+            break
+
+    name = segments[-1] if segments else urlparse(url).netloc
+    return re.sub(r'[^A-Za-z0-9]+', '_', name).strip('_') or 'tournament'
+
+
+def _variant(headers) -> Tuple:
+    return tuple(headers.get(name) or '' for name in VARIANT_HEADERS)
+
+
+def _conditional(headers) -> Tuple:
+    return tuple(headers.get(name) or '' for name in CONDITIONAL_HEADERS)
+
+
+def _encode_body(content: bytes) -> Dict:
+    try:
+        return {'body': content.decode('utf-8'), 'body_encoding': 'utf-8'}
+    except UnicodeDecodeError:
+        return {'body': base64.b64encode(content).decode('ascii'), 'body_encoding': 'base64'}
+
+
+def _decode_body(entry: Dict) -> bytes:
+    if entry.get('body_encoding') == 'base64':
+        return base64.b64decode(entry['body'])
+    return entry.get('body', '').encode('utf-8')
+
+
+class Cassette:
+    def __init__(self, path: str, name: str):
+        """
+        Initialize a cassette
+
+        Args:
+            path: File of the cassette (.json.gz)
+            name: Tournament the cassette belongs to
+        """
+        self.path = path
+        self.name = name
+        self.interactions: List[Dict] = []
+
+        # Replay: (method, url, variant) -> interactions, served in recorded order
+        self._index: Dict[Tuple, List[Dict]] = defaultdict(list)
+        self._served: Dict[Tuple, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str, name: str) -> 'Cassette':
+        """Read a cassette file (an empty cassette if it does not exist)"""
+        cassette = cls(path, name)
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return cassette
+
+        for interaction in data.get('interactions', []):
+            cassette._add(interaction)
+        return cassette
+
+    def _add(self, interaction: Dict):
+        request = interaction['request']
+        self.interactions.append(interaction)
+        key = (request['method'], request['url'], _variant(CaseInsensitiveDict(request.get('headers', {}))))
+        self._index[key].append(interaction)
+
+    def record(self, request: requests.PreparedRequest, response: requests.Response, elapsed: float):
+        """Keep one request/response pair (elapsed: seconds the response took)"""
+        self.add_interaction(request.method, request.url, request.headers, response.status_code, response.headers,
+                             response.content, elapsed, response.reason, response.url)
+
+    def add_interaction(self, method: str, url: str, request_headers, status: int, headers, content: bytes,
+                        elapsed: float = 0.0, reason: str = 'OK', response_url: Optional[str] = None):
+        """Keep one request/response pair given by its parts (e.g. a generated page)"""
+        interaction = {
+            'request': {
+                'method': method,
+                'url': url,
+                'headers': {name: value for name, value in request_headers.items()
+                            if name.lower() not in PRIVATE_HEADERS}
+            },
+            'response': {
+                'status': status,
+                'reason': reason,
+                'url': response_url or url,
+                'headers': {name: value for name, value in headers.items()
+                            if name.lower() not in TRANSFER_HEADERS},
+                'elapsed': round(elapsed, 4),
+                **_encode_body(content)
+            },
+            'recorded_at': datetime.now().isoformat()
+        }
+        with self._lock:
+            self._add(interaction)
+
+    def find(self, request: requests.PreparedRequest) -> Optional[Dict]:
+        """
+        Recorded interaction answering a request
+
+        Repeated requests are answered in recorded order (the last answer
+        repeats). Conditional headers only pick among the recordings: a
+        recorded 304 answers only the same validators, a 200 answers any.
+        """
+        key = (request.method, request.url, _variant(request.headers))
+        conditional = _conditional(request.headers)
+
+        with self._lock:
+            candidates = [
+                interaction for interaction in self._index.get(key, [])
+                if interaction['response']['status'] != 304
+                or _conditional(CaseInsensitiveDict(interaction['request']['headers'])) == conditional
+            ]
+            if not candidates:
+                return None
+
+            served = self._served[key]
+            self._served[key] += 1
+            return candidates[min(served, len(candidates) - 1)]
+
+    def save(self):
+        """Write the cassette atomically"""
+        with self._lock:
+            data = {
+                'version': CASSETTE_VERSION,
+                'tournament': self.name,
+                'saved_at': datetime.now().isoformat(),
+                'interactions': list(self.interactions)
+            }
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        logger.info(f"Cassette {self.name}: {len(data['interactions'])} interactions saved to {self.path}")
+
+
+class CassetteAdapter(BaseUrlOverrideAdapter):
+    def __init__(self, http_client, mode: str, cassette_dir: str = DEFAULT_CASSETTE_DIR, latency: float = 0.0,
+                 recorded_latency: bool = False, **kwargs):
+        """
+        Transport adapter recording to or replaying from per-tournament cassettes
+
+        Interactions are kept under the tournament's own URL; a base URL
+        override only applies to the recording's network requests.
+
+        Args:
+            http_client: Client the adapter is mounted on (for its base_url_override)
+            mode: 'record' or 'replay'
+            cassette_dir: Directory with one <tournament>.json.gz per tournament
+            latency: Replay: seconds added to every response
+            recorded_latency: Replay: wait as long as the recorded response took instead
+            kwargs: Passed on to HTTPAdapter (pool sizes)
+        """
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        super().__init__(http_client, **kwargs)
+
+        self.mode = mode
+        self.cassette_dir = cassette_dir
+        self.latency = latency
+        self.recorded_latency = recorded_latency
+
+        self.cassettes: Dict[str, Cassette] = {}
+        self._lock = threading.Lock()
+
+    def cassette_for(self, url: str) -> Cassette:
+        """The cassette of the URL's tournament (loaded on first use in replay mode)"""
+        name = tournament_key(url)
+        with self._lock:
+            cassette = self.cassettes.get(name)
+            if cassette is None:
+                path = os.path.join(self.cassette_dir, f"{name}.json.gz")
+                # A recording starts empty and replaces the previous cassette on save
+                cassette = Cassette.load(path, name) if self.mode == 'replay' else Cassette(path, name)
+                self.cassettes[name] = cassette
+            return cassette
+
+    def send(self, request, **kwargs):
+        if self.mode == 'record':
+            started = time.perf_counter()
+            response = super().send(request, **kwargs)
+            # Reading the body here keeps it for the session as well
+            response.content
+            self.cassette_for(request.url).record(request, response, time.perf_counter() - started)
+            return response
+
+        return self._replay(request)
+
+    def _replay(self, request) -> requests.Response:
+        interaction = self.cassette_for(request.url).find(request)
+        if interaction is None:
+            raise CassetteMiss(f"No recorded response for {request.method} {request.url}", request=request)
+
+        recorded = interaction['response']
+        delay = recorded.get('elapsed', 0.0) if self.recorded_latency else self.latency
+        if delay > 0:
+            time.sleep(delay)
+
+        response = requests.Response()
+        response.status_code = recorded['status']
+        response.reason = recorded.get('reason', '')
+        response.url = recorded.get('url') or request.url
+        response.headers = CaseInsensitiveDict(recorded.get('headers', {}))
+        response._content = _decode_body(recorded)
+        response._content_consumed = True
+        response.headers['Content-Length'] = str(len(response._content))
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.elapsed = timedelta(seconds=delay)
+        response.request = request
+        response.connection = self
+        return response
+
+    def save(self):
+        """Write every recorded cassette (no-op in replay mode)"""
+        if self.mode != 'record':
+            return
+        with self._lock:
+            cassettes = list(self.cassettes.values())
+        for cassette in cassettes:
+            try:
+                cassette.save()
+            except OSError as e:
+                logger.warning(f"Could not write cassette {cassette.path}: {e}")
+
+
+def install_cassette(http_client, mode: str, cassette_dir: str = DEFAULT_CASSETTE_DIR,
+                     latency: float = 0.0, recorded_latency: bool = False) -> CassetteAdapter:
+    """
+    Route a client's session through a cassette
+
+    Recordings are saved when the process exits. Replayed requests skip the
+    rate limiter, which would only add sleeps to an offline run.
+    """
+    adapter = CassetteAdapter(http_client, mode, cassette_dir, latency, recorded_latency,
+                              pool_connections=http_client.max_concurrency,
+                              pool_maxsize=http_client.max_concurrency)
+    http_client.session.mount('http://', adapter)
+    http_client.session.mount('https://', adapter)
+
+    if mode == 'record':
+        atexit.register(adapter.save)
+    else:
+        http_client.limiter.enabled = False
+
+    logger.info(f"Cassette {mode} mode, cassettes in {cassette_dir}")
+    return adapter
+
+
+def _latency_argument(value: str):
+    if value == 'recorded':
+        return value
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected seconds or 'recorded', got {value!r}")
+
+
+def add_cassette_arguments(parser: argparse.ArgumentParser):
+    """Add --record/--replay and their options to a scraper CLI"""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--record', action='store_true', help='Record all HTTP traffic into per-tournament cassettes')
+    group.add_argument('--replay', action='store_true', help='Serve all HTTP requests from the cassettes (offline)')
+    parser.add_argument('--cassette-dir', default=DEFAULT_CASSETTE_DIR, help='Cassette directory (default: ../cassettes)')
+    parser.add_argument('--replay-latency', type=_latency_argument, default=0.0,
+                        help="Replay: seconds added to every response, or 'recorded' for the recorded timings (default: 0)")
+
+
+def apply_cassette_arguments(args, http_client) -> Optional[CassetteAdapter]:
+    """Install the cassette selected on the command line, if any"""
+    if not (args.record or args.replay):
+        return None
+
+    recorded_latency = args.replay_latency == 'recorded'
+    latency = 0.0 if recorded_latency else args.replay_latency
+    return install_cassette(http_client, 'record' if args.record else 'replay', args.cassette_dir,
+                            latency, recorded_latency)
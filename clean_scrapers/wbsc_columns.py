@@ -0,0 +1,205 @@
+"""
+Header -> field column plans for stats tables
+The alias lookup of every canonical field is resolved once per table from
+its header row; each data row is then converted by walking the plan.
+Which category a table holds is decided from its header row alone and
+cached per domain by header signature.
+"""
+
+import json
+import os
+import threading
+import logging
+from typing import Dict, List, Optional, Sequence
+
+from wbsc_text import fix_text_encoding
+
+# Field aliases of the WBSC stats format, in lookup order
+WBSC_FIELD_ALIASES = {
+    'name': ['player', 'name', 'player name'],
+    'team': ['team', 'club', 'country'],
+    'games': ['g', 'games', 'gp'],
+    'at_bats': ['ab', 'at bats'],
+    'runs': ['r', 'runs'],
+    'hits': ['h', 'hits'],
+    'doubles': ['2b', 'doubles', '2-base hits'],
+    'triples': ['3b', 'triples', '3-base hits'],
+    'home_runs': ['hr', 'home runs', 'home_runs'],
+    'rbi': ['rbi', 'runs batted in'],
+    'total_bases': ['tb', 'total bases'],
+    'batting_average': ['avg', 'ba', 'batting average'],
+    'slugging_percentage': ['slg', 'slugging', 'slugging percentage'],
+    'on_base_percentage': ['obp', 'on base', 'on base percentage'],
+    'ops': ['ops', 'on base plus slugging'],
+    'walks': ['bb', 'walks', 'base on balls'],
+    'hit_by_pitch': ['hbp', 'hit by pitch'],
+    'strikeouts': ['so', 'strikeouts', 'strike outs'],
+    'sacrifice_hits': ['sh', 'sacrifice hits'],
+    'sacrifice_flies': ['sf', 'sacrifice flies'],
+    'grounded_into_double_play': ['gdp', 'double plays'],
+    # Pitching stats
+    'wins': ['w', 'wins'],
+    'losses': ['l', 'losses'],
+    'saves': ['sv', 'saves'],
+    'innings_pitched': ['ip', 'innings pitched', 'innings'],
+    'hits_allowed': ['h', 'hits allowed'],
+    'runs_allowed': ['r', 'runs allowed'],
+    'earned_runs': ['er', 'earned runs'],
+    'walks_allowed': ['bb', 'walks allowed'],
+    'strikeouts_pitched': ['so', 'strikeouts'],
+    'era': ['era', 'earned run average'],
+    # Fielding stats
+    'putouts': ['po', 'putouts'],
+    'assists': ['a', 'assists'],
+    'errors': ['e', 'errors'],
+    'fielding_percentage': ['fpct', 'fielding%', 'fielding percentage']
+}
+
+# Field aliases for generic HTML tables (matched case-insensitively)
+HTML_FIELD_ALIASES = {
+    'name': ['name', 'player', 'player name', 'player_name', 'playername'],
+    'team': ['team', 'club', 'team name', 'team_name', 'teamname'],
+    'number': ['no', 'num', 'number', '#', 'jersey', 'jersey_number'],
+    'games': ['g', 'games', 'gp', 'games played', 'games_played'],
+    'at_bats': ['ab', 'at bats', 'atbats', 'at_bats'],
+    'runs': ['r', 'runs'],
+    'hits': ['h', 'hits'],
+    'rbi': ['rbi', 'runs batted in', 'runs_batted_in'],
+    'batting_average': ['avg', 'ba', 'batting average', 'batting_average', 'battingaverage'],
+    'era': ['era', 'earned run average', 'earned_run_average'],
+    'wins': ['w', 'wins'],
+    'losses': ['l', 'losses'],
+    'errors': ['e', 'errors'],
+    'assists': ['a', 'assists'],
+    'putouts': ['po', 'putouts']
+}
+
+# Fields whose values get the text encoding repair
+TEXT_FIELDS = ('name', 'team')
+
+# Cell values treated as empty
+EMPTY_VALUES = frozenset(['', '-', '—'])
+
+# File of the per-domain header signature -> category mappings
+DEFAULT_SIGNATURE_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '.cache', 'table_signatures.json')
+
+logger = logging.getLogger(__name__)
+
+
+class ColumnPlan:
+    def __init__(self, headers: Sequence[str], field_aliases: Dict[str, List[str]],
+                 lowercase: bool = False, text_fields: Sequence[str] = TEXT_FIELDS,
+                 empty_values=EMPTY_VALUES):
+        """
+        Resolve the field aliases against a table header row
+
+        Args:
+            headers: Header cell texts, one per column
+            field_aliases: Canonical field -> header aliases in lookup order
+            lowercase: Match headers case-insensitively
+            text_fields: Fields whose values get the text encoding repair
+            empty_values: Cell values that count as missing (None takes every value)
+        """
+        self.width = len(headers)
+        self.empty_values = empty_values
+
+        # Header -> column indices, last column first (a repeated header keeps its last value)
+        columns: Dict[str, List[int]] = {}
+        for index, header in enumerate(headers):
+            key = header.lower() if lowercase else header
+            columns.setdefault(key, []).insert(0, index)
+
+        # Each field gets its candidate columns in alias order; the first
+        # non-empty one wins, as with the former per-row alias lookup
+        self.fields = []
+        for field, aliases in field_aliases.items():
+            candidates = []
+            for alias in aliases:
+                for index in columns.get(alias.lower() if lowercase else alias, []):
+                    if index not in candidates:
+                        candidates.append(index)
+            if candidates:
+                converter = fix_text_encoding if field in text_fields else None
+                self.fields.append((field, candidates, converter))
+
+    def _is_empty(self, value) -> bool:
+        if self.empty_values is None:
+            return False
+        return not value or value in self.empty_values
+
+    def count_values(self, cells: Sequence[str]) -> int:
+        """Number of non-empty cells under a header"""
+        return sum(1 for value in cells[:self.width] if not self._is_empty(value))
+
+    def convert(self, cells: Sequence) -> Dict:
+        """Map the cell values of one data row to canonical fields"""
+        empty_values = self.empty_values
+        row_width = min(len(cells), self.width)
+        converted = {}
+
+        for field, candidates, converter in self.fields:
+            for index in candidates:
+                if index >= row_width:
+                    continue
+                value = cells[index]
+                if empty_values is None or (value and value not in empty_values):
+                    if converter and isinstance(value, str):
+                        value = converter(value)
+                    converted[field] = value
+                    break
+
+        return converted
+
+
+def header_signature(headers: Sequence[str]) -> str:
+    """Normalized key of a header row"""
+    return '|'.join(header.strip().lower() for header in headers)
+
+
+class HeaderSignatureCache:
+    def __init__(self, path: str = DEFAULT_SIGNATURE_CACHE):
+        """
+        Initialize the per-domain header signature -> category cache
+
+        Args:
+            path: JSON file holding the classifications of earlier runs
+        """
+        self.path = path
+        self._signatures: Optional[Dict] = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict:
+        if self._signatures is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._signatures = json.load(f)
+            except (OSError, ValueError):
+                self._signatures = {}
+        return self._signatures
+
+    def get(self, domain: str, signature: str, category: str) -> Optional[bool]:
+        """Cached classification of a header row for a category, or None"""
+        with self._lock:
+            return self._load().get(domain, {}).get(signature, {}).get(category)
+
+    def store(self, domain: str, signature: str, category: str, matches: bool):
+        """Remember the classification (written to disk by save())"""
+        with self._lock:
+            self._load().setdefault(domain, {}).setdefault(signature, {})[category] = matches
+            self._dirty = True
+
+    def save(self):
+        """Write new classifications to disk"""
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self._signatures, f, indent=2, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+                self._dirty = False
+            except OSError as e:
+                logger.warning(f"Could not write header signature cache: {e}")
@@ -0,0 +1,235 @@
+"""
+Helpers for the DataTables-backed stats tables rendered in Selenium
+Waits return as soon as the table has actually redrawn instead of
+sleeping for a fixed time
+"""
+
+from typing import Dict, List
+
+# Selenium is imported inside the helpers so importing this module stays cheap
+
+# Selector of the first data row of the stats table
+FIRST_ROW_SELECTOR = 'table tbody tr'
+
+# Counts DataTables draw events on the page (installed once per page load)
+INSTALL_DRAW_LISTENER_JS = """
+if (window.__wbscDrawListener === undefined) {
+    window.__wbscDrawListener = false;
+    window.__wbscDrawCount = 0;
+    if (window.jQuery && window.jQuery.fn && window.jQuery.fn.dataTable) {
+        window.jQuery(document).on('draw.dt', function () { window.__wbscDrawCount += 1; });
+        window.__wbscDrawListener = true;
+    }
+}
+return window.__wbscDrawListener;
+"""
+
+# Text of the DataTables info element ("Showing 1 to 25 of 269 entries")
+INFO_TEXT_JS = """
+var info = document.querySelector('.dataTables_info, .dt-info, [id$="_info"]');
+return info ? info.textContent.trim() : '';
+"""
+
+
+class TableRedrawTimeout(Exception):
+    """The stats table did not redraw within the timeout"""
+
+
+def _first_row(driver):
+    """First data row of the table, or None"""
+    from selenium.webdriver.common.by import By
+
+    rows = driver.find_elements(By.CSS_SELECTOR, FIRST_ROW_SELECTOR)
+    return rows[0] if rows else None
+
+
+def _is_stale(element) -> bool:
+    """True once the element has been removed from the DOM"""
+    from selenium.common.exceptions import StaleElementReferenceException
+
+    try:
+        element.is_enabled()
+        return False
+    except StaleElementReferenceException:
+        return True
+
+
+def wait_for_table_ready(driver, timeout: float = 10.0, poll: float = 0.05):
+    """
+    Wait until the stats table has at least one data row
+
+    Raises:
+        TableRedrawTimeout: If no rows appear within the timeout
+    """
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=poll).until(lambda d: _first_row(d) is not None)
+    except TimeoutException:
+        raise TableRedrawTimeout(f"No table rows rendered within {timeout:.0f}s on {driver.current_url}")
+
+    driver.execute_script(INSTALL_DRAW_LISTENER_JS)
+
+
+# True if clicking arguments[0] makes the browser request something: a link to
+# another document, or any redraw of a server-side DataTables table (an XHR).
+# null when the page has no DataTables
+CLICK_REQUESTS_JS = """
+var element = arguments[0];
+var link = element.closest ? element.closest('a[href]') : null;
+if (link) {
+    var href = link.getAttribute('href') || '';
+    if (href.charAt(0) !== '#' && href.indexOf('javascript:') !== 0 &&
+            link.href.split('#')[0] !== window.location.href.split('#')[0]) {
+        return true;
+    }
+}
+var $ = window.jQuery;
+if (!($ && $.fn && $.fn.dataTable)) {
+    return null;
+}
+var settings = $.fn.dataTable.settings || [];
+for (var i = 0; i < settings.length; i++) {
+    if (settings[i].oFeatures && settings[i].oFeatures.bServerSide) {
+        return true;
+    }
+}
+return false;
+"""
+
+
+def click_requests_server(driver, element) -> bool:
+    """
+    Whether clicking a tab or pagination control sends a request
+
+    Client-side DataTables redraw from the rows they already hold; a page
+    without DataTables is assumed to reach the server.
+    """
+    return driver.execute_script(CLICK_REQUESTS_JS, element) is not False
+
+
+def capture_table_state(driver) -> Dict:
+    """Snapshot of the table taken before an action that redraws it"""
+    # A tab click may have loaded a new document - make sure draws are counted
+    driver.execute_script(INSTALL_DRAW_LISTENER_JS)
+
+    return {
+        'first_row': _first_row(driver),
+        'info': driver.execute_script(INFO_TEXT_JS),
+        'draws': driver.execute_script("return window.__wbscDrawCount || 0;")
+    }
+
+
+def _has_redrawn(driver, before: Dict) -> bool:
+    """Any redraw signal: draw event, changed info text or stale first row"""
+    if driver.execute_script("return window.__wbscDrawCount || 0;") > before['draws']:
+        return True
+
+    info = driver.execute_script(INFO_TEXT_JS)
+    if info and info != before['info']:
+        return True
+
+    first_row = before['first_row']
+    return first_row is not None and _is_stale(first_row) and _first_row(driver) is not None
+
+
+def wait_for_table_redraw(driver, before: Dict, timeout: float = 10.0, poll: float = 0.05):
+    """
+    Wait until the table has redrawn since the captured state
+
+    Raises:
+        TableRedrawTimeout: If the table did not redraw within the timeout
+    """
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=poll).until(lambda d: _has_redrawn(d, before))
+    except TimeoutException:
+        raise TableRedrawTimeout(
+            f"Table did not redraw within {timeout:.0f}s (info still '{before['info'] or 'n/a'}')"
+        )
+
+
+# Switch every DataTable on the page to the given longer page length (-1 = all
+# rows); tables already showing all their rows are left alone, as nothing would
+# redraw them. Returns 'redrawn', 'unchanged' or false without the API.
+SET_PAGE_LENGTH_JS = """
+var $ = window.jQuery;
+if (!$ || !$.fn || !$.fn.dataTable) { return false; }
+var tables = $.fn.dataTable.tables();
+if (!tables.length) { return false; }
+var length = arguments[0];
+var redrawn = false;
+$(tables).each(function () {
+    var api = $(this).DataTable();
+    var current = api.page.len();
+    if (current === length || current < 0 || api.page.info().recordsDisplay <= current) { return; }
+    api.page.len(length).draw(false);
+    redrawn = true;
+});
+return redrawn ? 'redrawn' : 'unchanged';
+"""
+
+# Fallback without the API: pick the largest entry of the "Show N entries" select
+SELECT_LARGEST_LENGTH_JS = """
+var select = document.querySelector('select[name$="_length"], .dataTables_length select, .dt-length select');
+if (!select || !select.options.length) { return null; }
+var best = null, bestValue = 0;
+for (var i = 0; i < select.options.length; i++) {
+    var value = parseInt(select.options[i].value, 10);
+    var size = value < 0 ? Infinity : value;
+    if (!isNaN(size) && size > bestValue) { best = select.options[i].value; bestValue = size; }
+}
+if (best === null || best === select.value) { return null; }
+select.value = best;
+select.dispatchEvent(new Event('change', { bubbles: true }));
+return best;
+"""
+
+
+def show_all_rows(driver, timeout: float = 15.0) -> bool:
+    """
+    Switch the stats table to its largest page length ("all" if possible)
+
+    Returns:
+        True if the table shows all its rows or was redrawn with the larger page length
+    """
+    before = capture_table_state(driver)
+
+    result = driver.execute_script(SET_PAGE_LENGTH_JS, -1)
+    if result == 'unchanged':
+        # Every row is on the page already - no redraw to wait for
+        return True
+    if not result:
+        if driver.execute_script(SELECT_LARGEST_LENGTH_JS) is None:
+            return False
+
+    wait_for_table_redraw(driver, before, timeout=timeout)
+    return True
+
+
+# Cell texts of every table on the page as nested arrays (tables -> rows -> cells).
+# Text nodes are trimmed and joined without separator like get_text(strip=True).
+EXTRACT_TABLE_ROWS_JS = """
+function cellText(cell) {
+    var walker = document.createTreeWalker(cell, NodeFilter.SHOW_TEXT, null);
+    var parts = [], node;
+    while ((node = walker.nextNode())) {
+        var text = node.nodeValue.trim();
+        if (text) { parts.push(text); }
+    }
+    return parts.join('');
+}
+return Array.prototype.map.call(document.querySelectorAll('table'), function (table) {
+    return Array.prototype.map.call(table.rows, function (row) {
+        return Array.prototype.map.call(row.cells, cellText);
+    });
+});
+"""
+
+
+def extract_table_rows(driver) -> List[List[List[str]]]:
+    """Cell texts of all tables on the current page, extracted in the browser"""
+    return driver.execute_script(EXTRACT_TABLE_ROWS_JS) or []
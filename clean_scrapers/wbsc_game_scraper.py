@@ -1,31 +1,40 @@
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
 from datetime import datetime, timedelta
-import time
 import json
-import html
 import sys
 import argparse
 import os
 from typing import List, Dict, Optional
 import logging
 
+from wbsc_cassette import add_cassette_arguments, apply_cassette_arguments
+from wbsc_html import PARSER_BACKENDS, set_parser_backend
+from wbsc_http import WBSCHttpClient, get_default_client
+from wbsc_page_data import fetch_page_data, get_default_page_cache
+from wbsc_game_sync import GameSyncState, change_set_is_empty, sync_games
+
 class WBSCTournamentScraper:
-    def __init__(self, base_url: str, delay: float = 1.0):
+    def __init__(self, base_url: str, delay: float = 1.0, http_client: Optional[WBSCHttpClient] = None):
         """
         Initialize scraper for WBSC tournament results
         
         Args:
             base_url: Base URL of tournament (e.g., tournament/schedule-and-results)
-            delay: Delay between requests in seconds
+            delay: Starting interval between requests to a host in seconds
+            http_client: Shared HTTP client (defaults to the process-wide client)
         """
         self.base_url = base_url
         self.delay = delay
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        self.http = http_client or get_default_client()
+        self.session = self.http.session
+        
+        # Requests are paced per host by the client's rate limiter, starting at one per delay
+        self.http.limiter.configure(delay)
+        
+        # Revalidation cache for the decoded data-page JSON
+        self.page_cache = get_default_page_cache()
+        
+        # Props requested as Inertia JSON instead of the full HTML (None = HTML only)
+        self.inertia_props = ['games', 'tournament']
         
         # Setup logging
         logging.basicConfig(level=logging.INFO)
@@ -34,43 +43,33 @@ class WBSCTournamentScraper:
     def extract_react_data(self) -> Optional[Dict]:
         """Extract the React data from the WBSC page"""
         try:
-            response = self.session.get(self.base_url)
-            response.raise_for_status()
+            page_data = fetch_page_data(self.http, self.base_url, self.page_cache, self.inertia_props)
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Find the div with data-page attribute
-            data_div = soup.find('div', {'data-page': True})
-            
-            if data_div:
-                # Get the JSON data
-                data_page = data_div.get('data-page')
-                
-                # Decode HTML entities
-                decoded_data = html.unescape(data_page)
-                
-                # Parse JSON
-                page_data = json.loads(decoded_data)
-                
-                return page_data
-            else:
+            if page_data is None:
                 self.logger.error("No data-page div found")
-                return None
+            
+            return page_data
                 
         except Exception as e:
             self.logger.error(f"Error extracting React data: {e}")
             return None
     
+    def _load_games_data(self):
+        """Raw games and tournament props of the page, or None"""
+        page_data = self.extract_react_data()
+        if not page_data:
+            return None
+        
+        props = page_data.get('props', {})
+        return props.get('games', []), props.get('tournament', {})
+    
     def scrape_all_games(self) -> List[Dict]:
         """Scrape all games from the tournament"""
         try:
-            page_data = self.extract_react_data()
-            if not page_data:
+            loaded = self._load_games_data()
+            if not loaded:
                 return []
-            
-            props = page_data.get('props', {})
-            games_data = props.get('games', [])
-            tournament_data = props.get('tournament', {})
+            games_data, tournament_data = loaded
             
             self.logger.info(f"Found {len(games_data)} games in tournament")
             
@@ -88,6 +87,39 @@ class WBSCTournamentScraper:
             self.logger.error(f"Error scraping games: {e}")
             return []
     
+    def sync_games(self, state: GameSyncState) -> Optional[Dict]:
+        """
+        Incremental sync: only games that are new or changed since the last sync
+        
+        Args:
+            state: Sync state of this tournament; call state.commit() once the
+                   change set has been saved
+        
+        Returns:
+            Change set with inserted/changed/removed games (see wbsc_game_sync.sync_games),
+            or None if the page could not be loaded
+        """
+        try:
+            loaded = self._load_games_data()
+            if not loaded:
+                return None
+            games_data, tournament_data = loaded
+            
+            change_set = sync_games(
+                games_data,
+                state,
+                lambda game: self._process_game_data(game, tournament_data)
+            )
+            self.logger.info(
+                f"Synced {len(games_data)} games: {len(change_set['inserted'])} new, "
+                f"{len(change_set['changed'])} changed, {len(change_set['removed'])} removed"
+            )
+            return change_set
+            
+        except Exception as e:
+            self.logger.error(f"Error syncing games: {e}")
+            return None
+    
     def _process_game_data(self, game: Dict, tournament: Dict) -> Optional[Dict]:
         """Process a single game from the raw data"""
         try:
@@ -120,6 +152,8 @@ class WBSCTournamentScraper:
             # Extract round and group info
             round_info = game.get('round', '')
             group_info = game.get('grouplabel', '') or game.get('group', '')
+            round_id = game.get('wbsc_tournament_round_id')
+            group_id = game.get('wbsc_tournament_group_id')
             
             # Extract statistics
             home_hits = game.get('homehits', 0) or 0
@@ -136,6 +170,7 @@ class WBSCTournamentScraper:
                 'game_code': game_code,
                 'date': start_date,
                 'start_time': start_time,
+                'start_utc': game.get('utc', ''),
                 'venue': venue,
                 'home_team': home_team,
                 'away_team': away_team,
@@ -148,9 +183,14 @@ class WBSCTournamentScraper:
                 'home_errors': home_errors,
                 'away_errors': away_errors,
                 'innings': innings_data,
+                'innings_played': game.get('innings') or 0,
                 'status': game_status,
                 'round': round_info,
                 'group': group_info,
+                'round_id': round_id,
+                'round_name': game.get('gametypelabel', ''),
+                'group_id': group_id,
+                'group_name': self._resolve_group_name(game, group_id),
                 'umpires': umpires,
                 'tournament': tournament.get('name', ''),
                 'scraped_at': datetime.now().isoformat()
@@ -160,6 +200,17 @@ class WBSCTournamentScraper:
             self.logger.error(f"Error processing game data: {e}")
             return None
     
+    def _resolve_group_name(self, game: Dict, group_id) -> str:
+        """Name of the game's tournament group, looked up in the teams' group lists"""
+        for side in ('home_team', 'away_team'):
+            team = game.get(side)
+            if not isinstance(team, dict):
+                continue
+            for group in team.get('groups') or []:
+                if group.get('id') == group_id:
+                    return group.get('name', '')
+        return ''
+    
     def _extract_innings_data(self, game: Dict) -> Dict:
         """Extract inning-by-inning scores"""
         innings = {'home': [], 'away': []}
@@ -277,11 +328,34 @@ class WBSCTournamentScraper:
                 csv_games.append(csv_game)
             
             csv_path = f"{output_path}.csv"
+            import pandas as pd
             df = pd.DataFrame(csv_games)
             df.to_csv(csv_path, index=False, encoding='utf-8')
             
         self.logger.info(f"Results saved to {json_path} and {csv_path}")
     
+    def save_changes(self, change_set: Dict, output_path: str = None, tournament_name: str = None) -> Optional[str]:
+        """Save a non-empty change set as JSON in the structured output folder"""
+        if change_set_is_empty(change_set):
+            self.logger.info("No game changes to save")
+            return None
+        
+        if not output_path:
+            current_date = datetime.now().strftime('%Y-%m-%d')
+            timestamp = datetime.now().strftime('%H%M%S')
+            clean_tournament_name = (tournament_name or 'tournament').replace('-', '_').replace(' ', '_')
+            folder_name = f"{current_date}_{clean_tournament_name}"
+            output_path = f"../outputs/{folder_name}/game_changes_{timestamp}"
+        
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        
+        json_path = f"{output_path}.json"
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(change_set, f, indent=2, ensure_ascii=False)
+        
+        self.logger.info(f"Change set saved to {json_path}")
+        return json_path
+    
     def print_summary(self, games: List[Dict]):
         """Print a summary of the scraped games"""
         if not games:
@@ -314,10 +388,24 @@ if __name__ == "__main__":
     # Parse command line arguments
     parser = argparse.ArgumentParser(description='WBSC Tournament Scraper')
     parser.add_argument('url', help='Base URL of the tournament (e.g., https://www.wbsceurope.org/en/events/tournament-name/)')
-    parser.add_argument('--delay', type=float, default=1.5, help='Delay between requests in seconds (default: 1.5)')
+    parser.add_argument('--delay', type=float, default=1.5, help='Starting interval between requests to a host in seconds, adapted to the server (default: 1.5)')
     parser.add_argument('--output', type=str, help='Output filename prefix (without extension)')
+    parser.add_argument('--no-inertia', action='store_true', help='Always download the full HTML page instead of Inertia JSON')
+    parser.add_argument('--parser', choices=PARSER_BACKENDS, help='HTML parser backend (default: fastest installed)')
+    parser.add_argument('--sync', action='store_true', help='Only save games that are new or changed since the last --sync run')
+    parser.add_argument('--reset-sync', action='store_true', help='With --sync: forget the sync state and report every game')
+    parser.add_argument('--watch', action='store_true', help='Keep polling with schedule-aware intervals and emit score-change events')
+    parser.add_argument('--events', type=str, help='With --watch: JSON Lines file the events are appended to')
+    parser.add_argument('--live-interval', type=float, default=30, help='With --watch: seconds between polls while a game is live (default: 30)')
+    parser.add_argument('--idle-interval', type=float, default=600, help='With --watch: seconds between polls between games (default: 600)')
+    parser.add_argument('--base-url', help='Send all requests to this server instead, e.g. a local mock (http://127.0.0.1:8766)')
+    add_cassette_arguments(parser)
     
     args = parser.parse_args()
+    if args.parser:
+        set_parser_backend(args.parser)
+    get_default_client().base_url_override = args.base_url
+    apply_cassette_arguments(args, get_default_client())
     
     # Ensure URL has trailing slash and add schedule-and-results if needed
     base_url = args.url.rstrip('/')
@@ -331,6 +419,43 @@ if __name__ == "__main__":
         base_url=base_url,
         delay=args.delay
     )
+    if args.no_inertia:
+        scraper.inertia_props = None
+    
+    # Extract tournament name from URL
+    url_parts = args.url.rstrip('/').split('/')
+    tournament_name = url_parts[-1] if url_parts else 'tournament'
+    
+    if args.watch:
+        from wbsc_watch import GameWatcher
+        
+        watcher = GameWatcher(scraper, events_path=args.events)
+        watcher.live_interval = args.live_interval
+        watcher.idle_interval = args.idle_interval
+        print(f"Watching {base_url} (Ctrl+C to stop)")
+        watcher.run()
+        sys.exit(0)
+    
+    if args.sync:
+        state = GameSyncState(scraper.base_url)
+        if args.reset_sync:
+            state.reset()
+        
+        change_set = scraper.sync_games(state)
+        if change_set is None:
+            sys.exit(1)
+        
+        print(f"New games: {len(change_set['inserted'])}")
+        for entry in change_set['changed']:
+            game = entry['game']
+            print(f"Changed ({', '.join(entry['changes'])}): {game['away_team']} {game['away_runs']}-"
+                  f"{game['home_runs']} {game['home_team']} [{game['status']}]")
+        print(f"Removed games: {len(change_set['removed'])}, unchanged: {change_set['unchanged']}")
+        
+        scraper.save_changes(change_set, output_path=args.output, tournament_name=tournament_name)
+        # Only a saved change set advances the sync state
+        state.commit()
+        sys.exit(0)
     
     # Scrape all games
     all_games = scraper.scrape_all_games()
@@ -338,10 +463,6 @@ if __name__ == "__main__":
     # Print summary
     scraper.print_summary(all_games)
     
-    # Extract tournament name from URL
-    url_parts = args.url.rstrip('/').split('/')
-    tournament_name = url_parts[-1] if url_parts else 'tournament'
-    
     # Save results with structured output
     if args.output:
         # Custom output path provided
@@ -0,0 +1,202 @@
+"""
+Incremental game sync keyed by game_id
+Every raw game dict is fingerprinted; the last seen fingerprint per game_id
+is kept in a small per-tournament state file. A sync only processes the
+games whose fingerprint changed and returns them as a change set, so a
+polled tournament costs work proportional to its live games. The state is
+only written once the caller has saved the change set (GameSyncState.commit),
+so a crash in between reports the same changes again instead of losing them.
+"""
+
+import hashlib
+import importlib.util
+import json
+import os
+import threading
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+
+DEFAULT_STATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '.cache', 'game_sync')
+
+# Raw fields that change without the game itself changing
+VOLATILE_FIELDS = frozenset(['updated_at', 'edit_by', 'importlock'])
+
+logger = logging.getLogger(__name__)
+
+if importlib.util.find_spec('orjson') is not None:
+    import orjson
+
+    def _canonical_bytes(game: Dict) -> bytes:
+        return orjson.dumps(game, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+else:
+    def _canonical_bytes(game: Dict) -> bytes:
+        return json.dumps(game, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')
+
+
+def fingerprint_game(game: Dict) -> str:
+    """Stable hash of a raw game dict, ignoring the volatile bookkeeping fields"""
+    relevant = {key: value for key, value in game.items() if key not in VOLATILE_FIELDS}
+    return hashlib.blake2b(_canonical_bytes(relevant), digest_size=16).hexdigest()
+
+
+def game_summary(game: Dict) -> Dict:
+    """The processed game fields a change is classified by, plus the scheduled start"""
+    innings = game.get('innings', {})
+    return {
+        'home_runs': game.get('home_runs'),
+        'away_runs': game.get('away_runs'),
+        'status': game.get('status'),
+        'innings': [list(innings.get('home', [])), list(innings.get('away', []))],
+        'start_time': game.get('start_time', ''),
+        'start_utc': game.get('start_utc', '')
+    }
+
+
+def classify_changes(previous: Optional[Dict], current: Dict) -> List[str]:
+    """
+    What changed between two game summaries
+
+    Returns:
+        A subset of ['score', 'status', 'innings'], or ['other'] if only other fields changed
+    """
+    if not previous:
+        return ['other']
+
+    changes = []
+    if (previous.get('home_runs'), previous.get('away_runs')) != (current['home_runs'], current['away_runs']):
+        changes.append('score')
+    if previous.get('status') != current['status']:
+        changes.append('status')
+    if previous.get('innings') != current['innings']:
+        changes.append('innings')
+    return changes or ['other']
+
+
+class GameSyncState:
+    def __init__(self, url: str, state_dir: str = DEFAULT_STATE_DIR):
+        """
+        Initialize the sync state of one tournament
+
+        Args:
+            url: Schedule-and-results URL of the tournament
+            state_dir: Directory holding one state file per tournament
+        """
+        self.url = url
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        self.path = os.path.join(state_dir, f"{key}.json")
+        self._games: Optional[Dict[str, Dict]] = None
+        # Games after the last sync, until commit() makes them the state
+        self._staged: Optional[Dict[str, Dict]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def games(self) -> Dict[str, Dict]:
+        """game_id -> {'fingerprint', 'summary'} of the last sync"""
+        if self._games is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._games = json.load(f).get('games', {})
+            except (OSError, ValueError):
+                self._games = {}
+        return self._games
+
+    def save(self):
+        """Write the state atomically"""
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump({'url': self.url, 'saved_at': datetime.now().isoformat(), 'games': self.games}, f)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.warning(f"Could not write game sync state for {self.url}: {e}")
+
+    def stage(self, games: Dict[str, Dict]):
+        """Hold the games of a sync until commit()"""
+        self._staged = games
+
+    def commit(self):
+        """Make the last sync the state and write it; call once its change set is saved"""
+        if self._staged is None:
+            return
+        self._games, self._staged = self._staged, None
+        self.save()
+
+    def reset(self):
+        """Forget all games (the next sync reports every game as inserted)"""
+        self._games = {}
+        self._staged = None
+
+
+def sync_games(raw_games: List[Dict], state: GameSyncState, process_game) -> Dict:
+    """
+    Diff the raw games against the sync state and update it
+
+    Args:
+        raw_games: Game dicts from the data-page props
+        state: Sync state of the tournament; the result is staged, call
+               state.commit() once the change set has been saved
+        process_game: Callable turning a raw game into a processed game (or None)
+
+    Returns:
+        Change set: {'inserted': [games], 'changed': [{'game', 'changes', 'previous'}],
+        'removed': [game ids], 'unchanged': count, 'synced_at': timestamp}
+    """
+    known = state.games
+    updated = dict(known)
+    seen = set()
+    inserted, changed = [], []
+    unchanged = 0
+
+    for raw_game in raw_games:
+        game_id = str(raw_game.get('id'))
+        seen.add(game_id)
+        fingerprint = fingerprint_game(raw_game)
+
+        entry = known.get(game_id)
+        if entry and entry.get('fingerprint') == fingerprint:
+            unchanged += 1
+            continue
+
+        # Only new or changed games are processed
+        game = process_game(raw_game)
+        if not game:
+            continue
+
+        summary = game_summary(game)
+        if entry is None:
+            inserted.append(game)
+        else:
+            changed.append({
+                'game': game,
+                'changes': classify_changes(entry.get('summary'), summary),
+                'previous': entry.get('summary')
+            })
+        updated[game_id] = {'fingerprint': fingerprint, 'summary': summary}
+
+    removed = [game_id for game_id in known if game_id not in seen]
+    for game_id in removed:
+        del updated[game_id]
+
+    if inserted or changed or removed:
+        state.stage(updated)
+
+    return {
+        'url': state.url,
+        'synced_at': datetime.now().isoformat(),
+        'inserted': inserted,
+        'changed': changed,
+        'removed': removed,
+        'unchanged': unchanged
+    }
+
+
+def change_set_games(change_set: Dict) -> List[Dict]:
+    """Processed games of a change set (inserted and changed)"""
+    return change_set.get('inserted', []) + [entry['game'] for entry in change_set.get('changed', [])]
+
+
+def change_set_is_empty(change_set: Dict) -> bool:
+    return not (change_set.get('inserted') or change_set.get('changed') or change_set.get('removed'))
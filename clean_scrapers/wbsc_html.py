@@ -0,0 +1,222 @@
+"""
+Selectable HTML parser backend for the scrapers
+BeautifulSoup trees are built with lxml when it is installed, and only the
+elements a scraper actually reads are parsed (SoupStrainer). The data-page
+attribute can also be read with selectolax, which skips building a soup.
+The backend is chosen with set_parser_backend() or WBSC_HTML_PARSER.
+The data-page attribute itself is normally sliced out of the raw bytes
+without any parser at all (find_data_page_bytes).
+"""
+
+import html
+import importlib.util
+import os
+import re
+from html.entities import html5
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup, SoupStrainer
+
+LXML_AVAILABLE = importlib.util.find_spec('lxml') is not None
+SELECTOLAX_AVAILABLE = importlib.util.find_spec('selectolax') is not None
+
+PARSER_BACKENDS = ('selectolax', 'lxml', 'html.parser')
+
+# SoupStrainer arguments per strainer. bs4 is only imported once a page is
+# parsed into a soup, so the Inertia JSON path never loads it; the strainers
+# (DATA_PAGE_STRAINER, ...) are built on first use
+_STRAINER_ARGS = {
+    # Only the Inertia data-page div
+    'DATA_PAGE_STRAINER': (('div',), {'attrs': {'data-page': True}}),
+    # The standings container holds the final standings, round tabs and tab panes
+    'STANDINGS_STRAINER': (('div',), {'class_': 'standings-page'}),
+    # Stats tables (and stray tbody elements) plus the tab buttons/links that name the categories
+    'STATS_STRAINER': ((['table', 'tbody', 'button', 'a'],), {})
+}
+_strainers = {}
+
+
+def _strainer(name: str) -> 'SoupStrainer':
+    strainer = _strainers.get(name)
+    if strainer is None:
+        from bs4 import SoupStrainer
+
+        args, kwargs = _STRAINER_ARGS[name]
+        strainer = _strainers[name] = SoupStrainer(*args, **kwargs)
+    return strainer
+
+
+def __getattr__(name: str):
+    if name in _STRAINER_ARGS:
+        return _strainer(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def backend_available(backend: str) -> bool:
+    """True if the parser backend is installed"""
+    if backend == 'selectolax':
+        return SELECTOLAX_AVAILABLE
+    if backend == 'lxml':
+        return LXML_AVAILABLE
+    return backend == 'html.parser'
+
+
+def _default_backend() -> str:
+    """Backend from WBSC_HTML_PARSER, otherwise the fastest one installed"""
+    requested = os.environ.get('WBSC_HTML_PARSER')
+    if requested in PARSER_BACKENDS and backend_available(requested):
+        return requested
+
+    return next(backend for backend in PARSER_BACKENDS if backend_available(backend))
+
+
+_parser_backend = _default_backend()
+
+
+def get_parser_backend() -> str:
+    """Name of the active parser backend"""
+    return _parser_backend
+
+
+def set_parser_backend(backend: str):
+    """
+    Select the parser backend for all scrapers in this process
+
+    Raises:
+        ValueError: If the backend is unknown or not installed
+    """
+    global _parser_backend
+
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend '{backend}' (choose from {', '.join(PARSER_BACKENDS)})")
+    if not backend_available(backend):
+        raise ValueError(f"Parser backend '{backend}' is not installed")
+
+    _parser_backend = backend
+
+
+def soup_features(backend: Optional[str] = None) -> str:
+    """BeautifulSoup tree builder for a backend (selectolax builds its soups with lxml)"""
+    backend = backend or _parser_backend
+    if backend == 'html.parser' or not LXML_AVAILABLE:
+        return 'html.parser'
+    return 'lxml'
+
+
+def make_soup(content, parse_only: Optional['SoupStrainer'] = None, backend: Optional[str] = None) -> 'BeautifulSoup':
+    """Parse HTML with the selected backend, optionally limited to the strained elements"""
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup(content, soup_features(backend), parse_only=parse_only)
+
+
+def make_standings_soup(content, backend: Optional[str] = None) -> 'BeautifulSoup':
+    """Parse the standings container, or the whole page if it has none"""
+    soup = make_soup(content, _strainer('STANDINGS_STRAINER'), backend)
+    if soup.find('div', class_='standings-page') is None:
+        soup = make_soup(content, backend=backend)
+    return soup
+
+
+_TAG_RE = re.compile(r'<[^>]*>')
+
+
+def cell_text(cell) -> str:
+    """Text of a table cell value that may hold markup (e.g. a player link), without building a soup"""
+    text = str(cell)
+    if '<' in text:
+        text = _TAG_RE.sub('', text)
+    if '&' in text:
+        text = html.unescape(text)
+    return text.strip()
+
+
+# Entities emitted by the server's attribute escaping (htmlspecialchars)
+_ATTRIBUTE_ENTITIES = {
+    b'quot': b'"',
+    b'amp': b'&',
+    b'#039': b"'",
+    b'#39': b"'",
+    b'apos': b"'",
+    b'lt': b'<',
+    b'gt': b'>'
+}
+
+
+def _decode_entity(name: bytes) -> Optional[bytes]:
+    """Replacement for an entity name between '&' and ';', or None if unknown"""
+    replacement = _ATTRIBUTE_ENTITIES.get(name)
+    if replacement is not None:
+        return replacement
+
+    try:
+        if name[:2] in (b'#x', b'#X'):
+            return chr(int(name[2:], 16)).encode('utf-8')
+        if name[:1] == b'#':
+            return chr(int(name[1:])).encode('utf-8')
+    except (ValueError, OverflowError):
+        return None
+
+    named = html5.get(f"{name.decode('ascii', 'ignore')};")
+    return named.encode('utf-8') if named else None
+
+
+def decode_attribute_entities(raw: bytes) -> bytes:
+    """Decode the HTML entities of a raw attribute value in a single pass"""
+    # &quot; is by far the most common entity in JSON attributes; entities never
+    # overlap, so replacing it first does not change how the rest decodes
+    raw = raw.replace(b'&quot;', b'"')
+    if b'&' not in raw:
+        return raw
+
+    parts = raw.split(b'&')
+    decoded = [parts[0]]
+    for part in parts[1:]:
+        end = part.find(b';', 0, 32)
+        replacement = _decode_entity(part[:end]) if end > 0 else None
+        if replacement is None:
+            decoded.append(b'&')
+            decoded.append(part)
+        else:
+            decoded.append(replacement)
+            decoded.append(part[end + 1:])
+
+    return b''.join(decoded)
+
+
+def find_data_page_bytes(content: bytes) -> Optional[bytes]:
+    """
+    Raw data-page attribute value, sliced straight out of the response bytes
+
+    No HTML tree is built; inside a quoted attribute the closing quote can
+    only be the delimiter, so the value ends at the next quote byte.
+
+    Returns:
+        The still entity-encoded value, or None if the page has no data-page attribute
+    """
+    start = content.find(b'data-page=')
+    while start != -1:
+        quote = content[start + 10:start + 11]
+        # Only a real attribute: preceded by whitespace and quoted
+        if quote in (b'"', b"'") and content[start - 1:start].isspace():
+            end = content.find(quote, start + 11)
+            if end != -1:
+                return content[start + 11:end]
+        start = content.find(b'data-page=', start + 10)
+
+    return None
+
+
+def extract_data_page_attribute(content, backend: Optional[str] = None) -> Optional[str]:
+    """Raw value of the data-page attribute (attribute entities already decoded)"""
+    backend = backend or _parser_backend
+
+    if backend == 'selectolax':
+        from selectolax.parser import HTMLParser
+
+        node = HTMLParser(content).css_first('div[data-page]')
+        return node.attributes.get('data-page') if node else None
+
+    data_div = make_soup(content, _strainer('DATA_PAGE_STRAINER'), backend).find('div', {'data-page': True})
+    return data_div.get('data-page') if data_div else None
@@ -0,0 +1,237 @@
+"""
+Shared HTTP layer for the WBSC scrapers
+One requests session per process, with an asyncio front end so that
+independent tournament pages can be fetched at the same time. Every request
+is paced by the per-host rate limiter and retried on 429/503.
+"""
+
+import asyncio
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from wbsc_ratelimit import HostRateLimiter, RETRY_STATUSES, retry_delay
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+# Prefetched responses older than this are dropped instead of served (seconds)
+PREFETCH_TTL = 60.0
+
+
+def _prefetch_key(url: str, headers: Optional[Dict]) -> Tuple:
+    """Key of a prefetched response - a response only serves identical requests"""
+    return (url, tuple(sorted((headers or {}).items())))
+
+
+class BaseUrlOverrideAdapter(HTTPAdapter):
+    def __init__(self, http_client: 'WBSCHttpClient', **kwargs):
+        """
+        Transport adapter sending requests to the client's base_url_override
+
+        The URL is only rewritten on the wire: everything above the transport
+        (cassettes, caches, the responses the scrapers see) keeps the
+        tournament's own URL.
+
+        Args:
+            http_client: Client whose base_url_override applies
+            kwargs: Passed on to HTTPAdapter (pool sizes)
+        """
+        super().__init__(**kwargs)
+        self.http_client = http_client
+
+    def send(self, request, **kwargs):
+        url = self.http_client.resolve_url(request.url)
+        if url == request.url:
+            return super().send(request, **kwargs)
+
+        sent = request.copy()
+        sent.url = url
+        response = super().send(sent, **kwargs)
+        response.url = request.url
+        response.request = request
+        return response
+
+
+class WBSCHttpClient:
+    def __init__(self, max_concurrency: int = 6, timeout: float = 30.0, max_retries: int = 3):
+        """
+        Initialize the shared HTTP client
+
+        Args:
+            max_concurrency: Maximum number of requests in flight at the same time
+            timeout: Timeout per request in seconds
+            max_retries: Retries of a request answered with 429/503
+        """
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+
+        # Paces every request (HTTP and browser) per host
+        self.limiter = HostRateLimiter()
+
+        # Scheme and host every request is sent to instead of the URL's own
+        # (e.g. a local mock server), None to use the URLs as they are
+        self.base_url_override: Optional[str] = None
+
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+
+        # Allow one pooled connection per concurrent request
+        adapter = BaseUrlOverrideAdapter(self, pool_connections=max_concurrency, pool_maxsize=max_concurrency)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        # Responses fetched ahead of time (with their fetch time), consumed by
+        # the next get() for the same URL and headers within prefetch_ttl
+        self.prefetch_ttl = PREFETCH_TTL
+        self._prefetched: Dict[Tuple, Tuple[float, requests.Response]] = {}
+        self._lock = threading.Lock()
+
+        self.logger = logging.getLogger(__name__)
+
+    def get(self, url: str, headers: Optional[Dict] = None, **kwargs) -> requests.Response:
+        """Blocking GET, served from the prefetch buffer when possible"""
+        with self._lock:
+            self._expire_prefetched()
+            entry = self._prefetched.pop(_prefetch_key(url, headers), None)
+
+        if entry is not None:
+            self.logger.debug(f"Using prefetched response for {url}")
+            return entry[1]
+
+        return self._request(url, headers, **kwargs)
+
+    def _expire_prefetched(self):
+        """Drop prefetched responses nobody asked for within prefetch_ttl; call with the lock held"""
+        cutoff = time.monotonic() - self.prefetch_ttl
+        for key in [key for key, (fetched_at, _) in self._prefetched.items() if fetched_at < cutoff]:
+            self.logger.debug(f"Dropping unused prefetched response for {key[0]}")
+            del self._prefetched[key]
+
+    def resolve_url(self, url: str) -> str:
+        """The URL a request is actually sent to (base_url_override applied; browsers need it explicitly)"""
+        if not self.base_url_override:
+            return url
+        override = urlparse(self.base_url_override)
+        return urlparse(url)._replace(scheme=override.scheme, netloc=override.netloc).geturl()
+
+    def _request(self, url: str, headers: Optional[Dict] = None, **kwargs) -> requests.Response:
+        """Perform the actual network request, rate limited and retried when throttled"""
+        kwargs.setdefault('timeout', self.timeout)
+
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire(url)
+            response = self.session.get(url, headers=headers, **kwargs)
+
+            if response.status_code not in RETRY_STATUSES:
+                self.limiter.record_success(url)
+                return response
+            if attempt == self.max_retries:
+                break
+
+            self.limiter.throttle(url, retry_delay(response, attempt))
+            self.logger.info(f"Retrying {url} after {response.status_code} (attempt {attempt + 2})")
+
+        return response
+
+    def request_stats(self) -> Dict[str, Dict]:
+        """Per-host request counters and the observed request rate"""
+        return self.limiter.stats()
+
+    def log_request_stats(self):
+        """Log the request counters and observed rate of every host"""
+        for host, stats in self.request_stats().items():
+            self.logger.info(f"{host}: {stats['requests']} requests, {stats['observed_rate']} req/s observed "
+                             f"(limit {stats['rate']} req/s), {stats['throttled']} throttled, {stats['waited']}s waited")
+
+    async def get_async(self, url: str, semaphore: Optional[asyncio.Semaphore] = None,
+                        headers: Optional[Dict] = None) -> requests.Response:
+        """Non-blocking GET for use inside an event loop"""
+        if semaphore is None:
+            return await asyncio.to_thread(self._request, url, headers)
+
+        async with semaphore:
+            return await asyncio.to_thread(self._request, url, headers)
+
+    async def gather(self, urls: Iterable[str],
+                     headers: Optional[Dict[str, Dict]] = None) -> Dict[str, Union[requests.Response, Exception]]:
+        """Fetch all URLs concurrently, bounded by max_concurrency"""
+        urls = list(dict.fromkeys(urls))  # De-duplicate, keep order
+        headers = headers or {}
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        results = await asyncio.gather(
+            *(self.get_async(url, semaphore, headers.get(url) or None) for url in urls),
+            return_exceptions=True
+        )
+        return dict(zip(urls, results))
+
+    def fetch_all(self, urls: Iterable[str],
+                  headers: Optional[Dict[str, Dict]] = None) -> Dict[str, Union[requests.Response, Exception]]:
+        """
+        Fetch all URLs concurrently from synchronous code
+
+        Async code should await gather() instead; called inside a running
+        event loop, the fetch runs on its own loop in a worker thread and
+        blocks the caller's loop until it is done.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.gather(urls, headers))
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(lambda: asyncio.run(self.gather(urls, headers))).result()
+
+    def prefetch(self, urls: List[str],
+                 headers: Optional[Dict[str, Dict]] = None) -> Dict[str, Union[requests.Response, Exception]]:
+        """
+        Fetch independent pages concurrently and keep them for the scrapers
+
+        The scrapers keep calling get() as before; the first call for a
+        prefetched URL returns the stored response without a network round-trip.
+        Failed prefetches are dropped so the scraper retries them normally, and
+        so are responses not used within prefetch_ttl.
+
+        Args:
+            urls: Pages to fetch
+            headers: Optional extra request headers per URL (e.g. revalidation headers)
+        """
+        results = self.fetch_all(urls, headers)
+        fetched_at = time.monotonic()
+
+        with self._lock:
+            self._expire_prefetched()
+
+        for url, result in results.items():
+            if isinstance(result, Exception):
+                self.logger.warning(f"Prefetch failed for {url}: {result}")
+                continue
+
+            with self._lock:
+                self._prefetched[_prefetch_key(url, headers.get(url) if headers else None)] = (fetched_at, result)
+
+        self.logger.info(f"Prefetched {len(results)} pages concurrently")
+        return results
+
+
+_default_client: Optional[WBSCHttpClient] = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client() -> WBSCHttpClient:
+    """Return the process-wide client shared by all scrapers"""
+    global _default_client
+
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = WBSCHttpClient()
+        return _default_client
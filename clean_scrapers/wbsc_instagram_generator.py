@@ -3,7 +3,6 @@ Final Instagram automation with round-based standings
 Creates sophisticated social media content differentiating between tournament rounds
 """
 
-from wbsc_standings_scraper import WBSCCompleteRoundScraper
 import json
 import sys
 import argparse
@@ -157,6 +156,59 @@ Teams advancing from Opening Round to Second Round:
         }
     }
 
+def create_projected_standings_post(round_name: str, projected: List[Dict], max_groups=2):
+    """Create Instagram post with the projected final positions of groups still in play"""
+    
+    if not projected:
+        return None
+    
+    # Group projections by groups
+    groups = {}
+    for standing in projected:
+        groups.setdefault(standing.get('group', 'Unknown'), []).append(standing)
+    
+    sorted_groups = list(groups.items())[:max_groups]
+    
+    projection_texts = []
+    for group_name, group_standings in sorted_groups:
+        remaining = group_standings[0].get('projection', {}).get('remaining_games', 0)
+        group_text = f"🔮 {group_name} ({remaining} games left):\n"
+        
+        for standing in group_standings:
+            projection = standing.get('projection', {})
+            odds = projection.get('position_odds', [])
+            best = projection.get('best_position', '?')
+            worst = projection.get('worst_position', '?')
+            first_place = round(odds[0] * 100) if odds else 0
+            
+            places = f"#{best}" if best == worst else f"#{best}-#{worst}"
+            group_text += f"{standing.get('team_ioc', '')} {standing.get('team_name', 'Unknown')}: {places}, {first_place}% to win the group\n"
+        
+        projection_texts.append(group_text)
+    
+    all_projections_text = "\n".join(projection_texts)
+    
+    return {
+        'type': 'projected_standings',
+        'round_name': round_name,
+        'groups_count': len(sorted_groups),
+        'post_caption': f"""🔮 {round_name.upper()} - WHO FINISHES WHERE? 🔮
+
+Possible final positions with the games still to play:
+
+{all_projections_text}
+
+🏆 U-18 Women's Softball European Championship 2025
+
+#SoftballEurope #U18Womens #WBSC #{round_name.replace(' ', '')}Standings #EuropeanChampionship #Softball2025""",
+        'template_data': {
+            'round_name': round_name,
+            'projections_text': all_projections_text,
+            'groups_data': sorted_groups,
+            'tournament_name': 'U-18 Women\'s Softball European Championship 2025'
+        }
+    }
+
 def create_comprehensive_tournament_posts(complete_data: Dict, max_posts=12):
     """Create comprehensive Instagram content with round-based data"""
     posts = []
@@ -188,6 +240,12 @@ def create_comprehensive_tournament_posts(complete_data: Dict, max_posts=12):
     if progression_post and len(posts) < max_posts:
         posts.append(progression_post)
     
+    # Projected final positions of groups still in play
+    for round_name, projected in complete_data.get('projected_positions', {}).items():
+        projection_post = create_projected_standings_post(round_name, projected)
+        if projection_post and len(posts) < max_posts:
+            posts.append(projection_post)
+    
     # Tournament summary
     if len(posts) < max_posts:
         summary_post = create_advanced_tournament_summary(complete_data)
@@ -380,6 +438,9 @@ def print_comprehensive_preview(posts: List[Dict]):
         elif post.get('type') == 'round_standings':
             print(f"Round: {post.get('round_name', '')}")
             print(f"Groups: {post.get('groups_count', 0)}, Teams: {post.get('total_teams', 0)}")
+        elif post.get('type') == 'projected_standings':
+            print(f"Round: {post.get('round_name', '')}")
+            print(f"Groups still in play: {post.get('groups_count', 0)}")
         elif post.get('type') == 'round_progression':
             print(f"Teams progressed: {post.get('progressed_teams_count', 0)}")
         elif post.get('type') == 'advanced_tournament_summary':
@@ -399,12 +460,15 @@ if __name__ == "__main__":
     # Parse command line arguments
     parser = argparse.ArgumentParser(description='WBSC Instagram Content Generator with Round Support')
     parser.add_argument('url', help='Base URL of the tournament (e.g., https://www.wbsceurope.org/en/events/tournament-name/)')
-    parser.add_argument('--delay', type=float, default=1.5, help='Delay between requests in seconds (default: 1.5)')
+    parser.add_argument('--delay', type=float, default=1.5, help='Starting interval between requests to a host in seconds, adapted to the server (default: 1.5)')
     parser.add_argument('--output', type=str, help='Output filename prefix (without extension)')
     parser.add_argument('--max-posts', type=int, default=10, help='Maximum number of posts to generate (default: 10)')
     
     args = parser.parse_args()
     
+    # Scraper stack is only needed when running as a script
+    from wbsc_standings_scraper import WBSCCompleteRoundScraper
+    
     print("🏆 COMPREHENSIVE ROUND-BASED WBSC INSTAGRAM AUTOMATION")
     print("=" * 80)
     print(f"🎯 Tournament URL: {args.url}")
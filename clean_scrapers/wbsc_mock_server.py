@@ -0,0 +1,484 @@
+#!/usr/bin/env python3
+"""
+Local mock of the WBSC tournament pages for load and concurrency tests
+Serves /schedule-and-results (Inertia data-page, partial reloads, ETags),
+/standings (HTML) and /stats (HTML table plus a JSON endpoint, both
+paginated) for tournaments built from fixture pages, with configurable
+latency, error rate, page size and per-client rate limit. The scrapers
+are pointed at it with --base-url.
+"""
+
+import argparse
+import gzip
+import hashlib
+import html
+import json
+import os
+import random
+import threading
+import time
+import logging
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlparse
+
+from wbsc_cassette import PAGE_SEGMENTS, tournament_key
+from wbsc_page_data import parse_data_page
+from wbsc_ratelimit import TokenBucket
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'archive', 'debug')
+DEFAULT_SCHEDULE_FIXTURE = os.path.join(FIXTURE_DIR, 'page_debug.html')
+DEFAULT_STANDINGS_FIXTURE = os.path.join(FIXTURE_DIR, 'standings_page.html')
+
+# Tournament served for any name that is not registered
+WILDCARD = '*'
+
+DEFAULT_PAGE_SIZE = 25
+STATS_CATEGORIES = ('batting', 'pitching', 'fielding')
+
+# Stats table columns: header -> player field
+STATS_COLUMNS = {
+    'batting': [('Player', 'name'), ('Team', 'team'), ('G', 'games'), ('AB', 'at_bats'), ('R', 'runs'),
+                ('H', 'hits'), ('HR', 'home_runs'), ('RBI', 'rbi'), ('AVG', 'batting_average')],
+    'pitching': [('Player', 'name'), ('Team', 'team'), ('W', 'wins'), ('L', 'losses'),
+                 ('IP', 'innings_pitched'), ('ER', 'earned_runs'), ('SO', 'strikeouts'), ('ERA', 'era')],
+    'fielding': [('Player', 'name'), ('Team', 'team'), ('PO', 'putouts'), ('A', 'assists'),
+                 ('E', 'errors'), ('FPCT', 'fielding_percentage')]
+}
+
+logger = logging.getLogger(__name__)
+
+
+def escape_attribute(value: str) -> str:
+    """Escape an attribute value the way the WBSC pages do (htmlspecialchars)"""
+    return html.escape(value, quote=True).replace('&#x27;', '&#039;')
+
+
+def render_data_page(page: Dict, title: str = '') -> bytes:
+    """Minimal HTML document carrying an Inertia page object in data-page"""
+    data = escape_attribute(json.dumps(page, ensure_ascii=False, separators=(',', ':')))
+    return (f'<!DOCTYPE html>\n<html lang="en">\n<head><meta charset="utf-8"><title>{html.escape(title)}</title></head>\n'
+            f'<body>\n<div id="app" data-page="{data}"></div>\n</body>\n</html>\n').encode('utf-8')
+
+
+def page_teams(games_page: Dict) -> List[str]:
+    """Team names of the games of a schedule-and-results page, in first-seen order"""
+    teams = {}
+    for game in games_page.get('props', {}).get('games', []):
+        for label in (game.get('homelabel'), game.get('awaylabel')):
+            if label:
+                teams[label] = True
+    return list(teams)
+
+
+def fixture_players(teams: List[str], players_per_team: int = 20, seed: int = 0) -> Dict[str, List[Dict]]:
+    """Reproducible player statistics per category for the given teams"""
+    players = []
+    for team in teams:
+        for number in range(1, players_per_team + 1):
+            players.append({'name': f"PLAYER{number:02d} {team.split()[0].upper()} Test", 'team': team, 'number': number})
+    return player_stats(players, seed)
+
+
+def player_stats(players: List[Dict], seed: int = 0) -> Dict[str, List[Dict]]:
+    """Reproducible statistics per category for players (dicts with name, team and number)"""
+    rng = random.Random(seed)
+    stats = {category: [] for category in STATS_CATEGORIES}
+    for player in players:
+        at_bats = rng.randint(0, 30)
+        hits = rng.randint(0, at_bats)
+        stats['batting'].append(dict(player, games=rng.randint(1, 9), at_bats=at_bats, runs=rng.randint(0, hits + 2),
+                                     hits=hits, home_runs=rng.randint(0, hits // 4 + 1) if hits else 0,
+                                     rbi=rng.randint(0, hits + 1),
+                                     batting_average=f"{hits / at_bats:.3f}" if at_bats else '.000'))
+
+        innings = rng.randint(0, 21)
+        earned = rng.randint(0, innings)
+        stats['pitching'].append(dict(player, wins=rng.randint(0, 2), losses=rng.randint(0, 2),
+                                      innings_pitched=innings, earned_runs=earned, strikeouts=rng.randint(0, innings * 2),
+                                      era=f"{earned * 7 / innings:.2f}" if innings else '0.00'))
+
+        putouts, assists, errors = rng.randint(0, 30), rng.randint(0, 20), rng.randint(0, 3)
+        chances = putouts + assists + errors
+        stats['fielding'].append(dict(player, putouts=putouts, assists=assists, errors=errors,
+                                      fielding_percentage=f"{(putouts + assists) / chances:.3f}" if chances else '1.000'))
+    return stats
+
+
+def stats_page(rows: List[Dict], query: Dict[str, str], page_size: int = DEFAULT_PAGE_SIZE) -> Tuple[List[Dict], Dict]:
+    """Rows of the requested stats page and its pagination info (page_size 0: all rows)"""
+    if 'start' in query or 'length' in query:
+        start = max(int(query.get('start', 0)), 0)
+        length = int(query.get('length', page_size or len(rows)))
+        length = len(rows) if length < 0 else length
+    else:
+        length = int(query.get('per_page', page_size)) or len(rows)
+        start = (max(int(query.get('page', 1)), 1) - 1) * length
+
+    page_rows = rows[start:start + length] if length else rows
+    per_page = length or len(rows) or 1
+    pagination = {
+        'current_page': start // per_page + 1,
+        'total_pages': max(1, -(-len(rows) // per_page)),
+        'per_page': per_page,
+        'total': len(rows),
+        'from': start + 1 if page_rows else 0,
+        'to': start + len(page_rows)
+    }
+    return page_rows, pagination
+
+
+def stats_page_object(tournament: 'MockTournament', path: str, query: Dict[str, str],
+                      page_size: int = DEFAULT_PAGE_SIZE) -> Dict:
+    """Inertia page object of a stats page"""
+    category = query.get('category', 'batting')
+    rows, pagination = stats_page(tournament.stats.get(category, []), query, page_size)
+    return {
+        'component': 'Stats/index.tsx',
+        'props': {'category': category, 'stats': rows, 'pagination': pagination},
+        'url': path,
+        'version': tournament.games_page.get('version', '')
+    }
+
+
+def render_stats_html(tournament: 'MockTournament', path: str, query: Dict[str, str],
+                      page_size: int = DEFAULT_PAGE_SIZE) -> bytes:
+    """Stats page: Inertia data-page with the page's rows plus the same rows as a table"""
+    page = stats_page_object(tournament, path, query, page_size)
+    props = page['props']
+    rows, pagination = props['stats'], props['pagination']
+    columns = STATS_COLUMNS.get(props['category'], STATS_COLUMNS['batting'])
+
+    head = ''.join(f'<th>{header}</th>' for header, _ in columns)
+    body = ''.join(
+        '<tr>' + ''.join(f'<td>{html.escape(str(row.get(field, "")))}</td>' for _, field in columns) + '</tr>'
+        for row in rows
+    )
+    data = escape_attribute(json.dumps(page, ensure_ascii=False, separators=(',', ':')))
+    return (f'<!DOCTYPE html>\n<html lang="en">\n<head><meta charset="utf-8"><title>Stats</title></head>\n<body>\n'
+            f'<div id="app" data-page="{data}"></div>\n'
+            f'<table class="table stats-table"><thead><tr>{head}</tr></thead><tbody>{body}</tbody></table>\n'
+            f'<div class="dataTables_info">Showing {pagination["from"]} to {pagination["to"]} of '
+            f'{pagination["total"]} entries</div>\n</body>\n</html>\n').encode('utf-8')
+
+
+def stats_json(tournament: 'MockTournament', query: Dict[str, str], page_size: int = DEFAULT_PAGE_SIZE) -> bytes:
+    """Stats endpoint: Laravel paginator (page/per_page) or DataTables (start/length) payload"""
+    rows, pagination = stats_page(tournament.stats.get(query.get('category', 'batting'), []), query, page_size)
+    if 'start' in query or 'length' in query:
+        payload = {'draw': int(query.get('draw', 1)), 'recordsTotal': pagination['total'],
+                   'recordsFiltered': pagination['total'], 'data': rows}
+    else:
+        payload = {'data': rows, 'current_page': pagination['current_page'], 'last_page': pagination['total_pages'],
+                   'per_page': pagination['per_page'], 'total': pagination['total']}
+    return json.dumps(payload, ensure_ascii=False).encode('utf-8')
+
+
+def inertia_response(page: Dict, path: str, partial_component: str = '', partial_data: str = '') -> bytes:
+    """JSON answer to an Inertia request: the page object with only the requested props"""
+    props = page.get('props', {})
+    if partial_component and partial_component == page.get('component'):
+        only = partial_data.split(',')
+        props = {key: value for key, value in props.items() if key in only}
+    return json.dumps(dict(page, props=props, url=path), ensure_ascii=False).encode('utf-8')
+
+
+class MockTournament:
+    def __init__(self, name: str, games_page: Dict, standings_html: bytes, stats: Dict[str, List[Dict]]):
+        """
+        Initialize a mock tournament
+
+        Args:
+            name: Tournament URL segment it is served under (WILDCARD: any)
+            games_page: Inertia page object of schedule-and-results
+            standings_html: Standings page as served
+            stats: Category -> player stat dicts (name, team, number and stat fields)
+        """
+        self.name = name
+        self.games_page = games_page
+        self.standings_html = standings_html
+        self.stats = stats
+
+        self._games_html: Optional[bytes] = None
+        self._etags: Dict[str, str] = {}
+
+    @classmethod
+    def from_fixtures(cls, name: str = WILDCARD, schedule_path: str = DEFAULT_SCHEDULE_FIXTURE,
+                      standings_path: str = DEFAULT_STANDINGS_FIXTURE, players_per_team: int = 20,
+                      seed: int = 0) -> 'MockTournament':
+        """Tournament from saved schedule-and-results and standings pages"""
+        with open(schedule_path, 'rb') as f:
+            games_page = parse_data_page(f.read())
+        if not games_page:
+            raise ValueError(f"No data-page found in {schedule_path}")
+
+        with open(standings_path, 'rb') as f:
+            standings_html = f.read()
+
+        return cls(name, games_page, standings_html, fixture_players(page_teams(games_page), players_per_team, seed))
+
+    @classmethod
+    def from_cassette(cls, path: str, name: Optional[str] = None, players_per_team: int = 20,
+                      seed: int = 0) -> 'MockTournament':
+        """Tournament from the pages recorded in a cassette (see wbsc_cassette)"""
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            interactions = json.load(f).get('interactions', [])
+
+        pages = {}
+        for interaction in interactions:
+            request, response = interaction['request'], interaction['response']
+            segment = urlparse(request['url']).path.rstrip('/').rsplit('/', 1)[-1]
+            inertia = any(header.lower() == 'x-inertia' for header in request.get('headers', {}))
+            if response['status'] == 200 and not inertia and response.get('body_encoding') == 'utf-8':
+                pages[segment] = response['body'].encode('utf-8')
+
+        if 'schedule-and-results' not in pages or 'standings' not in pages:
+            raise ValueError(f"{path} holds no full schedule-and-results and standings pages")
+
+        games_page = parse_data_page(pages['schedule-and-results'])
+        return cls(name or WILDCARD, games_page, pages['standings'],
+                   fixture_players(page_teams(games_page), players_per_team, seed))
+
+    def games_html(self) -> bytes:
+        """The schedule-and-results page (rendered once)"""
+        if self._games_html is None:
+            self._games_html = render_data_page(self.games_page, 'Schedule and results')
+        return self._games_html
+
+    def etag(self, page: str, body: bytes) -> str:
+        """ETag of a page body (computed once per page)"""
+        if page not in self._etags:
+            self._etags[page] = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+        return self._etags[page]
+
+
+class WBSCMockServer:
+    def __init__(self, tournaments: List[MockTournament], host: str = '127.0.0.1', port: int = 0,
+                 latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 error_statuses: Tuple[int, ...] = (429, 503), retry_after: float = 1.0,
+                 page_size: int = DEFAULT_PAGE_SIZE, max_rate: Optional[float] = None, seed: Optional[int] = None):
+        """
+        Initialize the mock server
+
+        Args:
+            tournaments: Served tournaments, looked up by the URL segment before the page
+            port: Port to listen on (0: any free port)
+            latency: Seconds every response is delayed
+            jitter: Additional random delay of up to this many seconds
+            error_rate: Fraction of requests answered with one of error_statuses
+            error_statuses: Statuses of the injected errors (429/503 carry Retry-After)
+            retry_after: Retry-After seconds of injected and rate-limited responses
+            page_size: Stats rows per page (0: all rows on one page)
+            max_rate: Requests per second per client before answering 429 (None: unlimited)
+            seed: Seed for latency jitter and error injection
+        """
+        self.tournaments = {tournament.name: tournament for tournament in tournaments}
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_statuses = tuple(error_statuses)
+        self.retry_after = retry_after
+        self.page_size = page_size
+        self.max_rate = max_rate
+
+        self.counters = Counter()
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+        self.httpd = ThreadingHTTPServer((host, port), _MockRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.mock = self
+        self._thread: Optional[threading.Thread] = None
+
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'WBSCMockServer':
+        """Serve in a background thread"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='wbsc-mock', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def tournament(self, name: str) -> Optional[MockTournament]:
+        return self.tournaments.get(name) or self.tournaments.get(WILDCARD)
+
+    def _random_value(self) -> float:
+        with self._lock:
+            return self._random.random()
+
+    def injected_failure(self, client: str) -> Optional[int]:
+        """Status of a simulated failure for this request, or None to serve it"""
+        if self.max_rate:
+            with self._lock:
+                bucket = self._buckets.get(client)
+                if bucket is None:
+                    bucket = self._buckets[client] = TokenBucket(self.max_rate, max(1.0, self.max_rate))
+            if not bucket.try_acquire():
+                return 429
+
+        if self.error_rate and self.error_statuses and self._random_value() < self.error_rate:
+            with self._lock:
+                return self._random.choice(self.error_statuses)
+        return None
+
+    def delay(self) -> float:
+        return self.latency + (self.jitter * self._random_value() if self.jitter else 0.0)
+
+    def request_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counters)
+
+    def count(self, key: str):
+        with self._lock:
+            self.counters[key] += 1
+
+
+class _MockRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+    def do_GET(self):
+        mock: WBSCMockServer = self.server.mock
+        mock.count('requests')
+
+        delay = mock.delay()
+        if delay > 0:
+            time.sleep(delay)
+
+        failure = mock.injected_failure(self.client_address[0])
+        if failure:
+            mock.count(str(failure))
+            headers = {'Retry-After': f"{mock.retry_after:g}"} if failure in (429, 503) else {}
+            return self._send(failure, b'', 'text/plain', headers)
+
+        parts = urlparse(self.path)
+        query = dict(parse_qsl(parts.query))
+        segments = [segment for segment in parts.path.split('/') if segment]
+        page_index = next((i for i, segment in enumerate(segments) if segment in PAGE_SEGMENTS), None)
+        tournament = mock.tournament(tournament_key(self.path)) if page_index else None
+        if tournament is None:
+            mock.count('404')
+            return self._send(404, b'Not found', 'text/plain')
+
+        page = segments[page_index:]
+        if page == ['schedule-and-results']:
+            return self._send_games(mock, tournament, parts.path)
+        if page == ['standings']:
+            return self._send_cacheable(mock, tournament.etag('standings', tournament.standings_html),
+                                        tournament.standings_html, 'text/html; charset=utf-8')
+        if page[0] in ('stats', 'statistics'):
+            if page[1:] == ['data']:
+                return self._send(200, stats_json(tournament, query, mock.page_size), 'application/json')
+            if len(page) == 1:
+                return self._send(200, render_stats_html(tournament, parts.path, query, mock.page_size),
+                                  'text/html; charset=utf-8')
+
+        mock.count('404')
+        return self._send(404, b'Not found', 'text/plain')
+
+    def _send_games(self, mock: WBSCMockServer, tournament: MockTournament, path: str):
+        page = tournament.games_page
+        if not self.headers.get('X-Inertia'):
+            body = tournament.games_html()
+            return self._send_cacheable(mock, tournament.etag('schedule-and-results', body), body,
+                                        'text/html; charset=utf-8')
+
+        # Inertia partial reload: a stale asset version gets a 409 and a full reload
+        if self.headers.get('X-Inertia-Version') != page.get('version'):
+            mock.count('409')
+            return self._send(409, b'', 'text/plain', {'X-Inertia-Location': path})
+
+        partial_data = self.headers.get('X-Inertia-Partial-Data') or ''
+        body = inertia_response(page, path, self.headers.get('X-Inertia-Partial-Component') or '', partial_data)
+        mock.count('inertia')
+        return self._send_cacheable(mock, tournament.etag(f"schedule-and-results:{partial_data}", body), body,
+                                    'application/json', {'X-Inertia': 'true', 'Vary': 'X-Inertia'})
+
+    def _send_cacheable(self, mock: WBSCMockServer, etag: str, body: bytes, content_type: str,
+                        headers: Optional[Dict[str, str]] = None):
+        headers = dict(headers or {}, ETag=etag)
+        if self.headers.get('If-None-Match') == etag:
+            mock.count('304')
+            return self._send(304, b'', content_type, headers)
+        return self._send(200, body, content_type, headers)
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Local mock of the WBSC tournament pages')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8766, help='Port to listen on (default: 8766)')
+    parser.add_argument('--cassette', help='Serve the pages recorded in this cassette instead of the archive fixtures')
+    parser.add_argument('--schedule', default=DEFAULT_SCHEDULE_FIXTURE, help='schedule-and-results page fixture')
+    parser.add_argument('--standings', default=DEFAULT_STANDINGS_FIXTURE, help='Standings page fixture')
+    parser.add_argument('--players-per-team', type=int, default=20, help='Synthesized stats players per team (default: 20)')
+    parser.add_argument('--synthetic-games', type=int, help='Serve a generated tournament with this many games instead (see wbsc_synthetic)')
+    parser.add_argument('--synthetic-players', type=int, help='Players of the generated tournament (default: 5 per game)')
+    parser.add_argument('--synthetic-rounds', type=int, default=5, help='Rounds of the generated tournament (default: 5)')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds every response is delayed (default: 0)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Additional random delay of up to this many seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with an error (default: 0)')
+    parser.add_argument('--error-status', type=int, nargs='+', default=[429, 503], help='Statuses of injected errors (default: 429 503)')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After seconds of 429/503 answers (default: 1)')
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE, help=f'Stats rows per page, 0 for all (default: {DEFAULT_PAGE_SIZE})')
+    parser.add_argument('--max-rate', type=float, help='Requests per second per client before answering 429')
+    parser.add_argument('--seed', type=int, help='Seed for jitter and error injection')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if args.synthetic_games:
+        from wbsc_synthetic import generate_tournament
+        players = args.synthetic_players if args.synthetic_players is not None else args.synthetic_games * 5
+        tournament = generate_tournament(args.synthetic_games, players, args.synthetic_rounds, seed=args.seed or 0)
+    elif args.cassette:
+        tournament = MockTournament.from_cassette(args.cassette, players_per_team=args.players_per_team)
+    else:
+        tournament = MockTournament.from_fixtures(schedule_path=args.schedule, standings_path=args.standings,
+                                                  players_per_team=args.players_per_team)
+
+    server = WBSCMockServer(
+        [tournament], args.host, args.port, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        error_statuses=tuple(args.error_status), retry_after=args.retry_after, page_size=args.page_size,
+        max_rate=args.max_rate, seed=args.seed
+    )
+
+    print(f"🧪 Mock WBSC server on {server.url} ({len(tournament.games_page.get('props', {}).get('games', []))} games, "
+          f"{len(tournament.stats['batting'])} players)")
+    print(f"   Any tournament URL works, e.g.: python wbsc_standings_scraper.py "
+          f"https://www.wbsceurope.org/en/events/test --base-url {server.url}")
+
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f"\n📊 {server.request_stats()}")
@@ -0,0 +1,365 @@
+"""
+Inertia page data extraction with an on-disk revalidation cache
+WBSC pages embed their data as JSON in <div data-page="...">; the decoded
+JSON is cached together with the response validators (ETag/Last-Modified)
+so unchanged pages are answered with a 304 and never parsed again.
+Once the Inertia component and asset version of a page are known, only the
+needed props are requested as JSON (partial reload), skipping the HTML; the
+partial reloads are revalidated the same way.
+"""
+
+import hashlib
+import importlib.util
+import json
+import os
+import threading
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from wbsc_html import decode_attribute_entities, extract_data_page_attribute, find_data_page_bytes
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '.cache', 'pages')
+
+logger = logging.getLogger(__name__)
+
+# orjson decodes the large data-page JSON several times faster when installed
+if importlib.util.find_spec('orjson') is not None:
+    from orjson import loads as _json_loads
+else:
+    _json_loads = json.loads
+
+_json_decoder = json.JSONDecoder()
+
+
+def _skip_whitespace(text: str, index: int) -> int:
+    """Index of the next non-whitespace character"""
+    while text[index] in ' \t\n\r':
+        index += 1
+    return index
+
+
+def _decode_object(text: str, index: int, keep=None, nested=None):
+    """
+    Decode the JSON object starting at text[index] member by member
+
+    Args:
+        keep: Member names to keep (None keeps all), others are dropped right away
+        nested: Member name -> keep set applied to that member's own object
+
+    Returns:
+        (decoded dict, index after the object)
+    """
+    result = {}
+    index = _skip_whitespace(text, index + 1)
+
+    while text[index] != '}':
+        key, index = _json_decoder.raw_decode(text, index)
+        index = _skip_whitespace(text, _skip_whitespace(text, index) + 1)
+
+        if nested and key in nested and text[index] == '{':
+            value, index = _decode_object(text, index, nested[key])
+        else:
+            value, index = _json_decoder.raw_decode(text, index)
+
+        if keep is None or key in keep:
+            result[key] = value
+
+        index = _skip_whitespace(text, index)
+        if text[index] == ',':
+            index = _skip_whitespace(text, index + 1)
+
+    return result, index + 1
+
+
+def decode_page_json(data: bytes, only: Optional[List[str]] = None) -> Dict:
+    """
+    Decode the entity-decoded data-page JSON
+
+    With only, the page object is walked member by member and just the
+    requested props are kept; the other prop subtrees are released as soon
+    as they are scanned instead of staying referenced by the result.
+    """
+    if not only:
+        return _json_loads(data)
+
+    text = data.decode('utf-8')
+    page, _ = _decode_object(text, _skip_whitespace(text, 0), nested={'props': set(only)})
+    return page
+
+
+def parse_data_page(content: bytes, backend: Optional[str] = None,
+                    only: Optional[List[str]] = None) -> Optional[Dict]:
+    """
+    Parse the Inertia data-page JSON out of a full HTML document
+
+    Args:
+        content: Raw response body
+        backend: Parser backend for the fallback path (defaults to the active one)
+        only: Props to keep; None decodes the whole page object
+    """
+    # Fast path: slice the attribute out of the bytes, no HTML tree at all
+    data_page = find_data_page_bytes(content) if isinstance(content, bytes) else None
+    if data_page is not None:
+        try:
+            return decode_page_json(decode_attribute_entities(data_page), only)
+        except (ValueError, IndexError) as e:
+            logger.warning(f"Byte-level data-page extraction failed, parsing the HTML: {e}")
+
+    # Only the data-page div is parsed, with the selected parser backend
+    data_page = extract_data_page_attribute(content, backend)
+    if data_page is None:
+        return None
+
+    # The parser already decoded the attribute entities
+    return decode_page_json(data_page.encode('utf-8'), only)
+
+
+class PageDataCache:
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        """
+        Initialize the page data cache
+
+        Args:
+            cache_dir: Directory holding one JSON file per cached URL
+        """
+        self.cache_dir = cache_dir
+        self._entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, url: str) -> str:
+        """File path of the cache entry for a URL"""
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def load(self, url: str) -> Optional[Dict]:
+        """Load the cache entry for a URL (memory first, then disk)"""
+        with self._lock:
+            if url in self._entries:
+                return self._entries[url]
+
+        try:
+            with open(self._path(url), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        with self._lock:
+            self._entries[url] = entry
+        return entry
+
+    def conditional_headers(self, url: str, only: Optional[List[str]] = None) -> Dict[str, str]:
+        """Revalidation headers for a URL (or its partial reload of the props only), empty if nothing is cached"""
+        entry = self.load(url)
+        if entry and only:
+            entry = entry.get('partials', {}).get(','.join(only))
+        if not entry:
+            return {}
+
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def load_partial(self, url: str, only: List[str]) -> Optional[Dict]:
+        """Cached page object of a partial reload of the props only"""
+        entry = self.load(url)
+        partial = entry.get('partials', {}).get(','.join(only)) if entry else None
+        return partial['page_data'] if partial else None
+
+    def store(self, url: str, response, page_data: Dict):
+        """Store decoded page data together with the response validators"""
+        # Pages without validators are still stored - their Inertia
+        # component and version enable the partial reload fast path.
+        # Partial reloads cached for an older page are dropped with it
+        self._write(url, {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'stored_at': datetime.now().isoformat(),
+            'page_data': page_data
+        })
+
+    def store_partial(self, url: str, only: List[str], response, page_data: Dict):
+        """Store a partial reload response next to the cached full page"""
+        entry = self.load(url)
+        # Without validators the props could never be revalidated
+        if not entry or not (response.headers.get('ETag') or response.headers.get('Last-Modified')):
+            return
+
+        partials = dict(entry.get('partials', {}))
+        partials[','.join(only)] = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'page_data': page_data
+        }
+        self._write(url, dict(entry, partials=partials))
+
+    def _write(self, url: str, entry: Dict):
+        """Write a cache entry to memory and (atomically) to disk"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._path(url)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write page cache for {url}: {e}")
+
+        with self._lock:
+            self._entries[url] = entry
+
+
+_default_cache: Optional[PageDataCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_page_cache() -> PageDataCache:
+    """Return the process-wide page data cache"""
+    global _default_cache
+
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = PageDataCache()
+        return _default_cache
+
+
+# Hosts that answered a partial reload with something other than Inertia JSON
+_inertia_rejected_hosts = set()
+
+
+def inertia_request_headers(url: str, cache: Optional[PageDataCache],
+                            only: Optional[List[str]]) -> Optional[Dict[str, str]]:
+    """
+    Headers for an Inertia partial reload of the given props
+
+    The partial reload needs the page component and asset version, which
+    come from a previously cached full page.
+
+    Returns:
+        The request headers, or None if a partial reload is not possible
+    """
+    if not only or not cache or urlparse(url).netloc in _inertia_rejected_hosts:
+        return None
+
+    entry = cache.load(url)
+    cached_page = entry.get('page_data', {}) if entry else {}
+    if not cached_page.get('component') or not cached_page.get('version'):
+        return None
+
+    headers = {
+        'X-Inertia': 'true',
+        'X-Inertia-Version': cached_page['version'],
+        'X-Inertia-Partial-Component': cached_page['component'],
+        'X-Inertia-Partial-Data': ','.join(only),
+        'X-Requested-With': 'XMLHttpRequest',
+        'Accept': 'text/html, application/xhtml+xml'
+    }
+    # Revalidate the props of the previous partial reload
+    headers.update(cache.conditional_headers(url, only))
+    return headers
+
+
+def page_request_headers(url: str, cache: Optional[PageDataCache] = None,
+                         only: Optional[List[str]] = None) -> Dict[str, str]:
+    """Headers of the first request fetch_page_data() sends (used for prefetching)"""
+    headers = inertia_request_headers(url, cache, only)
+    if headers is None:
+        headers = cache.conditional_headers(url) if cache else {}
+    return headers
+
+
+def _parse_inertia_response(url: str, response) -> Optional[Dict]:
+    """
+    Decode an Inertia partial reload response
+
+    Returns:
+        The page object ({component, props, url, version}) or None when the
+        server rejects the partial reload (asset version changed, no Inertia)
+        or it failed
+    """
+    host = urlparse(url).netloc
+
+    # 409 means the asset version changed - the HTML path refreshes it
+    if response.status_code == 409:
+        logger.info(f"Inertia version changed for {url}, falling back to HTML")
+        return None
+
+    # Errors (rate limits, outages) fall back for this request only
+    if response.status_code != 200:
+        logger.info(f"Inertia partial reload of {url} returned {response.status_code}, falling back to HTML")
+        return None
+
+    # A plain page instead of Inertia JSON means the host does not support them
+    if not response.headers.get('X-Inertia'):
+        logger.info(f"{host} does not support Inertia partial reloads, falling back to HTML")
+        _inertia_rejected_hosts.add(host)
+        return None
+
+    try:
+        return response.json()
+    except ValueError:
+        logger.warning(f"Invalid Inertia JSON from {url}, falling back to HTML")
+        return None
+
+
+def fetch_page_data(http_client, url: str, cache: Optional[PageDataCache] = None,
+                    only: Optional[List[str]] = None) -> Optional[Dict]:
+    """
+    Fetch a page and return its decoded data-page JSON
+
+    With a cache, the request (or Inertia partial reload) is sent as a
+    conditional GET; a 304 returns the previously decoded data without
+    downloading or parsing the page.
+
+    Args:
+        http_client: WBSCHttpClient used for the requests
+        url: Page URL
+        cache: Optional page data cache
+        only: Props to request as Inertia JSON; needs a cached full page
+              (for component and version) and falls back to HTML otherwise.
+              Without a cache, only these props are decoded from the HTML
+
+    Returns:
+        The page data, or None if the page has no data-page div
+    """
+    headers = inertia_request_headers(url, cache, only)
+    if headers:
+        try:
+            response = http_client.get(url, headers=headers)
+            if response.status_code == 304:
+                page_data = cache.load_partial(url, only)
+                if page_data is not None:
+                    logger.info(f"Props unchanged (304), using cached Inertia JSON for {url}")
+                    return page_data
+
+            page_data = _parse_inertia_response(url, response)
+            if page_data is not None:
+                logger.info(f"Fetched props {', '.join(only)} as Inertia JSON from {url}")
+                cache.store_partial(url, only, response, page_data)
+                return page_data
+        except Exception as e:
+            logger.warning(f"Inertia partial reload failed for {url}: {e}")
+
+    headers = cache.conditional_headers(url) if cache else {}
+    response = http_client.get(url, headers=headers or None)
+
+    if response.status_code == 304 and cache:
+        entry = cache.load(url)
+        if entry:
+            logger.info(f"Page unchanged (304), using cached data for {url}")
+            return entry['page_data']
+
+    response.raise_for_status()
+
+    # The cache keeps the whole page (component, version, all props); without
+    # one only the requested props are decoded
+    page_data = parse_data_page(response.content, only=None if cache else only)
+    if page_data is not None and cache:
+        cache.store(url, response, page_data)
+
+    return page_data
@@ -0,0 +1,209 @@
+"""
+Per-host token-bucket rate limiting for all WBSC requests
+Every HTTP request and browser page load takes a token from its host's
+bucket, so only actual network traffic is paced. The rate adapts to the
+host: each successful request raises it a little up to max_rate, and a
+429/503 halves it and pauses the host for Retry-After (or a jittered
+exponential backoff).
+"""
+
+import random
+import threading
+import time
+import logging
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+# Status codes that mean "slow down" and are retried
+RETRY_STATUSES = frozenset([429, 503])
+
+# Backoff without Retry-After: base * 2^attempt seconds, capped, with full jitter
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 60.0
+
+# Window of the observed request rate metric in seconds
+RATE_WINDOW = 60.0
+
+logger = logging.getLogger(__name__)
+
+
+def host_of(url: str) -> str:
+    return urlparse(url).netloc.lower()
+
+
+def retry_delay(response, attempt: int, base: float = BACKOFF_BASE, cap: float = BACKOFF_CAP) -> float:
+    """
+    Seconds to wait before retrying a throttled response
+
+    Retry-After (seconds or an HTTP date) is honoured; otherwise the delay is
+    a full-jitter exponential backoff so parallel clients do not retry in step.
+    """
+    retry_after = response.headers.get('Retry-After') if response is not None else None
+    if retry_after:
+        try:
+            return min(max(float(retry_after), 0.0), cap)
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+            return min(max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0), cap)
+        except (TypeError, ValueError):
+            pass
+
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float):
+        """
+        Initialize a token bucket
+
+        Args:
+            rate: Tokens (requests) added per second
+            burst: Bucket size - requests allowed back to back
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """Take a token; returns the seconds to wait before it may be used"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            # The balance may go negative: later callers queue behind earlier ones
+            self.tokens -= 1
+            return max(0.0, -self.tokens / self.rate, self.blocked_until - now)
+
+    def try_acquire(self) -> bool:
+        """Take a token only if one is available right now"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if self.tokens < 1 or now < self.blocked_until:
+                return False
+            self.tokens -= 1
+            return True
+
+    def set_rate(self, rate: float):
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+
+    def block(self, seconds: float):
+        """Hand out no token before the given number of seconds from now"""
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+class HostRateLimiter:
+    def __init__(self, rate: float = 1.0, burst: float = 2.0, max_rate: float = 8.0,
+                 min_rate: float = 0.05, increase: float = 0.1):
+        """
+        Initialize the per-host limiter
+
+        Args:
+            rate: Starting requests per second per host
+            burst: Requests a host may receive back to back
+            max_rate: Ceiling the rate grows to while the host answers normally
+            min_rate: Floor the rate is halved down to on 429/503
+            increase: Rate added per successful request
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.increase = increase
+        # Disabled limiters only count requests (e.g. when replaying a cassette)
+        self.enabled = True
+
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._history: Dict[str, deque] = {}
+        self._counters: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, delay: float):
+        """Start every host at one request per delay seconds (0 starts at max_rate)"""
+        rate = min(1.0 / delay, self.max_rate) if delay > 0 else self.max_rate
+        with self._lock:
+            # Scrapers sharing the limiter configure it again - keep the adapted rates
+            if rate == self.rate:
+                return
+            self.rate = rate
+            buckets = list(self._buckets.values())
+        for bucket in buckets:
+            bucket.set_rate(rate)
+
+    def _bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(self.rate, self.burst)
+                self._history[host] = deque()
+                self._counters[host] = {'requests': 0, 'throttled': 0, 'waited': 0.0}
+            return bucket
+
+    def acquire(self, url: str) -> float:
+        """Wait for the host's next token; returns the seconds waited"""
+        host = host_of(url)
+        bucket = self._bucket(host)
+        wait = bucket.reserve() if self.enabled else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+        now = time.monotonic()
+        with self._lock:
+            history = self._history[host]
+            history.append(now)
+            while history and history[0] < now - RATE_WINDOW:
+                history.popleft()
+            counters = self._counters[host]
+            counters['requests'] += 1
+            counters['waited'] += wait
+        return wait
+
+    def record_success(self, url: str):
+        """Additive increase: a normal answer lets the host's rate grow a little"""
+        bucket = self._bucket(host_of(url))
+        if bucket.rate < self.max_rate:
+            bucket.set_rate(min(self.max_rate, bucket.rate + self.increase))
+
+    def throttle(self, url: str, delay: float):
+        """Multiplicative decrease after a 429/503, and pause the host for delay seconds"""
+        host = host_of(url)
+        bucket = self._bucket(host)
+        bucket.set_rate(max(self.min_rate, bucket.rate / 2))
+        bucket.block(delay)
+        with self._lock:
+            self._counters[host]['throttled'] += 1
+        logger.warning(f"{host} is rate limiting, pausing {delay:.1f}s (now {bucket.rate:.2f} req/s)")
+
+    def observed_rate(self, host: Optional[str] = None) -> float:
+        """Requests per second actually sent over the last RATE_WINDOW seconds (one host or all)"""
+        now = time.monotonic()
+        with self._lock:
+            hosts = [host] if host else list(self._history)
+            stamps = [stamp for name in hosts for stamp in self._history.get(name, ()) if stamp >= now - RATE_WINDOW]
+        if len(stamps) < 2:
+            return 0.0
+        return len(stamps) / max(now - min(stamps), 1.0)
+
+    def stats(self) -> Dict[str, Dict]:
+        """Per-host counters: requests, throttled, waited seconds, current and observed rate"""
+        with self._lock:
+            hosts = {host: dict(counters, rate=round(self._buckets[host].rate, 2))
+                     for host, counters in self._counters.items()}
+        for host, host_stats in hosts.items():
+            host_stats['observed_rate'] = round(self.observed_rate(host), 2)
+            host_stats['waited'] = round(host_stats['waited'], 2)
+        return hosts
@@ -0,0 +1,447 @@
+"""
+Standings computed locally from game results
+Every round/group keeps its team records (W/L/T, runs); a newly final or
+corrected game only touches the records and the ordered table of its own
+group. The standings page is then only needed now and then to reconcile.
+Ties are broken with the WBSC tiebreakers (wbsc_tiebreakers) when NumPy is
+installed, which also projects final positions over the remaining games.
+"""
+
+import importlib.util
+import logging
+from typing import Dict, List, Optional, Set, Tuple
+
+NUMPY_AVAILABLE = importlib.util.find_spec('numpy') is not None
+
+
+def is_final_status(status) -> bool:
+    """True for final game states ('F', or 'F/7' for a shortened game)"""
+    status = str(status or '').strip().upper()
+    return status == 'F' or status.startswith('F/')
+
+
+def games_behind(leader: Dict, record: Dict):
+    """Games behind the leader: int when whole, .5 otherwise (as on the standings page)"""
+    gb = ((leader['wins'] - record['wins']) + (record['losses'] - leader['losses'])) / 2
+    return int(gb) if gb == int(gb) else gb
+
+
+def innings_batted(game: Dict) -> Tuple[float, float]:
+    """Innings batted by the home and away team (wbsc_tiebreakers.innings_batted, 0 without NumPy)"""
+    if not NUMPY_AVAILABLE:
+        return 0.0, 0.0
+    from wbsc_tiebreakers import innings_batted as _innings_batted
+    return _innings_batted(game)
+
+
+def _team_key(game: Dict, side: str) -> str:
+    """Stable team key of one side of a game (IOC code, else the team name)"""
+    return game.get(f'{side}_ioc') or game.get(f'{side}_team') or ''
+
+
+def _group_key(game: Dict) -> Optional[Tuple[str, str]]:
+    """(round key, group name) of a processed game, None outside of a standings group"""
+    group_name = game.get('group_name') or game.get('group')
+    # Knockout games carry a group id that no team belongs to, and older game data uses '0'
+    if not group_name or str(group_name) == '0':
+        return None
+    round_key = game.get('round_id') or game.get('round_name') or game.get('round') or ''
+    return str(round_key), str(group_name)
+
+
+class StandingsEngine:
+    def __init__(self):
+        """Initialize an empty engine; feed it with apply_games()"""
+        # (round key, group) -> team key -> record
+        self._groups: Dict[Tuple[str, str], Dict[str, Dict]] = {}
+        # (round key, group) -> ordered standings rows (and their team keys), rebuilt per touched group
+        self._tables: Dict[Tuple[str, str], List[Dict]] = {}
+        self._team_order: Dict[Tuple[str, str], List[str]] = {}
+        # game_id -> (group key, home key, away key, home runs, away runs,
+        # home innings, away innings) of the applied result
+        self._applied: Dict = {}
+        # (round key, group) -> game_id -> applied result, for the tiebreaker matrices
+        self._results: Dict[Tuple[str, str], Dict] = {}
+        # game_id -> (group key, home key, away key) of games still to be played
+        self._pending: Dict = {}
+        # Groups whose rows are rebuilt after the current apply
+        self._stale: Set[Tuple[str, str]] = set()
+        # (round key, group) -> team key -> W/L/T the standings page adds to
+        # the game results, set by reconcile()
+        self._corrections: Dict[Tuple[str, str], Dict[str, Dict[str, int]]] = {}
+        # Round key -> display name (standings page tab names, else the game labels)
+        self.round_names: Dict[str, str] = {}
+        self._game_round_names: Dict[str, str] = {}
+
+        # Break ties with head-to-head and TQB (needs NumPy)
+        self.tiebreakers = NUMPY_AVAILABLE
+
+        self.logger = logging.getLogger(__name__)
+
+    def set_round_names(self, round_names: Dict):
+        """
+        Name the rounds like the standings page does
+
+        Args:
+            round_names: Round id (standings tab id) -> round name
+        """
+        self.round_names.update({str(round_id): name for round_id, name in round_names.items()})
+        for group_key in self._tables:
+            self._refresh_group(group_key)
+
+    def round_name(self, round_key: str) -> str:
+        """Display name of a round"""
+        return self.round_names.get(round_key) or self._game_round_names.get(round_key) or round_key
+
+    def _register_team(self, group_key: Tuple[str, str], key: str, name: str, ioc: str) -> bool:
+        """Add a team with an empty record to a group; True if it was new"""
+        teams = self._groups.setdefault(group_key, {})
+        if key in teams:
+            return False
+        teams[key] = {'team_key': key, 'team_name': name, 'team_ioc': ioc, 'wins': 0, 'losses': 0, 'ties': 0,
+                      'runs_scored': 0, 'runs_allowed': 0}
+        return True
+
+    def _add_result(self, result: Tuple, sign: int):
+        """Add (sign=1) or remove (sign=-1) a game result from its group records"""
+        group_key, home_key, away_key, home_runs, away_runs = result[:5]
+        teams = self._groups[group_key]
+        home, away = teams[home_key], teams[away_key]
+
+        home['runs_scored'] += sign * home_runs
+        home['runs_allowed'] += sign * away_runs
+        away['runs_scored'] += sign * away_runs
+        away['runs_allowed'] += sign * home_runs
+
+        if home_runs > away_runs:
+            home['wins'] += sign
+            away['losses'] += sign
+        elif away_runs > home_runs:
+            away['wins'] += sign
+            home['losses'] += sign
+        else:
+            home['ties'] += sign
+            away['ties'] += sign
+
+    def apply_game(self, game: Dict) -> Optional[Tuple[str, str]]:
+        """
+        Update the standings with one processed game
+
+        Scheduled games only register their teams; a final game adds its
+        result, and a changed final score replaces the previously applied one.
+
+        Returns:
+            The (round key, group) that changed, or None if nothing changed
+        """
+        group_key = self._apply_game(game)
+        self._refresh_stale()
+        return group_key
+
+    def _apply_game(self, game: Dict) -> Optional[Tuple[str, str]]:
+        """apply_game() without rebuilding the rows; touched groups are marked stale"""
+        home_key, away_key = _team_key(game, 'home'), _team_key(game, 'away')
+        group_key = _group_key(game)
+        if not home_key or not away_key or group_key is None:
+            return None
+
+        if game.get('round_name') and group_key[0] not in self._game_round_names:
+            self._game_round_names[group_key[0]] = game['round_name']
+
+        changed = self._register_team(group_key, home_key, game.get('home_team', ''), game.get('home_ioc', ''))
+        changed = self._register_team(group_key, away_key, game.get('away_team', ''), game.get('away_ioc', '')) or changed
+
+        game_id = game.get('game_id')
+        final = is_final_status(game.get('status'))
+        result = None
+        if final:
+            try:
+                result = (group_key, home_key, away_key, int(game.get('home_runs') or 0), int(game.get('away_runs') or 0),
+                          *innings_batted(game))
+            except (TypeError, ValueError):
+                self.logger.warning(f"Skipping game {game.get('game_id')} with unreadable score")
+
+        if final:
+            self._pending.pop(game_id, None)
+        else:
+            self._pending[game_id] = (group_key, home_key, away_key)
+
+        previous = self._applied.get(game_id)
+        if result != previous:
+            if previous:
+                self._add_result(previous, -1)
+                self._results[previous[0]].pop(game_id, None)
+                if previous[0] != group_key:
+                    self._stale.add(previous[0])
+            if result:
+                self._add_result(result, 1)
+                self._applied[game_id] = result
+                self._results.setdefault(group_key, {})[game_id] = result
+            else:
+                self._applied.pop(game_id, None)
+            changed = True
+
+        if not changed:
+            return None
+
+        self._stale.add(group_key)
+        return group_key
+
+    def apply_games(self, games: List[Dict]) -> Set[Tuple[str, str]]:
+        """Apply a list of processed games; returns the groups that changed"""
+        changed = set()
+        for game in games:
+            group_key = self._apply_game(game)
+            if group_key:
+                changed.add(group_key)
+
+        # Every touched group is ordered once, not once per game
+        self._refresh_stale()
+        return changed
+
+    def _refresh_stale(self):
+        for group_key in self._stale:
+            self._refresh_group(group_key)
+        self._stale.clear()
+
+    def remove_game(self, game_id) -> Optional[Tuple[str, str]]:
+        """Take a game that disappeared from the schedule out of the standings"""
+        self._pending.pop(game_id, None)
+        previous = self._applied.pop(game_id, None)
+        if not previous:
+            return None
+
+        self._add_result(previous, -1)
+        self._results[previous[0]].pop(game_id, None)
+        self._refresh_group(previous[0])
+        return previous[0]
+
+    def _order_group(self, group_key: Tuple[str, str]) -> List[List[Dict]]:
+        """Team records of a group in standings order, as tiers of teams sharing a position"""
+        teams = self._groups[group_key]
+        records = sorted(teams.values(), key=lambda record: (-self._pct(record), -record['wins'], record['losses']))
+
+        tiers: List[List[Dict]] = []
+        for record in records:
+            if tiers and self._pct(tiers[-1][0]) == self._pct(record):
+                tiers[-1].append(record)
+            else:
+                tiers.append([record])
+
+        if not self.tiebreakers or all(len(tier) == 1 for tier in tiers):
+            return tiers
+
+        matrix = self.group_matrix(group_key)
+        return [
+            sorted((teams[matrix.teams[index]] for index in tier), key=lambda record: -record['wins'])
+            for tier in matrix.order()
+        ]
+
+    def group_matrix(self, group_key: Tuple[str, str]):
+        """Tiebreaker matrices (wbsc_tiebreakers.GroupMatrix) of a group's final games"""
+        from wbsc_tiebreakers import GroupMatrix
+
+        matrix = GroupMatrix(list(self._groups[group_key]))
+        for _, home_key, away_key, home_runs, away_runs, home_innings, away_innings in self._results.get(group_key, {}).values():
+            matrix.add_result(home_key, away_key, home_runs, away_runs, home_innings, away_innings)
+        return matrix
+
+    @staticmethod
+    def _pct(record: Dict) -> float:
+        total_games = record['wins'] + record['losses'] + record['ties']
+        return record['wins'] / total_games if total_games > 0 else 0.0
+
+    def _refresh_group(self, group_key: Tuple[str, str]):
+        """Rebuild the standings rows of one group"""
+        tiers = self._order_group(group_key)
+        round_name = self.round_name(group_key[0])
+        leader = tiers[0][0] if tiers else None
+
+        rows = []
+        team_order = []
+        position = 1
+        for tier in tiers:
+            # Teams of one tier share a position (1, 2, 2, 4, ...)
+            for record in tier:
+                team_order.append(record['team_key'])
+                rows.append({
+                    'position': str(position),
+                    'team_name': record['team_name'],
+                    'team_ioc': record['team_ioc'],
+                    'round': round_name,
+                    'group': group_key[1],
+                    'group_full_name': group_key[1],
+                    'statistics': {
+                        'wins': record['wins'],
+                        'losses': record['losses'],
+                        'ties': record['ties'],
+                        'pct': round(self._pct(record), 3),
+                        'gb': games_behind(leader, record)
+                    }
+                })
+            position += len(tier)
+
+        self._tables[group_key] = rows
+        self._team_order[group_key] = team_order
+
+    def group_standings(self, round_key, group: str) -> List[Dict]:
+        """Standings rows of one group"""
+        return list(self._tables.get((str(round_key), group), []))
+
+    def all_rounds_standings(self) -> Dict[str, List[Dict]]:
+        """All groups in the format of WBSCRoundBasedStandingsScraper.scrape_all_rounds_standings"""
+        all_rounds_standings: Dict[str, List[Dict]] = {}
+        table_numbers: Dict[str, int] = {}
+
+        for group_key in sorted(self._tables, key=lambda key: (self._round_order(key[0]), key[1])):
+            round_name = self.round_name(group_key[0])
+            table_numbers[round_name] = table_numbers.get(round_name, 0) + 1
+            all_rounds_standings.setdefault(round_name, []).extend(
+                dict(row, table_number=table_numbers[round_name]) for row in self._tables[group_key]
+            )
+
+        return all_rounds_standings
+
+    def projected_positions(self, round_key, group: str, samples: Optional[int] = None,
+                            seed: Optional[int] = None) -> List[Dict]:
+        """
+        Projected final positions of a group over the outcomes of its remaining games
+
+        Args:
+            round_key: Round id (or name) of the group
+            group: Group name
+            samples: Scenarios drawn when the remaining games are too many to enumerate
+            seed: Seed for the sampled scenarios
+
+        Returns:
+            The group's standings rows with a 'projection' entry (best, worst and
+            most likely position, odds per position); empty without NumPy
+        """
+        group_key = (str(round_key), group)
+        if not self.tiebreakers or group_key not in self._tables:
+            return []
+
+        from wbsc_tiebreakers import DEFAULT_SAMPLES
+
+        matrix = self.group_matrix(group_key)
+        remaining = [(home_key, away_key) for key, home_key, away_key in self._pending.values() if key == group_key]
+        odds = matrix.simulate(remaining, samples=samples or DEFAULT_SAMPLES, seed=seed)
+
+        projected = []
+        for row, team_key in zip(self._tables[group_key], self._team_order[group_key]):
+            team_odds = odds[matrix.index[team_key]]
+            possible = [position for position, chance in enumerate(team_odds, 1) if chance > 0]
+            projected.append(dict(row, projection={
+                'remaining_games': len(remaining),
+                'best_position': possible[0],
+                'worst_position': possible[-1],
+                'most_likely_position': int(team_odds.argmax()) + 1,
+                'position_odds': [round(float(chance), 3) for chance in team_odds]
+            }))
+
+        return projected
+
+    def all_projected_positions(self, samples: Optional[int] = None, seed: Optional[int] = None) -> Dict[str, List[Dict]]:
+        """Projected final positions of every group with games still to be played, by round name"""
+        open_groups = {group_key for group_key, _, _ in self._pending.values() if group_key in self._tables}
+
+        projections: Dict[str, List[Dict]] = {}
+        for group_key in sorted(open_groups, key=lambda key: (self._round_order(key[0]), key[1])):
+            rows = self.projected_positions(group_key[0], group_key[1], samples, seed)
+            if rows:
+                projections.setdefault(self.round_name(group_key[0]), []).extend(rows)
+
+        return projections
+
+    @staticmethod
+    def _round_order(round_key: str):
+        """Rounds sort by their numeric id (creation order), then by name"""
+        return (0, int(round_key), '') if round_key.isdigit() else (1, 0, round_key)
+
+    def _set_correction(self, group_key: Tuple[str, str], team_key: str, correction: Dict[str, int]):
+        """Replace the W/L/T correction of one team"""
+        record = self._groups[group_key][team_key]
+        previous = self._corrections.get(group_key, {}).pop(team_key, {})
+        for field in ('wins', 'losses', 'ties'):
+            record[field] += correction.get(field, 0) - previous.get(field, 0)
+        if any(correction.values()):
+            self._corrections.setdefault(group_key, {})[team_key] = dict(correction)
+
+    def export_corrections(self) -> List[Dict]:
+        """W/L/T corrections of the last reconcile, to carry them over to another engine"""
+        return [
+            {'round': group_key[0], 'group': group_key[1], 'team': team_key, **correction}
+            for group_key, teams in self._corrections.items() for team_key, correction in teams.items()
+        ]
+
+    def load_corrections(self, corrections: List[Dict]):
+        """Apply corrections of export_corrections(); call it after apply_games()"""
+        for entry in corrections:
+            group_key = (str(entry.get('round')), entry.get('group', ''))
+            if entry.get('team') in self._groups.get(group_key, {}):
+                self._set_correction(group_key, entry['team'],
+                                     {field: int(entry.get(field) or 0) for field in ('wins', 'losses', 'ties')})
+                self._stale.add(group_key)
+        self._refresh_stale()
+
+    def reconcile(self, scraped_standings: Dict[str, List[Dict]]) -> List[Dict]:
+        """
+        Compare the local standings with standings scraped from the page
+
+        The page wins: records that differ are corrected to the page W/L/T
+        until a later reconcile finds the game results agree with it again.
+
+        Args:
+            scraped_standings: Output of scrape_all_rounds_standings()
+
+        Returns:
+            One entry per team whose W/L/T differ or that only one side knows
+        """
+        local = {
+            (row['round'], row['group'], row['team_ioc'] or row['team_name']): row['statistics']
+            for rows in self.all_rounds_standings().values() for row in rows
+        }
+        group_keys = {(self.round_name(group_key[0]), group_key[1]): group_key for group_key in self._groups}
+
+        discrepancies = []
+        seen = set()
+        for round_name, rows in scraped_standings.items():
+            if round_name == 'Final Standings':
+                continue
+            for row in rows:
+                key = (round_name, row.get('group', ''), row.get('team_ioc') or row.get('team_name', ''))
+                seen.add(key)
+                page_stats = row.get('statistics', {})
+                local_stats = local.get(key)
+                if local_stats is None or any(
+                    local_stats[field] != page_stats.get(field) for field in ('wins', 'losses', 'ties')
+                ):
+                    discrepancies.append({'round': key[0], 'group': key[1], 'team': key[2],
+                                          'page': page_stats, 'local': local_stats})
+
+                group_key = group_keys.get(key[:2])
+                if group_key is None:
+                    continue
+                if local_stats is None:
+                    self._register_team(group_key, key[2], row.get('team_name', ''), row.get('team_ioc', ''))
+                # The correction is whatever the page has on top of the game results
+                record = self._groups[group_key][key[2]]
+                previous = self._corrections.get(group_key, {}).get(key[2], {})
+                try:
+                    correction = {field: int(page_stats.get(field) or 0) - (record[field] - previous.get(field, 0))
+                                  for field in ('wins', 'losses', 'ties')}
+                except (TypeError, ValueError):
+                    continue
+                if correction != {field: previous.get(field, 0) for field in ('wins', 'losses', 'ties')}:
+                    self._set_correction(group_key, key[2], correction)
+                    self._stale.add(group_key)
+
+        for key, local_stats in local.items():
+            if key not in seen:
+                discrepancies.append({'round': key[0], 'group': key[1], 'team': key[2],
+                                      'page': None, 'local': local_stats})
+
+        self._refresh_stale()
+        if discrepancies:
+            self.logger.info(f"Local standings differ from the standings page for {len(discrepancies)} teams; "
+                             f"corrected them to the page")
+        return discrepancies
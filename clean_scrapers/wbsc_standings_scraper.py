@@ -1,30 +1,47 @@
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
 from datetime import datetime
-import time
+import hashlib
 import json
 import sys
 import argparse
 import os
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from wbsc_cassette import add_cassette_arguments, apply_cassette_arguments
+from wbsc_html import PARSER_BACKENDS, make_standings_soup, set_parser_backend
+from wbsc_http import WBSCHttpClient, get_default_client
+from wbsc_page_data import page_request_headers
+from wbsc_standings_engine import StandingsEngine
+
+# Class attribute of the group standings tables inside a round tab pane
+STANDINGS_TABLE_CLASS = 'table table-hover standings-print'
+
+DEFAULT_RECONCILE_STATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '.cache', 'reconcile')
 
 class WBSCRoundBasedStandingsScraper:
-    def __init__(self, base_url: str, delay: float = 1.0):
+    def __init__(self, base_url: str, delay: float = 1.0, http_client: Optional[WBSCHttpClient] = None):
         """
         Initialize scraper for WBSC tournament standings with round differentiation
         
         Args:
             base_url: Base URL of tournament standings page
-            delay: Delay between requests in seconds
+            delay: Starting interval between requests to a host in seconds
+            http_client: Shared HTTP client (defaults to the process-wide client)
         """
         self.base_url = base_url
         self.delay = delay
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        self.http = http_client or get_default_client()
+        self.session = self.http.session
+        
+        # Requests are paced per host by the client's rate limiter, starting at one per delay
+        self.http.limiter.configure(delay)
+        
+        # Threads used to parse the round tab panes (1 = sequential)
+        self.round_workers = 1
+        
+        # Round tab ids (the tournament round ids) of the last parsed page, by round name
+        self.round_ids: Dict[str, str] = {}
         
         # Setup logging
         logging.basicConfig(level=logging.INFO)
@@ -33,11 +50,23 @@ class WBSCRoundBasedStandingsScraper:
     def scrape_all_rounds_standings(self) -> Dict[str, List[Dict]]:
         """Scrape standings for all tournament rounds including final standings"""
         try:
-            response = self.session.get(self.base_url)
+            response = self.http.get(self.base_url)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            return self.parse_all_rounds_standings(response.content)
             
+        except Exception as e:
+            self.logger.error(f"Error scraping rounds standings: {e}")
+            return {}
+    
+    def parse_all_rounds_standings(self, content, backend: Optional[str] = None) -> Dict[str, List[Dict]]:
+        """Extract the standings of all rounds from a downloaded standings page"""
+        # Only the standings container is parsed, not the whole page
+        return self._extract_all_rounds_standings(make_standings_soup(content, backend))
+    
+    def _extract_all_rounds_standings(self, soup) -> Dict[str, List[Dict]]:
+        """Extract the standings of all rounds from the parsed standings page"""
+        try:
             all_rounds_standings = {}
             
             # Check for final standings first (for completed tournaments)
@@ -49,18 +78,29 @@ class WBSCRoundBasedStandingsScraper:
             # Find round tabs
             round_tabs = self._extract_round_tabs(soup)
             self.logger.info(f"Found {len(round_tabs)} tournament rounds")
+            self.round_ids = dict(round_tabs)
+            
+            if self.round_workers > 1 and len(round_tabs) > 1:
+                # Every round only reads its own tab pane, so rounds are independent
+                with ThreadPoolExecutor(max_workers=self.round_workers) as executor:
+                    futures = {
+                        round_name: executor.submit(self._extract_round_standings, soup, round_name, tab_id)
+                        for round_name, tab_id in round_tabs.items()
+                    }
+                    for round_name, future in futures.items():
+                        all_rounds_standings[round_name] = future.result()
+                
+                return all_rounds_standings
             
             for round_name, tab_id in round_tabs.items():
                 self.logger.info(f"Processing {round_name} (ID: {tab_id})")
                 round_standings = self._extract_round_standings(soup, round_name, tab_id)
                 all_rounds_standings[round_name] = round_standings
-                
-                time.sleep(self.delay)
             
             return all_rounds_standings
             
         except Exception as e:
-            self.logger.error(f"Error scraping rounds standings: {e}")
+            self.logger.error(f"Error parsing rounds standings: {e}")
             return {}
     
     def _extract_round_tabs(self, soup) -> Dict[str, str]:
@@ -259,15 +299,15 @@ class WBSCRoundBasedStandingsScraper:
                 self.logger.warning(f"Could not find tab pane for {round_name} (ID: {tab_id})")
                 return []
             
-            # Find all standings tables within this tab pane
-            standings_tables = tab_pane.find_all('table', class_='table table-hover standings-print')
+            # Standings tables paired with their group header in one traversal
+            group_index = self._index_pane_groups(tab_pane)
             
-            self.logger.info(f"Found {len(standings_tables)} tables in {round_name}")
+            self.logger.info(f"Found {len(group_index)} tables in {round_name}")
             
             round_standings = []
             
-            for i, table in enumerate(standings_tables):
-                table_data = self._extract_table_data(table, i + 1, round_name, tab_pane)
+            for i, (table, group_info) in enumerate(group_index):
+                table_data = self._extract_table_data(table, i + 1, round_name, group_info)
                 if table_data:
                     round_standings.extend(table_data)
             
@@ -278,12 +318,46 @@ class WBSCRoundBasedStandingsScraper:
             self.logger.error(f"Error extracting standings for {round_name}: {e}")
             return []
     
-    def _extract_table_data(self, table, table_number: int, round_name: str, tab_pane) -> List[Dict]:
+    def _index_pane_groups(self, tab_pane) -> List[Tuple]:
+        """
+        Pair every standings table of a tab pane with its group header
+        
+        One document-order traversal: a table belongs to the last h3 before
+        it, scoped to its box-container; a table without a preceding h3 takes
+        the first h3 of its box-container.
+        
+        Returns:
+            List of (table, group_info) in document order
+        """
+        index = []
+        
+        def walk(node, group: str) -> str:
+            for child in node.find_all(True, recursive=False):
+                if child.name == 'h3':
+                    group = child.get_text(strip=True)
+                elif child.name == 'table':
+                    if ' '.join(child.get('class', [])) == STANDINGS_TABLE_CLASS:
+                        index.append([child, group])
+                elif 'box-container' in child.get('class', []):
+                    first_entry = len(index)
+                    walk(child, '')
+                    
+                    # Tables above the box's header fall back to its first h3
+                    ungrouped = [entry for entry in index[first_entry:] if not entry[1]]
+                    box_h3 = child.find('h3') if ungrouped else None
+                    for entry in ungrouped:
+                        entry[1] = box_h3.get_text(strip=True) if box_h3 else ''
+                else:
+                    group = walk(child, group)
+            return group
+        
+        walk(tab_pane, '')
+        
+        return [(table, {'group': group, 'group_full_name': group}) for table, group in index]
+    
+    def _extract_table_data(self, table, table_number: int, round_name: str, group_info: Dict) -> List[Dict]:
         """Extract data from a single standings table"""
         try:
-            # Find the group header for this table
-            group_info = self._find_group_info(table, tab_pane)
-            
             # Find all data rows (skip header row)
             rows = table.find_all('tr')[1:]  # Skip header
             
@@ -302,41 +376,6 @@ class WBSCRoundBasedStandingsScraper:
             self.logger.error(f"Error extracting table {table_number} in {round_name}: {e}")
             return []
     
-    def _find_group_info(self, table, tab_pane) -> Dict:
-        """Find group information for the table"""
-        group_info = {
-            'group': '',
-            'group_full_name': ''
-        }
-        
-        try:
-            # Look for h3 header before the table
-            current = table
-            for _ in range(5):  # Search up to 5 elements above
-                current = current.find_previous_sibling()
-                if not current:
-                    break
-                
-                if current.name == 'h3':
-                    group_text = current.get_text(strip=True)
-                    group_info['group'] = group_text
-                    group_info['group_full_name'] = group_text
-                    break
-            
-            # Alternative: look for the box-container parent
-            box_container = table.find_parent('div', class_='box-container')
-            if box_container and not group_info['group']:
-                h3 = box_container.find('h3')
-                if h3:
-                    group_text = h3.get_text(strip=True)
-                    group_info['group'] = group_text
-                    group_info['group_full_name'] = group_text
-                    
-        except Exception as e:
-            self.logger.warning(f"Could not extract group info: {e}")
-        
-        return group_info
-    
     def _extract_team_data(self, cells, table_number: int, round_name: str, group_info: Dict) -> Optional[Dict]:
         """Extract team data from table row cells"""
         try:
@@ -445,6 +484,9 @@ class WBSCRoundBasedStandingsScraper:
         # Create output directory
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         
+        # pandas is only needed for the CSV files - keep it out of CLI startup
+        import pandas as pd
+        
         # Save complete structure as JSON
         json_path = f"{output_path}.json"
         with open(json_path, 'w', encoding='utf-8') as f:
@@ -533,31 +575,127 @@ class WBSCRoundBasedStandingsScraper:
         print(f"\n📈 Total teams across all rounds: {total_teams}")
 
 
+class ReconcileState:
+    def __init__(self, url: str, state_dir: str = DEFAULT_RECONCILE_STATE_DIR):
+        """
+        Initialize the reconcile state of one tournament, kept between runs
+
+        Args:
+            url: Tournament base URL
+            state_dir: Directory holding one state file per tournament
+        """
+        self.url = url
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        self.path = os.path.join(state_dir, f"{key}.json")
+        self.logger = logging.getLogger(__name__)
+        
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+        
+        # Scrapes so far, the round names of the last standings page and the
+        # corrections the last reconcile made to the local standings
+        self.scrape_count = state.get('scrape_count', 0)
+        self.round_names = state.get('round_names', {})
+        self.corrections = state.get('corrections', [])
+    
+    def save(self, scrape_count: int, round_names: Dict[str, str], corrections: Optional[List[Dict]] = None):
+        """Write the state atomically"""
+        self.scrape_count = scrape_count
+        self.round_names = dict(round_names)
+        self.corrections = list(corrections or [])
+        
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'url': self.url, 'saved_at': datetime.now().isoformat(),
+                           'scrape_count': self.scrape_count, 'round_names': self.round_names,
+                           'corrections': self.corrections}, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            self.logger.warning(f"Could not write reconcile state for {self.url}: {e}")
+
+
 # Combined scraper with round support
 class WBSCCompleteRoundScraper(WBSCRoundBasedStandingsScraper):
     """Complete scraper with round-based standings and games"""
     
-    def __init__(self, tournament_base_url: str, delay: float = 1.0):
+    def __init__(self, tournament_base_url: str, delay: float = 1.0, http_client: Optional[WBSCHttpClient] = None):
         self.tournament_base_url = tournament_base_url.rstrip('/')
         standings_url = f"{self.tournament_base_url}/standings"
         
-        super().__init__(standings_url, delay)
+        super().__init__(standings_url, delay, http_client)
         
-        # Import games scraper
+        # Import games scraper (shares our HTTP client)
         from wbsc_game_scraper import WBSCTournamentScraper
-        self.games_scraper = WBSCTournamentScraper(f"{self.tournament_base_url}/schedule-and-results", delay)
+        self.games_scraper = WBSCTournamentScraper(f"{self.tournament_base_url}/schedule-and-results", delay, self.http)
+        
+        # Standings computed from the game results; the standings page is
+        # fetched every reconcile_every-th scrape (0 = every scrape) to reconcile
+        self.standings_engine = StandingsEngine()
+        self.reconcile_every = 0
+        self._scrape_count = 0
+        
+        # Carries the scrape count and round names over to the next process
+        # (the CLI scrapes once per run); long-lived callers can leave it unset
+        self.reconcile_state: Optional[ReconcileState] = None
+    
+    def _standings_page_due(self) -> bool:
+        """True if this scrape fetches the standings page instead of using the local standings"""
+        if self.reconcile_every <= 0 or not self.standings_engine.round_names:
+            return True
+        return self._scrape_count % self.reconcile_every == 0
     
     def scrape_complete_tournament_with_rounds(self) -> Dict:
         """Scrape complete tournament data with round-based standings"""
         print("🏆 Scraping complete tournament data with rounds...")
         
+        # A new process continues the count (and the corrections) of the previous runs
+        restore_state = self.reconcile_state is not None and not self.standings_engine.round_names
+        if restore_state:
+            self._scrape_count = self.reconcile_state.scrape_count
+            self.standings_engine.set_round_names(self.reconcile_state.round_names)
+        
+        fetch_standings = self._standings_page_due()
+        self._scrape_count += 1
+        
+        # Games and standings pages are independent - fetch them at the same time
+        games_url = self.games_scraper.base_url
+        self.http.prefetch(
+            [games_url, self.base_url] if fetch_standings else [games_url],
+            headers={games_url: page_request_headers(
+                games_url, self.games_scraper.page_cache, self.games_scraper.inertia_props
+            )}
+        )
+        
         # Scrape games
         print("📊 Scraping games and results...")
         games = self.games_scraper.scrape_all_games()
         
-        # Scrape round-based standings
-        print("📈 Scraping round-based standings...")
-        round_standings = self.scrape_all_rounds_standings()
+        # Only the groups of new or changed results are recomputed
+        changed_groups = self.standings_engine.apply_games(games)
+        if restore_state:
+            self.standings_engine.load_corrections(self.reconcile_state.corrections)
+        discrepancies = []
+        
+        if fetch_standings:
+            # Scrape round-based standings and correct the local ones to them
+            print("📈 Scraping round-based standings...")
+            round_standings = self.scrape_all_rounds_standings()
+            self.standings_engine.set_round_names({tab_id: name for name, tab_id in self.round_ids.items()})
+            discrepancies = self.standings_engine.reconcile(round_standings)
+        else:
+            print(f"📈 Using local standings ({len(changed_groups)} groups updated)...")
+            round_standings = self.standings_engine.all_rounds_standings()
+        
+        self.http.log_request_stats()
+        
+        if self.reconcile_state:
+            self.reconcile_state.save(self._scrape_count, self.standings_engine.round_names,
+                                      self.standings_engine.export_corrections())
         
         complete_data = {
             'tournament_info': {
@@ -567,6 +705,7 @@ class WBSCCompleteRoundScraper(WBSCRoundBasedStandingsScraper):
             },
             'games': games,
             'round_standings': round_standings,
+            'projected_positions': self.standings_engine.all_projected_positions(),
             'summary': {
                 'total_games': len(games),
                 'completed_games': len([g for g in games if g.get('status') in ['F', 'F/7']]),
@@ -576,11 +715,23 @@ class WBSCCompleteRoundScraper(WBSCRoundBasedStandingsScraper):
                     s.get('team_name', '') 
                     for standings in round_standings.values() 
                     for s in standings
-                ))
+                )),
+                'standings_source': 'page' if fetch_standings else 'local',
+                'standings_discrepancies': len(discrepancies)
             }
         }
         
         return complete_data
+    
+    def save_complete_tournament(self, complete_data: Dict, output_path: str) -> str:
+        """Save complete tournament data as JSON; returns the file path"""
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+        
+        json_path = f'{output_path}.json'
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(complete_data, f, indent=2, ensure_ascii=False)
+        
+        return json_path
 
 
 # Usage example
@@ -588,12 +739,21 @@ if __name__ == "__main__":
     # Parse command line arguments
     parser = argparse.ArgumentParser(description='WBSC Tournament Standings Scraper with Round Support')
     parser.add_argument('url', help='Base URL of the tournament (e.g., https://www.wbsceurope.org/en/events/tournament-name/)')
-    parser.add_argument('--delay', type=float, default=1.5, help='Delay between requests in seconds (default: 1.5)')
+    parser.add_argument('--delay', type=float, default=1.5, help='Starting interval between requests to a host in seconds, adapted to the server (default: 1.5)')
     parser.add_argument('--output', type=str, help='Output filename prefix (without extension)')
     parser.add_argument('--mode', choices=['standings', 'complete'], default='complete', 
                        help='Scraping mode: standings only or complete tournament data (default: complete)')
+    parser.add_argument('--parser', choices=PARSER_BACKENDS, help='HTML parser backend (default: fastest installed)')
+    parser.add_argument('--reconcile-every', type=int, default=0,
+                       help='Complete mode: fetch the standings page every N scrapes (counted across runs) and compute standings from games in between (default: 0, always fetch)')
+    parser.add_argument('--base-url', help='Send all requests to this server instead, e.g. a local mock (http://127.0.0.1:8766)')
+    add_cassette_arguments(parser)
     
     args = parser.parse_args()
+    if args.parser:
+        set_parser_backend(args.parser)
+    get_default_client().base_url_override = args.base_url
+    apply_cassette_arguments(args, get_default_client())
     
     # Extract tournament name from URL for filename
     url_parts = args.url.rstrip('/').split('/')
@@ -631,6 +791,9 @@ if __name__ == "__main__":
             tournament_base_url=args.url.rstrip('/'),
             delay=args.delay
         )
+        complete_scraper.reconcile_every = args.reconcile_every
+        if args.reconcile_every > 0:
+            complete_scraper.reconcile_state = ReconcileState(args.url.rstrip('/'))
         
         complete_data = complete_scraper.scrape_complete_tournament_with_rounds()
         
@@ -640,6 +803,8 @@ if __name__ == "__main__":
         print(f"Rounds: {', '.join(complete_data['summary']['rounds'])}")
         print(f"Total standings entries: {complete_data['summary']['total_standings_entries']}")
         print(f"Unique teams: {complete_data['summary']['unique_teams']}")
+        print(f"Standings: {complete_data['summary']['standings_source']} "
+              f"({complete_data['summary']['standings_discrepancies']} teams differ from the local standings)")
         
         # Save with structured output  
         if args.output:
@@ -653,12 +818,7 @@ if __name__ == "__main__":
             folder_name = f"{current_date}_{clean_tournament_name}"
             output_path = f"../outputs/{folder_name}/complete_{timestamp_now}"
         
-        # Create output directory
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        
         # Save complete data
-        json_path = f'{output_path}.json'
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(complete_data, f, indent=2, ensure_ascii=False)
+        json_path = complete_scraper.save_complete_tournament(complete_data, output_path)
         
         print(f"\n✅ Complete tournament data saved to {json_path}")
\ No newline at end of file
@@ -1,53 +1,78 @@
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
+from __future__ import annotations
+
 from datetime import datetime
-import time
 import json
 import sys
 import argparse
 import os
-from typing import List, Dict, Optional, Tuple
+from typing import TYPE_CHECKING, List, Dict, Optional, Tuple
 import logging
-import html
+import importlib.util
 import re
-import unicodedata
+from urllib.parse import urlencode
+
+from wbsc_cassette import add_cassette_arguments, apply_cassette_arguments
+from wbsc_html import PARSER_BACKENDS, STATS_STRAINER, cell_text, make_soup, set_parser_backend
+from wbsc_http import WBSCHttpClient, get_default_client
+from wbsc_columns import (ColumnPlan, HTML_FIELD_ALIASES, WBSC_FIELD_ALIASES, HeaderSignatureCache,
+                          header_signature)
+from wbsc_text import fix_text_encoding, separate_name_parts, text_cache_info
+from wbsc_page_data import fetch_page_data, get_default_page_cache
+from wbsc_browser import ChromeDriverPool, SELENIUM_AVAILABLE
+from wbsc_datatables import (TableRedrawTimeout, capture_table_state, click_requests_server, extract_table_rows,
+                             show_all_rows, wait_for_table_ready, wait_for_table_redraw)
+from wbsc_xhr_capture import (EndpointCache, collect_json_responses, enable_network_capture,
+                              fetch_endpoint_records, find_table_endpoint, names_category)
 
-# Try to import selenium for JavaScript rendering
-try:
-    from selenium import webdriver
-    from selenium.webdriver.chrome.options import Options
-    from selenium.webdriver.common.by import By
-    from selenium.webdriver.support.ui import WebDriverWait
-    from selenium.webdriver.support import expected_conditions as EC
-    from webdriver_manager.chrome import ChromeDriverManager
-    from selenium.webdriver.chrome.service import Service
-    SELENIUM_AVAILABLE = True
-except ImportError:
-    SELENIUM_AVAILABLE = False
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
 
-# Try to import requests-html as fallback
-try:
-    from requests_html import HTMLSession
-    REQUESTS_HTML_AVAILABLE = True
-except ImportError:
-    REQUESTS_HTML_AVAILABLE = False
+# requests-html as fallback renderer (imported only when used)
+REQUESTS_HTML_AVAILABLE = importlib.util.find_spec('requests_html') is not None
 
 class WBSCStatscraper:
-    def __init__(self, base_url: str, delay: float = 1.0):
+    def __init__(self, base_url: str, delay: float = 1.0, http_client: Optional[WBSCHttpClient] = None,
+                 browser_pool: Optional[ChromeDriverPool] = None):
         """
         Initialize scraper for WBSC tournament statistics
         
         Args:
             base_url: Base URL of tournament stats page (e.g., .../stats)
-            delay: Delay between requests in seconds
+            delay: Starting interval between requests to a host in seconds
+            http_client: Shared HTTP client (defaults to the process-wide client)
+            browser_pool: Shared browser pool (pass a long-lived pool to keep browsers warm across runs)
         """
         self.base_url = base_url
         self.delay = delay
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        self.http = http_client or get_default_client()
+        self.session = self.http.session
+        
+        # Requests are paced per host by the client's rate limiter, starting at one per delay
+        self.http.limiter.configure(delay)
+        
+        # Revalidation cache for the decoded data-page JSON
+        self.page_cache = get_default_page_cache()
+        
+        # Try the stats props as Inertia JSON before rendering the table
+        self.use_inertia = True
+        
+        # Warm browsers reused across categories and pages
+        self.browser_pool = browser_pool or ChromeDriverPool()
+        
+        # Switch DataTables to their largest page length instead of paginating
+        self.max_page_length = True
+        
+        # Read table rows with JavaScript in the browser instead of parsing page_source
+        self.in_browser_extraction = True
+        
+        # Find the stats XHR once per domain and category and replay it with plain HTTP
+        self.capture_xhr = False
+        self.endpoint_cache = EndpointCache()
+        
+        self.header_signatures = HeaderSignatureCache()
+        
+        # Parsed stats pages of the current run, shared by categories and fallbacks
+        self._documents: Dict[str, object] = {}
         
         # Setup logging
         logging.basicConfig(level=logging.INFO)
@@ -105,112 +130,12 @@ class WBSCStatscraper:
         Returns:
             Cleaned text with proper Unicode characters
         """
-        if not text or not isinstance(text, str):
-            return text
-            
-        # Common encoding fixes for garbled characters
-        fixes = {
-            # UTF-8 to Latin-1 corruptions
-            '√Å': 'Á',
-            '√°': 'á', 
-            '√á': 'À',
-            '√¢': 'à',
-            '√≠': 'í',
-            '√∏': 'ï',
-            '√ì': 'ì',
-            '√ñ': 'Ö',
-            '√∂': 'ö',
-            '√û': 'Ü',
-            '√º': 'ü',
-            '√ß': 'ß',
-            '√á': 'Ć',
-            '√¶': 'ć',
-            '√¨': 'È',
-            '√®': 'è',
-            '√©': 'É',
-            '√™': 'é',
-            '√≤': 'ò',
-            '√≥': 'ó',
-            '√Ω': 'Ω',
-            '√π': 'π',
-            '‚Äô': "'",
-            '‚Äú': '"',
-            '‚Äù': '"',
-            '‚Äì': '–',
-            '‚Äî': '—',
-            'ƒå': 'Č',
-            'ƒÜ': 'ć',
-            'ƒ∞': 'ž',
-            '≈†': 'Š',
-            '≈°': 'š',
-            '≈ü': 'Ź',
-            '≈∫': 'ź',
-            'Ãása': 'ása',
-            'NiÃása': 'Niása',
-            '√ÅS√°ra': 'ÁSára',
-            '√ÅB√°ra': 'ÁBára'
-        }
-        
-        # Apply fixes
-        original_text = text
-        for wrong, correct in fixes.items():
-            text = text.replace(wrong, correct)
-        
-        # Additional Unicode normalization
-        try:
-            text = unicodedata.normalize('NFC', text)
-        except:
-            pass
-            
-        # Apply name separation logic (surnames are in UPPERCASE, first names in mixed case)
-        text = self._separate_name_parts(text)
-        
-        # Log if we made changes
-        if text != original_text:
-            self.logger.debug(f"Fixed encoding: '{original_text[:30]}...' -> '{text[:30]}...'")
-            
-        return text.strip()
+        # Single-pass repair, memoized across pages and categories
+        return fix_text_encoding(text)
     
     def _separate_name_parts(self, name: str) -> str:
-        """
-        Separate surnames (UPPERCASE) from first names (mixed case)
-        
-        Args:
-            name: Full name string where surname is in UPPERCASE
-            
-        Returns:
-            Name with proper spacing between surname and first names
-        """
-        if not name or not isinstance(name, str):
-            return name
-            
-        # Use regex to find the pattern: consecutive uppercase letters followed by a capital letter and lowercase
-        # This handles cases like: FEKETEAnna -> FEKETE Anna, CAMPIONIAlida -> CAMPIONI Alida
-        import re
-        
-        # Pattern: Find uppercase sequence followed by a capital+lowercase (first name start)
-        # (?<=[A-ZÀ-ÿ])(?=[A-ZÀ-ÿ][a-zà-ÿ]) - lookbehind for uppercase, lookahead for Cap+lower
-        pattern = r'(?<=[A-ZÀ-ÿ])(?=[A-ZÀ-ÿ][a-zà-ÿ])'
-        
-                 # Apply the separation
-        result = re.sub(pattern, ' ', name)
-        
-        # Handle special cases where names are already partially separated
-        # Example: "FEKETEAnna Ilona" should become "FEKETE Anna Ilona"
-        if ' ' in name:
-            parts = name.split(' ')
-            if len(parts) >= 2:
-                # Check if first part needs separation
-                first_part = parts[0]
-                separated_first = re.sub(pattern, ' ', first_part)
-                if separated_first != first_part:
-                    result = separated_first + ' ' + ' '.join(parts[1:])
-        
-        # Fix common over-separation issues with accented characters
-        # Example: "ROLFESOVÁ S ára" -> "ROLFESOVÁ Sára"
-        result = re.sub(r'([ÁÀÂÄÃÅáàâäãåÉÈÊËéèêëÍÌÎÏíìîïÓÒÔÖÕØóòôöõøÚÙÛÜúùûüÝýÿÇçÑñ]) ([A-Z]) ([a-z])', r'\1 \2\3', result)
-        
-        return result
+        """Separate surnames (UPPERCASE) from first names (mixed case)"""
+        return separate_name_parts(name)
     
     def debug_page_structure(self, category: str = 'batting') -> Dict:
         """Debug function to analyze page structure"""
@@ -218,10 +143,10 @@ class WBSCStatscraper:
             target_url = f"{self.base_url}?category={category}" if '?' not in self.base_url else f"{self.base_url}&category={category}"
             self.logger.info(f"Debugging page structure for: {target_url}")
             
-            response = self.session.get(target_url)
+            response = self.http.get(target_url)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = make_soup(response.content)
             
             debug_info = {
                 'url': target_url,
@@ -274,85 +199,74 @@ class WBSCStatscraper:
             else:
                 # Fallback to regular requests
                 self.logger.warning("No JavaScript rendering available, using regular requests")
-                response = self.session.get(url)
+                response = self.http.get(url)
                 response.raise_for_status()
-                return BeautifulSoup(response.content, 'html.parser')
+                return make_soup(response.content, STATS_STRAINER)
                 
         except Exception as e:
             self.logger.error(f"Error getting rendered page: {e}")
             # Fallback to regular requests
-            response = self.session.get(url)
+            response = self.http.get(url)
             response.raise_for_status()
-            return BeautifulSoup(response.content, 'html.parser')
+            return make_soup(response.content, STATS_STRAINER)
     
     def _get_page_with_selenium(self, url: str) -> BeautifulSoup:
         """Use Selenium to get JavaScript-rendered page"""
-        options = Options()
-        options.add_argument('--headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--disable-blink-features=AutomationControlled')
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        
-        # Use webdriver-manager to automatically handle ChromeDriver
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=options)
+        # Borrow a warm browser from the pool instead of starting a new one
+        driver = self.browser_pool.acquire()
         
         try:
             self.logger.info(f"Loading page with Selenium: {url}")
+            url = self.http.resolve_url(url)
+            self.http.limiter.acquire(url)
             driver.get(url)
+            self.browser_pool.count_page(driver)
             
-            # Wait for the statistics table to load
+            # Wait until the statistics table has rows
             try:
-                WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.TAG_NAME, "table"))
-                )
-                self.logger.info("Table found, waiting for data to load...")
-                time.sleep(3)  # Give time for data to populate
-            except:
-                self.logger.warning("No table found or timeout waiting for table")
+                wait_for_table_ready(driver)
+                self.logger.info("Table rendered with data")
+            except TableRedrawTimeout as e:
+                self.logger.warning(f"No table found or timeout waiting for table: {e}")
             
             # Get the page source after JavaScript execution
             page_source = driver.page_source
-            return BeautifulSoup(page_source, 'html.parser')
+            return make_soup(page_source, STATS_STRAINER)
             
         finally:
-            driver.quit()
+            self.browser_pool.release(driver)
     
     def scrape_all_pages_with_selenium(self, url: str, category: str) -> List[Dict]:
         """Use Selenium to scrape all pages with pagination"""
-        options = Options()
-        options.add_argument('--headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--disable-blink-features=AutomationControlled')
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        
-        # Use webdriver-manager to automatically handle ChromeDriver
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=options)
+        # Borrow a warm browser from the pool instead of starting a new one
+        driver = self.browser_pool.acquire()
         
         all_players = []
         
         try:
             self.logger.info(f"Starting paginated scraping for {category}")
+            url = self.http.resolve_url(url)
+            self.http.limiter.acquire(url)
             driver.get(url)
+            self.browser_pool.count_page(driver)
             
-            # Wait for table to load
+            # Wait for table rows to render
             try:
-                WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.TAG_NAME, "table"))
-                )
-                time.sleep(3)
-            except:
-                self.logger.warning("No table found")
+                wait_for_table_ready(driver)
+            except TableRedrawTimeout as e:
+                self.logger.warning(f"No table found: {e}")
                 return []
             
             # First, click on the correct category tab if it exists
             self._select_category_tab(driver, category)
             
+            # Max-page-size mode: one snapshot holds the whole category
+            if self.max_page_length:
+                players = self._scrape_single_snapshot(driver, category)
+                if players is not None:
+                    self.logger.info(f"Finished scraping {category} in one snapshot. Total players: {len(players)}")
+                    return players
+            
             page_num = 1
             max_pages = 20  # Reduced safety limit
             seen_players = set()  # Track seen players to avoid duplicates
@@ -361,12 +275,8 @@ class WBSCStatscraper:
             while page_num <= max_pages:
                 self.logger.info(f"Scraping {category} page {page_num}")
                 
-                # Wait for page to load and get current page data
-                time.sleep(2)
-                soup = BeautifulSoup(driver.page_source, 'html.parser')
-                
-                # Extract players from current page
-                page_players = self._extract_category_from_page(soup, category)
+                # The table is ready here - navigation waits for the redraw
+                page_players = self._extract_category_from_driver(driver, category)
                 
                 if not page_players:
                     self.logger.info(f"No players found on page {page_num}, stopping")
@@ -410,7 +320,7 @@ class WBSCStatscraper:
                     break
                 
                 page_num += 1
-                time.sleep(self.delay)
+                self.browser_pool.count_page(driver)
             
             self.logger.info(f"Finished scraping {category}. Total players: {len(all_players)}")
             return all_players
@@ -420,10 +330,35 @@ class WBSCStatscraper:
             return all_players
             
         finally:
-            driver.quit()
+            self.browser_pool.release(driver)
+    
+    def _scrape_single_snapshot(self, driver, category: str) -> Optional[List[Dict]]:
+        """
+        Show all rows of the table at once and extract them in one pass
+        
+        Returns:
+            The players, or None if the table still spans several pages
+            (the caller then falls back to clicking through the pages)
+        """
+        try:
+            if not show_all_rows(driver):
+                self.logger.info("Page length cannot be changed - using pagination")
+                return None
+        except TableRedrawTimeout as e:
+            self.logger.warning(f"Switching to the largest page length failed: {e}")
+            return None
+        
+        pagination_info = self._get_pagination_info(driver)
+        if pagination_info and pagination_info.get('current_end', 0) < pagination_info.get('total', 0):
+            self.logger.info(f"Largest page length shows {pagination_info['current_end']} of {pagination_info['total']} entries - using pagination")
+            return None
+        
+        return self._extract_category_from_driver(driver, category)
     
     def _select_category_tab(self, driver, category: str):
         """Select the correct category tab (Batting/Pitching/Fielding)"""
+        from selenium.webdriver.common.by import By
+        
         try:
             # Look for category tabs/buttons
             category_buttons = [
@@ -436,13 +371,24 @@ class WBSCStatscraper:
             for xpath in category_buttons:
                 try:
                     button = driver.find_element(By.XPATH, xpath)
-                    if button.is_displayed():
-                        self.logger.info(f"Clicking {category} tab")
-                        driver.execute_script("arguments[0].click();", button)
-                        time.sleep(2)
-                        return True
+                    if not button.is_displayed():
+                        continue
                 except:
                     continue
+                
+                self.logger.info(f"Clicking {category} tab")
+                before = capture_table_state(driver)
+                # Client-side tabs redraw without a request - only server work is paced
+                if click_requests_server(driver, button):
+                    self.http.limiter.acquire(driver.current_url)
+                driver.execute_script("arguments[0].click();", button)
+                
+                # An already active tab does not redraw the table
+                try:
+                    wait_for_table_redraw(driver, before, timeout=5)
+                except TableRedrawTimeout:
+                    self.logger.info(f"Table unchanged after selecting {category} tab")
+                return True
             
             self.logger.info(f"No specific {category} tab found - using default view")
             return False
@@ -453,6 +399,8 @@ class WBSCStatscraper:
     
     def _navigate_to_next_page(self, driver, current_page: int) -> bool:
         """Navigate to the next page using pagination controls"""
+        from selenium.webdriver.common.by import By
+        
         try:
             # Strategy 1: Look for "Next" button
             next_selectors = [
@@ -465,13 +413,13 @@ class WBSCStatscraper:
             for selector in next_selectors:
                 try:
                     next_button = driver.find_element(By.XPATH, selector)
-                    if next_button.is_enabled() and next_button.is_displayed():
-                        self.logger.info("Clicking Next button")
-                        driver.execute_script("arguments[0].click();", next_button)
-                        time.sleep(3)
-                        return True
+                    if not (next_button.is_enabled() and next_button.is_displayed()):
+                        continue
                 except:
                     continue
+                
+                self.logger.info("Clicking Next button")
+                return self._click_and_wait_for_redraw(driver, next_button)
             
             # Strategy 2: Look for specific page number
             next_page = current_page + 1
@@ -484,13 +432,13 @@ class WBSCStatscraper:
             for selector in page_selectors:
                 try:
                     page_button = driver.find_element(By.XPATH, selector)
-                    if page_button.is_enabled() and page_button.is_displayed():
-                        self.logger.info(f"Clicking page {next_page} button")
-                        driver.execute_script("arguments[0].click();", page_button)
-                        time.sleep(3)
-                        return True
+                    if not (page_button.is_enabled() and page_button.is_displayed()):
+                        continue
                 except:
                     continue
+                
+                self.logger.info(f"Clicking page {next_page} button")
+                return self._click_and_wait_for_redraw(driver, page_button)
             
             # Strategy 3: Check pagination info to see if we can continue
             pagination_info = self._get_pagination_info(driver)
@@ -507,8 +455,25 @@ class WBSCStatscraper:
             self.logger.error(f"Error navigating to next page: {e}")
             return False
     
+    def _click_and_wait_for_redraw(self, driver, element) -> bool:
+        """Click a pagination control and return once the table shows the new page"""
+        before = capture_table_state(driver)
+        # Only server-side tables (and page links) load the next rows with a request
+        if click_requests_server(driver, element):
+            self.http.limiter.acquire(driver.current_url)
+        driver.execute_script("arguments[0].click();", element)
+        
+        try:
+            wait_for_table_redraw(driver, before)
+            return True
+        except TableRedrawTimeout as e:
+            self.logger.error(f"Pagination click had no effect: {e}")
+            return False
+    
     def _get_pagination_info(self, driver) -> Dict:
         """Extract pagination information from the page"""
+        from selenium.webdriver.common.by import By
+        
         try:
             # Look for pagination info like "Showing 1 to 25 of 269 entries"
             info_patterns = [
@@ -542,49 +507,58 @@ class WBSCStatscraper:
     
     def _get_page_with_requests_html(self, url: str) -> BeautifulSoup:
         """Use requests-html to get JavaScript-rendered page"""
+        from requests_html import HTMLSession
+        
         session = HTMLSession()
         
         self.logger.info(f"Loading page with requests-html: {url}")
+        url = self.http.resolve_url(url)
+        self.http.limiter.acquire(url)
         r = session.get(url)
         
         # Render JavaScript
         r.html.render(timeout=20, wait=3)
         
-        return BeautifulSoup(r.html.html, 'html.parser')
+        return make_soup(r.html.html, STATS_STRAINER)
     
-    def extract_react_data(self, url: str = None) -> Optional[Dict]:
-        """Extract the React data from the WBSC page"""
+    def extract_react_data(self, url: str = None, only: List[str] = None) -> Optional[Dict]:
+        """Extract the React data from the WBSC page (only: props to request as Inertia JSON)"""
         try:
             target_url = url or self.base_url
-            response = self.session.get(target_url)
-            response.raise_for_status()
+            page_data = fetch_page_data(self.http, target_url, self.page_cache, only)
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Find the div with data-page attribute
-            data_div = soup.find('div', {'data-page': True})
-            
-            if data_div:
-                # Get the JSON data
-                data_page = data_div.get('data-page')
-                
-                # Decode HTML entities
-                decoded_data = html.unescape(data_page)
-                
-                # Parse JSON
-                page_data = json.loads(decoded_data)
-                
-                return page_data
-            else:
+            if page_data is None:
                 self.logger.error("No data-page div found")
-                return None
+            
+            return page_data
                 
         except Exception as e:
             self.logger.error(f"Error extracting React data: {e}")
             return None
     
+    def _get_inertia_props(self, url: str, category: str) -> Dict:
+        """Fetch only the stats props of the page, falling back to the full HTML"""
+        # 'category' tells which category generic props like 'stats' hold
+        page_data = self.extract_react_data(url, only=self._stats_prop_names(category) + ['category'])
+        return page_data.get('props', {}) if page_data else {}
+    
     def scrape_all_stats(self, categories: List[str] = None) -> Dict[str, List[Dict]]:
         """Scrape all statistics categories (batting, pitching, fielding)"""
+        try:
+            return self._scrape_stats_categories(categories)
+        finally:
+            # Browsers stay warm across categories; close them unless the pool is long-lived
+            self.browser_pool.finish_run()
+            self._documents.clear()
+            self.header_signatures.save()
+            
+            cache_info = text_cache_info()
+            self.logger.info(f"Name cleanup cache: {cache_info.hits} hits, {cache_info.misses} misses "
+                             f"({cache_info.currsize}/{cache_info.maxsize} entries)")
+            self.http.log_request_stats()
+    
+    def _scrape_stats_categories(self, categories: List[str] = None) -> Dict[str, List[Dict]]:
+        """Scrape the given categories, reusing the first one when the data is identical"""
         if categories is None:
             categories = self.stats_categories
         
@@ -608,18 +582,22 @@ class WBSCStatscraper:
             
             # Check if this is identical to batting stats (common on WBSC sites)
             if category_stats and first_stats and len(category_stats) == len(first_stats):
-                # Simple check: if same number of players and first player has same name
-                if (category_stats[0].get('name') == first_stats[0].get('name') and
-                    category_stats[0].get('team') == first_stats[0].get('team')):
+                # Same number of players and the first player has the same statistics
+                if self._same_player_stats(category_stats[0], first_stats[0]):
                     self.logger.info(f"{category} appears to contain same data as {first_category}, reusing data")
                     all_stats[category] = first_stats
                     continue
             
             all_stats[category] = category_stats
-            time.sleep(self.delay)
         
         return all_stats
     
+    def _same_player_stats(self, player: Dict, other: Dict) -> bool:
+        """Whether two processed players hold the same values, apart from category and scrape time"""
+        ignored = ('category', 'scraped_at')
+        return ({key: value for key, value in player.items() if key not in ignored} ==
+                {key: value for key, value in other.items() if key not in ignored})
+    
     def _scrape_category_stats(self, category: str) -> List[Dict]:
         """Scrape statistics for a specific category (batting/pitching/fielding) with pagination"""
         try:
@@ -628,6 +606,21 @@ class WBSCStatscraper:
             # Get the main stats page URL
             base_url = self.base_url.split('?')[0]  # Remove any existing parameters
             
+            # Fast path: stats props delivered as Inertia JSON need no HTML or browser
+            if self.use_inertia:
+                category_url = f"{base_url}?{urlencode({'category': category})}"
+                players = self._extract_players_from_props(self._get_inertia_props(category_url, category), category)
+                if players:
+                    self.logger.info(f"Total {category} players from Inertia JSON: {len(players)}")
+                    return players
+            
+            # Captured XHR endpoint: page through the JSON with plain HTTP
+            if self.capture_xhr:
+                players = self._scrape_category_from_endpoint(base_url, category)
+                if players:
+                    self.logger.info(f"Total {category} players from captured endpoint: {len(players)}")
+                    return players
+            
             # Use JavaScript-capable rendering with pagination if available
             if SELENIUM_AVAILABLE:
                 self.logger.info("Using Selenium for paginated scraping")
@@ -638,9 +631,7 @@ class WBSCStatscraper:
                 players = self._extract_category_from_page(soup, category)
             else:
                 self.logger.info("Using regular HTTP request (single page)")
-                response = self.session.get(base_url)
-                response.raise_for_status()
-                soup = BeautifulSoup(response.content, 'html.parser')
+                soup = self._fetch_stats_document(base_url)
                 players = self._extract_category_from_page(soup, category)
             
             self.logger.info(f"Total {category} players scraped: {len(players)}")
@@ -650,6 +641,82 @@ class WBSCStatscraper:
             self.logger.error(f"Error scraping {category} stats: {e}")
             return []
     
+    def _scrape_category_from_endpoint(self, url: str, category: str) -> List[Dict]:
+        """Fetch the category from the JSON endpoint behind the stats table"""
+        try:
+            domain = self.tournament_info['base_domain']
+            tournament = self.tournament_info['name']
+            
+            endpoint = self.endpoint_cache.get(domain, tournament, category)
+            if endpoint:
+                self.logger.info(f"Using cached {category} stats endpoint for {domain}")
+            elif SELENIUM_AVAILABLE:
+                endpoint = self._discover_stats_endpoint(url, category)
+                if not endpoint:
+                    return []
+                self.endpoint_cache.store(domain, tournament, category, endpoint)
+            else:
+                return []
+            
+            records = fetch_endpoint_records(self.http, endpoint['url'], endpoint.get('records_key'))
+            self.logger.info(f"Fetched {len(records)} records from {endpoint['url']}")
+            
+            # Dict records carry their own field names, array records follow the table headers
+            if records and isinstance(records[0], dict):
+                players = [self._process_player_data(record, category) for record in records]
+                return [player for player in players if player]
+            
+            rows = [[cell_text(cell) for cell in record] for record in records]
+            return self._extract_players_from_rows([endpoint.get('headers', [])] + rows, category)
+            
+        except Exception as e:
+            self.logger.error(f"Error scraping {category} from captured endpoint: {e}")
+            return []
+    
+    def _discover_stats_endpoint(self, url: str, category: str) -> Optional[Dict]:
+        """Load the stats page once with network logging and find the XHR that fills the table"""
+        # Network logging has to be switched on when the browser starts
+        pool = self.browser_pool if self.browser_pool.network_logging else ChromeDriverPool(network_logging=True)
+        
+        try:
+            with pool.borrow() as driver:
+                self.logger.info(f"Capturing network traffic for {category} on {url}")
+                enable_network_capture(driver)
+                url = self.http.resolve_url(url)
+                self.http.limiter.acquire(url)
+                driver.get(url)
+                pool.count_page(driver)
+                wait_for_table_ready(driver)
+                
+                # Page-load responses fill the default tab; after a tab click only
+                # the click's own responses and ones naming the category qualify
+                responses = collect_json_responses(driver)
+                if self._select_category_tab(driver, category):
+                    responses = collect_json_responses(driver) + [
+                        (response_url, payload) for response_url, payload in responses
+                        if names_category(response_url, payload, category)]
+                
+                endpoint = find_table_endpoint(responses, category)
+                if not endpoint:
+                    self.logger.info("Stats table is not filled by a JSON request")
+                    return None
+                
+                # Array records need the column headers of the rendered table
+                tables = extract_table_rows(driver)
+                main_table = max(tables, key=len) if tables else []
+                endpoint['headers'] = main_table[0] if main_table else []
+                
+                self.logger.info(f"Found stats endpoint {endpoint['url']} ({endpoint['record_count']} records)")
+                return endpoint
+                
+        except Exception as e:
+            self.logger.error(f"Error capturing stats endpoint: {e}")
+            return None
+            
+        finally:
+            if pool is not self.browser_pool:
+                pool.close()
+    
     def _extract_category_from_page(self, soup, category: str) -> List[Dict]:
         """Extract players for a specific category from the page"""
         try:
@@ -691,12 +758,71 @@ class WBSCStatscraper:
             self.logger.error(f"Error extracting {category} from page: {e}")
             return []
     
+    def _extract_category_from_tables(self, tables: List[List[List[str]]], category: str) -> List[Dict]:
+        """Extract players for a category from tables given as rows of cell texts"""
+        try:
+            players = []
+            self.logger.info(f"Found {len(tables)} tables on page")
+            
+            for i, rows in enumerate(tables):
+                # Check if table contains category-specific data, take the first match
+                if self._rows_contain_category_data(rows, category):
+                    self.logger.info(f"Table {i} appears to contain {category} data")
+                    players = self._extract_players_from_rows(rows, category)
+                    if players:
+                        break
+            
+            # If no specific table found, try the largest/main table
+            if not players and tables:
+                self.logger.info(f"No specific {category} table found, trying main table")
+                players = self._extract_players_from_rows(max(tables, key=len), category)
+            
+            return players
+            
+        except Exception as e:
+            self.logger.error(f"Error extracting {category} from tables: {e}")
+            return []
+    
+    def _extract_category_from_driver(self, driver, category: str) -> List[Dict]:
+        """Extract players for a category from the page currently shown in the browser"""
+        if self.in_browser_extraction:
+            # Rows come back as compact JSON arrays - no DOM serialisation or HTML parse
+            return self._extract_category_from_tables(extract_table_rows(driver), category)
+        
+        soup = make_soup(driver.page_source, STATS_STRAINER)
+        return self._extract_category_from_page(soup, category)
+    
     def _table_contains_category_data(self, table, category: str) -> bool:
         """Check if a table contains data for the specified category"""
+        # Only the header row is read, never the table body
+        return self._headers_contain_category_data(self._table_header_texts(table), category)
+    
+    def _rows_contain_category_data(self, rows: List[List[str]], category: str) -> bool:
+        """Check if table rows (lists of cell texts) contain data for the specified category"""
+        return self._headers_contain_category_data(rows[0] if rows else [], category)
+    
+    def _table_header_texts(self, table) -> List[str]:
+        """Cell texts of the table's <thead>, or of its first row"""
+        header_row = table.find('thead') or table.find('tr')
+        if not header_row:
+            return []
+        return [cell.get_text(strip=True) for cell in header_row.find_all(['th', 'td'])]
+    
+    def _headers_contain_category_data(self, headers: List[str], category: str) -> bool:
+        """Classify a header row, using the per-domain header signature cache"""
+        domain = self.tournament_info.get('base_domain', 'unknown')
+        signature = header_signature(headers)
+        
+        matches = self.header_signatures.get(domain, signature, category)
+        if matches is None:
+            matches = self._text_contains_category_data(signature.replace('|', ' '), category)
+            self.header_signatures.store(domain, signature, category, matches)
+        
+        return matches
+    
+    def _text_contains_category_data(self, table_text: str, category: str) -> bool:
+        """Check if lowercased table text contains data for the specified category"""
         try:
-            # Get all text from the table
-            table_text = table.get_text().lower()
-            
             # Category-specific indicators
             if category == 'batting':
                 indicators = ['avg', 'hits', 'runs', 'rbi', 'ab', 'batting average', 'home runs', 'slg', 'obp', 'ops']
@@ -726,11 +852,21 @@ class WBSCStatscraper:
     
     def _extract_players_from_stats_table(self, table, category: str) -> List[Dict]:
         """Extract player statistics from a WBSC stats table"""
+        try:
+            # Cell texts of all rows
+            rows = [[cell.get_text(strip=True) for cell in row.find_all(['th', 'td'])]
+                    for row in table.find_all('tr')]
+            return self._extract_players_from_rows(rows, category)
+            
+        except Exception as e:
+            self.logger.error(f"Error extracting from stats table: {e}")
+            return []
+    
+    def _extract_players_from_rows(self, rows: List[List[str]], category: str) -> List[Dict]:
+        """Extract player statistics from table rows given as lists of cell texts"""
         try:
             players = []
             
-            # Find all rows
-            rows = table.find_all('tr')
             if not rows:
                 self.logger.warning("No rows found in table")
                 return []
@@ -741,10 +877,7 @@ class WBSCStatscraper:
             headers = []
             header_row_index = -1
             
-            for i, row in enumerate(rows[:5]):  # Check first 5 rows for headers
-                cells = row.find_all(['th', 'td'])
-                cell_texts = [cell.get_text(strip=True) for cell in cells]
-                
+            for i, cell_texts in enumerate(rows[:5]):  # Check first 5 rows for headers
                 # Check if this looks like a header row
                 header_indicators = ['player', 'team', 'g', 'ab', 'avg', 'era', 'w', 'l']
                 if any(indicator.lower() in [text.lower() for text in cell_texts] for indicator in header_indicators):
@@ -755,8 +888,7 @@ class WBSCStatscraper:
             
             # If no clear headers found, try to use the first row
             if not headers and rows:
-                first_row_cells = rows[0].find_all(['th', 'td'])
-                headers = [cell.get_text(strip=True) for cell in first_row_cells]
+                headers = rows[0]
                 header_row_index = 0
                 self.logger.info(f"Using first row as headers: {headers}")
             
@@ -767,18 +899,15 @@ class WBSCStatscraper:
             # Process data rows (skip header row)
             data_rows = rows[header_row_index + 1:] if header_row_index >= 0 else rows[1:]
             
-            for row_idx, row in enumerate(data_rows):
-                cells = row.find_all(['td', 'th'])
-                
+            for row_idx, cells in enumerate(data_rows):
                 if len(cells) < 2:  # Need at least player and team
                     continue
                 
                 # Extract cell values - keep headers as-is from frontend
                 player_data = {}
-                for i, cell in enumerate(cells):
+                for i, value in enumerate(cells):
                     if i < len(headers):
                         header = headers[i].strip()  # Keep original casing
-                        value = cell.get_text(strip=True)
                         
                         if value and value not in ['-', '', '—', 'N/A']:
                             player_data[header] = value  # Use original header as key
@@ -810,57 +939,9 @@ class WBSCStatscraper:
                 'scraped_at': datetime.now().isoformat()
             }
             
-            # Enhanced field mappings for WBSC format
-            field_mappings = {
-                'name': ['player', 'name', 'player name'],
-                'team': ['team', 'club', 'country'],
-                'games': ['g', 'games', 'gp'],
-                'at_bats': ['ab', 'at bats'],
-                'runs': ['r', 'runs'],
-                'hits': ['h', 'hits'],
-                'doubles': ['2b', 'doubles', '2-base hits'],
-                'triples': ['3b', 'triples', '3-base hits'],
-                'home_runs': ['hr', 'home runs', 'home_runs'],
-                'rbi': ['rbi', 'runs batted in'],
-                'total_bases': ['tb', 'total bases'],
-                'batting_average': ['avg', 'ba', 'batting average'],
-                'slugging_percentage': ['slg', 'slugging', 'slugging percentage'],
-                'on_base_percentage': ['obp', 'on base', 'on base percentage'],
-                'ops': ['ops', 'on base plus slugging'],
-                'walks': ['bb', 'walks', 'base on balls'],
-                'hit_by_pitch': ['hbp', 'hit by pitch'],
-                'strikeouts': ['so', 'strikeouts', 'strike outs'],
-                'sacrifice_hits': ['sh', 'sacrifice hits'],
-                'sacrifice_flies': ['sf', 'sacrifice flies'],
-                'grounded_into_double_play': ['gdp', 'double plays'],
-                # Pitching stats
-                'wins': ['w', 'wins'],
-                'losses': ['l', 'losses'],
-                'saves': ['sv', 'saves'],
-                'innings_pitched': ['ip', 'innings pitched', 'innings'],
-                'hits_allowed': ['h', 'hits allowed'],
-                'runs_allowed': ['r', 'runs allowed'],
-                'earned_runs': ['er', 'earned runs'],
-                'walks_allowed': ['bb', 'walks allowed'],
-                'strikeouts_pitched': ['so', 'strikeouts'],
-                'era': ['era', 'earned run average'],
-                # Fielding stats
-                'putouts': ['po', 'putouts'],
-                'assists': ['a', 'assists'],
-                'errors': ['e', 'errors'],
-                'fielding_percentage': ['fpct', 'fielding%', 'fielding percentage']
-            }
-            
-            # Extract player info using case-insensitive field mappings
-            for field, possible_names in field_mappings.items():
-                for name in possible_names:
-                    if name in player_data:
-                        value = player_data[name]
-                        # Fix text encoding for string fields
-                        if isinstance(value, str) and field in ['name', 'team']:
-                            value = self._fix_text_encoding(value)
-                        processed_player[field] = value
-                        break
+            # Resolve the WBSC field aliases against the record keys
+            plan = ColumnPlan(list(player_data.keys()), WBSC_FIELD_ALIASES, empty_values=None)
+            processed_player.update(plan.convert(list(player_data.values())))
             
             # Ensure we have essential fields
             if not processed_player.get('name'):
@@ -898,42 +979,52 @@ class WBSCStatscraper:
             self.logger.error(f"Error processing frontend headers player data: {e}")
             return None
     
-    def _extract_players_from_page(self, page_data: Dict, category: str) -> List[Dict]:
-        """Extract player statistics from a single page"""
+    def _stats_prop_names(self, category: str) -> List[str]:
+        """Inertia props that may hold the player statistics, in lookup order"""
+        return [f'{category}_stats', 'stats', 'players', 'data']
+    
+    def _extract_players_from_props(self, props: Dict, category: str) -> List[Dict]:
+        """Extract player statistics from the Inertia page props"""
+        players = []
+        
+        # Generic props ('stats', ...) hold whichever category the page shows;
+        # reject them when the page names another category
+        shown_category = props.get('category')
+        generic_allowed = not shown_category or str(shown_category).lower() == category
+        
+        # Look for stats data in various possible locations
+        stats_data = None
+        for prop_name in self._stats_prop_names(category):
+            if prop_name in props:
+                if prop_name != f'{category}_stats' and not generic_allowed:
+                    self.logger.info(f"Ignoring '{prop_name}' props: page shows {shown_category}, not {category}")
+                    break
+                stats_data = props[prop_name]
+                break
+        
+        # Process React data if found
+        if stats_data and isinstance(stats_data, list):
+            for player_data in stats_data:
+                processed_player = self._process_player_data(player_data, category)
+                if processed_player:
+                    players.append(processed_player)
+        
+        return players
+    
+    def _extract_players_from_page(self, page_data: Dict, category: str, soup=None) -> List[Dict]:
+        """Extract player statistics from a single page (soup: the page's parsed HTML, if at hand)"""
         try:
-            players = []
-            
             # If we have React data, try to extract from it first
             if page_data:
-                props = page_data.get('props', {})
+                players = self._extract_players_from_props(page_data.get('props', {}), category)
                 
-                # Look for stats data in various possible locations
-                stats_data = None
-                
-                # Try different possible data locations
-                if 'stats' in props:
-                    stats_data = props['stats']
-                elif 'players' in props:
-                    stats_data = props['players']
-                elif f'{category}_stats' in props:
-                    stats_data = props[f'{category}_stats']
-                elif 'data' in props:
-                    stats_data = props['data']
-                
-                # Process React data if found
-                if stats_data and isinstance(stats_data, list):
-                    for player_data in stats_data:
-                        processed_player = self._process_player_data(player_data, category)
-                        if processed_player:
-                            players.append(processed_player)
-                    
-                    if players:
-                        self.logger.info(f"Extracted {len(players)} players from React data")
-                        return players
+                if players:
+                    self.logger.info(f"Extracted {len(players)} players from React data")
+                    return players
             
             # If no React data or no players found, try HTML extraction
             self.logger.info("No React data found or no players extracted, trying HTML extraction")
-            html_players = self._extract_players_from_html(page_data, category)
+            html_players = self._extract_players_from_html(page_data, category, soup)
             
             return html_players
             
@@ -941,30 +1032,21 @@ class WBSCStatscraper:
             self.logger.error(f"Error extracting players from page: {e}")
             # Fallback to HTML extraction even on error
             try:
-                return self._extract_players_from_html(page_data, category)
+                return self._extract_players_from_html(page_data, category, soup)
             except:
                 return []
     
-    def _extract_players_from_html(self, page_data: Dict, category: str) -> List[Dict]:
-        """Fallback method to extract stats from HTML tables"""
+    def _extract_players_from_html(self, page_data: Dict, category: str, soup=None) -> List[Dict]:
+        """Fallback method to extract stats from HTML tables (soup: already parsed stats page)"""
         try:
             self.logger.info("Attempting HTML table extraction as fallback")
             
-            # We need to re-fetch the page without category parameter first
-            base_url = self.base_url.split('?')[0]  # Remove any existing parameters
-            response = self.session.get(base_url)
-            response.raise_for_status()
+            # Reuse the stats page document instead of downloading it again
+            if soup is None:
+                soup = self._fetch_stats_document(self.base_url.split('?')[0])
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Look for stats tables in various containers
             players = []
-            
-            # Method 1: Look for all tables
-            tables = soup.find_all('table')
-            self.logger.info(f"Found {len(tables)} tables on page")
-            
-            for i, table in enumerate(tables):
+            for i, table in enumerate(self._iter_stats_tables(soup)):
                 self.logger.info(f"Analyzing table {i}")
                 
                 # Try to extract data from any table that might contain stats
@@ -973,24 +1055,6 @@ class WBSCStatscraper:
                     self.logger.info(f"Found {len(table_players)} players in table {i}")
                     players.extend(table_players)
             
-            # Method 2: Look for specific containers that might hold stats
-            stat_containers = soup.find_all(['div', 'section'], class_=lambda x: x and ('stat' in x.lower() or 'table' in x.lower()))
-            
-            for container in stat_containers:
-                container_tables = container.find_all('table')
-                for table in container_tables:
-                    table_players = self._extract_players_from_table(table, category)
-                    players.extend(table_players)
-            
-            # Method 3: Look for tbody elements directly
-            tbodies = soup.find_all('tbody')
-            for tbody in tbodies:
-                # Create a temporary table structure
-                temp_table = soup.new_tag('table')
-                temp_table.append(tbody)
-                table_players = self._extract_players_from_table(temp_table, category)
-                players.extend(table_players)
-            
             self.logger.info(f"Total players extracted from HTML: {len(players)}")
             return players
             
@@ -998,6 +1062,31 @@ class WBSCStatscraper:
             self.logger.error(f"Error in HTML extraction: {e}")
             return []
     
+    def _iter_stats_tables(self, soup):
+        """
+        Every table of the document exactly once, in one traversal
+        
+        A <tbody> outside of any table is yielded on its own; tables inside
+        stats containers are reached by the same traversal, so no row is
+        parsed twice.
+        """
+        table_ids = set()
+        
+        for element in soup.find_all(['table', 'tbody']):
+            if element.name == 'table':
+                table_ids.add(id(element))
+                yield element
+            elif id(element.parent) not in table_ids and element.find_parent('table') is None:
+                yield element
+    
+    def _fetch_stats_document(self, url: str):
+        """Download and parse a stats page once per run; later callers share the tree"""
+        if url not in self._documents:
+            response = self.http.get(url)
+            response.raise_for_status()
+            self._documents[url] = make_soup(response.content, STATS_STRAINER)
+        return self._documents[url]
+    
     def _is_stats_table(self, table, category: str) -> bool:
         """Check if a table contains statistics for the given category"""
         try:
@@ -1071,22 +1160,17 @@ class WBSCStatscraper:
                 rows = all_rows[1:] if len(all_rows) > 1 else []
                 self.logger.info(f"Found {len(rows)} data rows (skipped header)")
             
+            # Header aliases are resolved once for the whole table
+            plan = ColumnPlan(headers, HTML_FIELD_ALIASES, lowercase=True)
+            
             for row_idx, row in enumerate(rows):
                 cells = row.find_all(['td', 'th'])
                 if len(cells) >= 2:  # At least player and team
-                    player_data = {}
-                    
-                    # Map cell values to headers
-                    for i, cell in enumerate(cells):
-                        if i < len(headers):
-                            cell_text = cell.get_text(strip=True)
-                            # Clean up the cell text
-                            if cell_text and cell_text not in ['-', '', '—']:
-                                player_data[headers[i]] = cell_text
+                    cell_texts = [cell.get_text(strip=True) for cell in cells[:plan.width]]
                     
                     # Process the player data if we have enough information
-                    if len(player_data) >= 2:  # At least 2 fields
-                        processed_player = self._process_html_player_data(player_data, category)
+                    if plan.count_values(cell_texts) >= 2:  # At least 2 fields
+                        processed_player = self._process_html_row(plan, cell_texts, category)
                         if processed_player:
                             players.append(processed_player)
                             if row_idx < 3:  # Log first few players for debugging
@@ -1101,43 +1185,17 @@ class WBSCStatscraper:
     
     def _process_html_player_data(self, player_data: Dict, category: str) -> Optional[Dict]:
         """Process player data extracted from HTML tables"""
+        plan = ColumnPlan(list(player_data.keys()), HTML_FIELD_ALIASES, lowercase=True, empty_values=None)
+        return self._process_html_row(plan, list(player_data.values()), category)
+    
+    def _process_html_row(self, plan: ColumnPlan, cells: List[str], category: str) -> Optional[Dict]:
+        """Convert one HTML table row with the table's column plan"""
         try:
             processed_player = {
                 'category': category,
                 'scraped_at': datetime.now().isoformat()
             }
-            
-            # Map common field names (case-insensitive)
-            field_mappings = {
-                'name': ['name', 'player', 'player name', 'player_name', 'playername'],
-                'team': ['team', 'club', 'team name', 'team_name', 'teamname'],
-                'number': ['no', 'num', 'number', '#', 'jersey', 'jersey_number'],
-                'games': ['g', 'games', 'gp', 'games played', 'games_played'],
-                'at_bats': ['ab', 'at bats', 'atbats', 'at_bats'],
-                'runs': ['r', 'runs'],
-                'hits': ['h', 'hits'],
-                'rbi': ['rbi', 'runs batted in', 'runs_batted_in'],
-                'batting_average': ['avg', 'ba', 'batting average', 'batting_average', 'battingaverage'],
-                'era': ['era', 'earned run average', 'earned_run_average'],
-                'wins': ['w', 'wins'],
-                'losses': ['l', 'losses'],
-                'errors': ['e', 'errors'],
-                'assists': ['a', 'assists'],
-                'putouts': ['po', 'putouts']
-            }
-            
-            # Extract player info using field mappings (case-insensitive)
-            player_data_lower = {k.lower(): v for k, v in player_data.items()}
-            
-            for field, possible_names in field_mappings.items():
-                for name in possible_names:
-                    if name.lower() in player_data_lower:
-                        value = player_data_lower[name.lower()]
-                        # Fix text encoding for string fields
-                        if isinstance(value, str) and field in ['name', 'team']:
-                            value = self._fix_text_encoding(value)
-                        processed_player[field] = value
-                        break
+            processed_player.update(plan.convert(cells))
             
             # Ensure we have at least a name
             if not processed_player.get('name'):
@@ -1296,6 +1354,7 @@ class WBSCStatscraper:
                 json.dump(stats_data, f, indent=2, ensure_ascii=False)
             
             # Save CSV for each category
+            import pandas as pd
             for category, players in stats_data.items():
                 if players:
                     df = pd.DataFrame(players)
@@ -1322,16 +1381,32 @@ def main():
     parser.add_argument('--url', required=True, help='Tournament stats URL')
     parser.add_argument('--output', help='Output directory path')
     parser.add_argument('--tournament-name', help='Tournament name for file naming')
-    parser.add_argument('--delay', type=float, default=1.0, help='Delay between requests')
+    parser.add_argument('--delay', type=float, default=1.0, help='Starting interval between requests to a host in seconds, adapted to the server')
     parser.add_argument('--debug', action='store_true', help='Run in debug mode to analyze page structure')
     parser.add_argument('--category', default='batting', help='Category for debug mode (batting/pitching/fielding)')
     parser.add_argument('--categories', nargs='+', default=['batting', 'pitching', 'fielding'], 
                        help='Categories to scrape (batting, pitching, fielding)')
     parser.add_argument('--batting-only', action='store_true', help='Only scrape batting statistics')
+    parser.add_argument('--no-inertia', action='store_true', help='Skip the Inertia JSON fast path')
+    parser.add_argument('--paginate', action='store_true', help='Click through the table pages instead of showing all rows at once')
+    parser.add_argument('--capture-xhr', action='store_true', help='Find the JSON endpoint behind the stats table and fetch it without a browser')
+    parser.add_argument('--parser', choices=PARSER_BACKENDS, help='HTML parser backend (default: fastest installed)')
+    parser.add_argument('--base-url', help='Send all requests to this server instead, e.g. a local mock (http://127.0.0.1:8766)')
+    add_cassette_arguments(parser)
     
     args = parser.parse_args()
+    if args.parser:
+        set_parser_backend(args.parser)
+    get_default_client().base_url_override = args.base_url
+    apply_cassette_arguments(args, get_default_client())
     
     scraper = WBSCStatscraper(args.url, args.delay)
+    if args.no_inertia:
+        scraper.use_inertia = False
+    if args.paginate:
+        scraper.max_page_length = False
+    if args.capture_xhr:
+        scraper.capture_xhr = True
     
     if args.debug:
         print(f"🔍 Debug-Modus: Analysiere Seitenstruktur für {args.url}")
@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+"""
+Synthetic WBSC tournaments of any size for scale tests
+Generates the schedule-and-results data-page (games in the raw WBSC
+format), the standings page (computed from the generated results, so it
+reconciles with the games) and player statistics for a given number of
+games, players and rounds. The tournament is served by the mock server
+(--synthetic-games) or written as a cassette for --replay and
+bench_replay.py.
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import time
+import logging
+from datetime import date, datetime, timedelta
+from html import escape
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlparse
+
+from wbsc_cassette import DEFAULT_CASSETTE_DIR, Cassette, tournament_key
+from wbsc_mock_server import (STATS_CATEGORIES, WILDCARD, MockTournament, inertia_response, player_stats,
+                              render_stats_html, stats_page_object)
+from wbsc_standings_engine import StandingsEngine
+
+GAMES_COMPONENT = 'ScheduleAndResults/index.tsx'
+ROUND_NAMES = ('Opening Round', 'Second Round', 'Super Round', 'Placement Round', 'Finals')
+
+# Name parts; the accented ones exercise the text cleanup of the scrapers
+SYLLABLES = ('ba', 'ro', 'ke', 'li', 'ma', 'no', 'vi', 'sa', 'tu', 'dé', 'lo', 'ña', 'ri', 'gø', 'ze',
+             'cu', 'fa', 'mü', 'ha', 'te', 'jo', 'pe', 'šo', 'ka')
+SURNAME_ENDINGS = ('', 'ez', 'son', 'ini', 'ov', 'ski', 'er', 'ová', 'ens')
+COUNTRY_ENDINGS = ('ia', 'land', 'ova', 'ania', 'ar', 'enia')
+FIRST_NAMES = ('Ana', 'Lucía', 'Marta', 'Sofie', 'Emma', 'Léa', 'Julia', 'Chiara', 'Zoë', 'Nina', 'Eva', 'Laura',
+               'Hanna', 'Inês', 'Paula', 'Sara', 'Clara', 'Maja', 'Elena', 'Noémie', 'Ida', 'Giulia', 'Tereza', 'Aoife')
+VENUES = ('Estadio Central', 'Field 2', 'Ballpark Nord', 'Diamond Süd', 'Campus Field')
+
+# Runs scored in a half inning and how often
+INNING_RUNS = (0, 1, 2, 3, 4, 5)
+INNING_RUN_WEIGHTS = (55, 20, 12, 7, 4, 2)
+
+# 7-inning games end early with this lead after the inning
+MERCY_RULE = {3: 15, 4: 10, 5: 7}
+MAX_INNINGS = 12
+
+GAME_HOURS = (9, 11, 13, 15, 17, 19)
+
+# Props the scrapers request in their Inertia partial reloads
+GAMES_PARTIAL_PROPS = ['games', 'tournament']
+
+
+def _stats_partial_props(category: str) -> List[str]:
+    # As requested by WBSCStatscraper._get_inertia_props
+    return [f'{category}_stats', 'stats', 'players', 'data', 'category']
+
+
+STANDINGS_HEADER = ('<tr><th class="text-center">#</th><th colspan="2">Team</th><th class="text-center">W</th>'
+                    '<th class="text-center">L</th><th class="text-center">T</th><th class="text-center">PCT</th>'
+                    '<th class="text-center">GB</th></tr>')
+
+logger = logging.getLogger(__name__)
+
+
+def _word(rng: random.Random, min_syllables: int, max_syllables: int) -> str:
+    return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(min_syllables, max_syllables))).capitalize()
+
+
+def _unique(rng: random.Random, count: int, make) -> List[str]:
+    """count distinct values of make(rng)"""
+    values = {}
+    while len(values) < count:
+        values[make(rng)] = True
+    return list(values)
+
+
+def group_label(index: int) -> str:
+    """Group A, ..., Group Z, Group AA, ..."""
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return f"Group {letters}"
+
+
+def round_robin(teams: List) -> List[List[Tuple]]:
+    """Matchdays of a single round robin (circle method); each is a list of (home, away)"""
+    teams = list(teams)
+    if len(teams) % 2:
+        teams.append(None)
+
+    matchdays = []
+    for day in range(len(teams) - 1):
+        pairs = []
+        for i in range(len(teams) // 2):
+            home, away = teams[i], teams[-1 - i]
+            if home is not None and away is not None:
+                pairs.append((home, away) if day % 2 else (away, home))
+        matchdays.append(pairs)
+        # Keep the first team fixed and rotate the others
+        teams = [teams[0], teams[-1]] + teams[1:-1]
+    return matchdays
+
+
+def play_game(rng: random.Random, innings: int) -> Tuple[List[int], List[int], int]:
+    """Runs per inning of a final game: (home runs, away runs, innings played)"""
+    home, away = [], []
+    inning = 0
+    while True:
+        inning += 1
+        away.append(rng.choices(INNING_RUNS, INNING_RUN_WEIGHTS)[0])
+
+        # The home team skips the bottom of the last inning when it already leads
+        if inning >= innings and sum(home) > sum(away):
+            home.append(0)
+            return home, away, inning
+
+        home.append(rng.choices(INNING_RUNS, INNING_RUN_WEIGHTS)[0])
+        lead = abs(sum(home) - sum(away))
+        if (inning >= innings and lead) or inning >= MAX_INNINGS:
+            return home, away, inning
+        if innings == 7 and lead >= MERCY_RULE.get(inning, lead + 1):
+            return home, away, inning
+
+
+def _pad_innings(runs: List[int]) -> List[int]:
+    return (runs + [0] * 20)[:20]
+
+
+def generate_tournament(games: int = 2000, players: int = 10000, rounds: int = 5, group_size: int = 8,
+                        completed: float = 0.8, innings: int = 7, seed: int = 0, name: str = WILDCARD,
+                        start_date: Optional[date] = None) -> MockTournament:
+    """
+    Generate a tournament
+
+    Every round regroups all teams into round-robin groups of group_size;
+    the number of teams follows from the games per round. Games are played
+    in schedule order, so the first `completed` fraction is final and the
+    rest is still to be played.
+
+    Args:
+        games: Number of games
+        players: Number of players, spread evenly over the teams
+        rounds: Number of rounds (standings tabs)
+        group_size: Teams per group
+        completed: Fraction of the games that are final
+        innings: Regulation innings (7 enables the mercy rule)
+        seed: Seed of everything random; the same arguments give the same tournament
+        name: Tournament URL segment the mock serves it under (WILDCARD: any)
+        start_date: First game day (default: the last final game is played yesterday)
+
+    Returns:
+        MockTournament with the games page, standings page and stats
+    """
+    rng = random.Random(seed)
+    games, rounds, group_size = max(games, 1), max(rounds, 1), max(group_size, 2)
+    key = f"synthetic-{games}-games-{seed}"
+    tournament_id = 90000 + seed
+
+    round_games = [games // rounds + (1 if index < games % rounds else 0) for index in range(rounds)]
+    games_per_group = group_size * (group_size - 1) // 2
+    groups_per_round = max(1, -(-max(round_games) // games_per_group))
+    team_count = groups_per_round * group_size
+
+    # Teams: unique 3-letter codes and names
+    codes = [''.join(chr(ord('A') + (code // 26 ** i) % 26) for i in (2, 1, 0))
+             for code in rng.sample(range(26 ** 3), team_count)]
+    names = _unique(rng, team_count, lambda r: _word(r, 1, 2) + r.choice(COUNTRY_ENDINGS))
+    teams = [{'id': 70000 + index, 'tournamentid': tournament_id, 'teamid': 1000 + index, 'teamcode': code,
+              'teamlabel': label, 'groups': [],
+              'federation': {'name': f"{label} Baseball and Softball Federation", 'ioc': code,
+                             'flag': f"https://static.wbsc.org/assets/flags/ioc/{code}.svg"}}
+             for index, (code, label) in enumerate(zip(codes, names))]
+
+    officials = _unique(rng, 40, lambda r: f"{_word(r, 2, 3)}{r.choice(SURNAME_ENDINGS)} {r.choice(FIRST_NAMES)}")
+
+    # Schedule: (day, round index, round name, round id, group, home, away), day by day
+    schedule = []
+    round_ids = {}
+    day = 0
+    group_id = 30000
+    for round_index, count in enumerate(round_games):
+        round_name = ROUND_NAMES[round_index] if round_index < len(ROUND_NAMES) else f"Round {round_index + 1}"
+        round_id = 8000 + round_index
+        round_ids[round_name] = round_id
+
+        order = rng.sample(teams, team_count)
+        groups = []
+        for group_index in range(groups_per_round):
+            group = {'id': group_id, 'wbsc_tournament_id': tournament_id, 'wbsc_tournament_round_id': round_id,
+                     'grouptype': 1, 'name': group_label(group_index), 'status': 1}
+            group_id += 1
+            members = order[group_index * group_size:(group_index + 1) * group_size]
+            for team in members:
+                team['groups'].append(group)
+            groups.append((group, round_robin(members)))
+
+        round_schedule = [
+            (day + matchday, round_index, round_name, round_id, group, home, away)
+            for matchday in range(len(groups[0][1]))
+            for group, matchdays in groups
+            for home, away in matchdays[matchday]
+        ][:count]
+        schedule.extend(round_schedule)
+        day = round_schedule[-1][0] + 2 if round_schedule else day
+
+    final_count = round(len(schedule) * min(max(completed, 0.0), 1.0))
+    if start_date is None:
+        last_final_day = schedule[final_count - 1][0] if final_count else -1
+        start_date = date.today() - timedelta(days=last_final_day + 1)
+    start_day = datetime(start_date.year, start_date.month, start_date.day)
+
+    raw_games = []
+    engine_games = []
+    slots: Dict[int, int] = {}
+    for index, (game_day, round_index, round_name, round_id, group, home, away) in enumerate(schedule):
+        slot = slots.get(game_day, 0)
+        slots[game_day] = slot + 1
+        start = start_day + timedelta(days=game_day, hours=GAME_HOURS[slot % len(GAME_HOURS)])
+
+        final = index < final_count
+        if final:
+            home_innings, away_innings, played = play_game(rng, innings)
+            status = 'F' if played <= innings else f"F/{played}"
+        else:
+            home_innings, away_innings, played, status = [], [], 0, ''
+        home_runs, away_runs = sum(home_innings), sum(away_innings)
+
+        game = {
+            'id': 600000 + index,
+            'tournamentid': tournament_id,
+            'medal_game': 0,
+            'gamenumber': index + 1,
+            'gamecode': str(index + 1),
+            'wbsc_tournament_round_id': round_id,
+            'wbsc_tournament_group_id': group['id'],
+            'gametype': round_index + 1,
+            'gametypelabel': round_name,
+            'gamestatus': 3 if final else 0,
+            'gamestatustext': status,
+            'homeid': home['id'],
+            'homelabel': home['teamlabel'],
+            'homeioc': home['teamcode'],
+            'homehits': home_runs + rng.randint(0, 5) if final else 0,
+            'homeerrors': rng.randint(0, 3) if final else 0,
+            'homeruns': home_runs,
+            'awayid': away['id'],
+            'awaylabel': away['teamlabel'],
+            'awayioc': away['teamcode'],
+            'awayhits': away_runs + rng.randint(0, 5) if final else 0,
+            'awayerrors': rng.randint(0, 3) if final else 0,
+            'awayruns': away_runs,
+            'innings': played,
+            'round': '0',
+            'group': '0',
+            'grouplabel': '0',
+            'title': f"{away['teamcode']}@{home['teamcode']}",
+            'start': start.strftime('%Y-%m-%d %H:%M:%S'),
+            'start_tz': 'Europe/Madrid',
+            'utc': start.strftime('%Y-%m-%dT%H:%M:%S+02:00'),
+            'start_date': start.strftime('%Y-%m-%d'),
+            'location': 'Synthetic City',
+            'stadium': VENUES[slot // len(GAME_HOURS) % len(VENUES)],
+            'win': '0',
+            'loss': '0',
+            'save': '0'
+        }
+        for prefix, first, count, assigned in (('umpire', 0, 7, 4), ('scorer', 1, 4, 1), ('tc', 1, 3, 1)):
+            for number in range(first, first + count):
+                official = rng.randrange(len(officials)) if number < first + assigned else None
+                game[f'{prefix}{number}'] = 500 + official if official is not None else None
+                game[f'{prefix}{number}name'] = officials[official] if official is not None else None
+        for inning, (home_inning, away_inning) in enumerate(zip(_pad_innings(home_innings),
+                                                                _pad_innings(away_innings)), 1):
+            game[f'runshome{inning}'] = home_inning
+            game[f'runsaway{inning}'] = away_inning
+        game.update({'home_team': home, 'away_team': away, 'documents': []})
+        raw_games.append(game)
+
+        # The standings page is what the engine computes from the same results
+        engine_games.append({
+            'game_id': game['id'], 'round_id': round_id, 'round_name': round_name, 'group_name': group['name'],
+            'home_team': home['teamlabel'], 'away_team': away['teamlabel'],
+            'home_ioc': home['teamcode'], 'away_ioc': away['teamcode'],
+            'home_runs': home_runs, 'away_runs': away_runs, 'status': status,
+            'innings': {'home': home_innings, 'away': away_innings}, 'innings_played': played
+        })
+
+    engine = StandingsEngine()
+    engine.apply_games(engine_games)
+    engine.set_round_names({round_id: round_name for round_name, round_id in round_ids.items()})
+    standings_html = render_standings_html(engine.all_rounds_standings(), round_ids)
+
+    # Players: unique names, spread evenly over the teams with unique jersey numbers
+    player_names = _unique(rng, players, lambda r: f"{(_word(r, 2, 3) + r.choice(SURNAME_ENDINGS)).upper()} "
+                                                   f"{r.choice(FIRST_NAMES)}")
+    roster = []
+    for index, team in enumerate(teams):
+        size = players // team_count + (1 if index < players % team_count else 0)
+        numbers = rng.sample(range(1, max(99, size) + 1), size)
+        roster.extend({'name': player_names[len(roster)], 'team': team['teamlabel'], 'number': number}
+                      for number in numbers)
+
+    games_page = {
+        'component': GAMES_COMPONENT,
+        'props': {
+            'errors': {},
+            'locale': 'en',
+            'translations': {},
+            'games': raw_games,
+            'tournament': {
+                'id': tournament_id, 'tournamentkey': key,
+                'tournamentname': f"Synthetic Tournament ({games} games, {players} players)",
+                'startdate': start_day.strftime('%Y-%m-%d %H:%M:%S'), 'innings': innings, 'sport': 1
+            }
+        },
+        'url': f"/en/events/{key}/schedule-and-results",
+        'version': hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+    }
+
+    return MockTournament(name, games_page, standings_html, player_stats(roster, seed))
+
+
+def _standings_row(row: Dict) -> str:
+    stats = row['statistics']
+    ioc, team = escape(row['team_ioc']), escape(row['team_name'])
+    gb = stats.get('gb') or '-'
+    return (f'<tr><td class="text-center">{row["position"]}</td>'
+            f'<td class="no-wrap"><a href="teams/{ioc}"><img alt="{ioc} flag" class="flag-icon" title="{ioc}" '
+            f'src="https://static.wbsc.org/assets/flags/ioc/{ioc}.svg"/></a></td>'
+            f'<td><a href="teams/{ioc}"><p class="team-name">{ioc}<br/><small>{team}</small></p></a></td>'
+            f'<td class="text-center">{stats["wins"]}</td><td class="text-center">{stats["losses"]}</td>'
+            f'<td class="text-center">{stats["ties"]}</td><td class="text-center">{stats["pct"]:.3f}</td>'
+            f'<td class="text-center">{gb}</td></tr>')
+
+
+def render_standings_html(round_standings: Dict[str, List[Dict]], round_ids: Dict[str, int]) -> bytes:
+    """Standings page in the markup of the WBSC site: one tab per round, one table per group"""
+    tabs, panes = [], []
+    for index, (round_name, rows) in enumerate(round_standings.items()):
+        round_id = round_ids[round_name]
+        active = 'active' if index == len(round_standings) - 1 else ''
+        tabs.append(f'<li class="{active}"><a data-toggle="tab" href="#{round_id}">{escape(round_name)}</a></li>')
+
+        groups: Dict[str, List[Dict]] = {}
+        for row in rows:
+            groups.setdefault(row['group'], []).append(row)
+        boxes = ''.join(
+            f'<div class="col-md-6"><div class="box-container"><h3>{escape(group)}</h3>'
+            f'<table class="table table-hover standings-print">{STANDINGS_HEADER}'
+            f'{"".join(_standings_row(row) for row in group_rows)}</table></div></div>'
+            for group, group_rows in groups.items()
+        )
+        panes.append(f'<div class="tab-pane fade in" id="{round_id}"><div class="row"><div class="col-md-12">'
+                     f'<div class="row">{boxes}</div></div></div></div>')
+
+    return (f'<!DOCTYPE html>\n<html lang="en">\n<head><meta charset="utf-8"><title>Standings</title></head>\n<body>\n'
+            f'<div class="main-container"><div class="container standings-page">\n'
+            f'<ul class="nav nav-tabs">{"".join(tabs)}</ul>\n'
+            f'<div class="tab-content">{"".join(panes)}</div>\n'
+            f'</div></div>\n</body>\n</html>\n').encode('utf-8')
+
+
+def _inertia_headers(page: Dict, only: List[str]) -> Dict[str, str]:
+    return {
+        'X-Inertia': 'true',
+        'X-Inertia-Version': page['version'],
+        'X-Inertia-Partial-Component': page['component'],
+        'X-Inertia-Partial-Data': ','.join(only)
+    }
+
+
+def write_cassette(tournament: MockTournament, url: str, cassette_dir: str = DEFAULT_CASSETTE_DIR) -> str:
+    """
+    Write a tournament as the cassette of a tournament URL
+
+    Holds the schedule-and-results, standings and stats pages plus the
+    Inertia partial reloads the scrapers send once the pages are cached.
+
+    Returns:
+        Path of the cassette
+    """
+    base = url.rstrip('/')
+    path = urlparse(base).path
+    name = tournament_key(f"{base}/standings")
+    cassette = Cassette(os.path.join(cassette_dir, f"{name}.json.gz"), name)
+
+    html_headers = {'Content-Type': 'text/html; charset=utf-8'}
+    inertia_headers = {'Content-Type': 'application/json', 'X-Inertia': 'true', 'Vary': 'X-Inertia'}
+
+    games_url = f"{base}/schedule-and-results"
+    body = tournament.games_html()
+    cassette.add_interaction('GET', games_url, {}, 200,
+                             dict(html_headers, ETag=tournament.etag('schedule-and-results', body)), body)
+    page = tournament.games_page
+    cassette.add_interaction('GET', games_url, _inertia_headers(page, GAMES_PARTIAL_PROPS), 200, inertia_headers,
+                             inertia_response(page, f"{path}/schedule-and-results", page['component'],
+                                              ','.join(GAMES_PARTIAL_PROPS)))
+
+    cassette.add_interaction('GET', f"{base}/standings", {}, 200,
+                             dict(html_headers, ETag=tournament.etag('standings', tournament.standings_html)),
+                             tournament.standings_html)
+
+    # All players on one stats page per category (?category=...), as HTML and as a partial reload
+    stats_url = f"{base}/stats"
+    cassette.add_interaction('GET', stats_url, {}, 200, html_headers,
+                             render_stats_html(tournament, f"{path}/stats", {}, page_size=0))
+    for category in STATS_CATEGORIES:
+        query = {'category': category}
+        category_url = f"{stats_url}?{urlencode(query)}"
+        category_path = f"{path}/stats?{urlencode(query)}"
+        cassette.add_interaction('GET', category_url, {}, 200, html_headers,
+                                 render_stats_html(tournament, category_path, query, page_size=0))
+        only = _stats_partial_props(category)
+        page = stats_page_object(tournament, category_path, query, page_size=0)
+        cassette.add_interaction('GET', category_url, _inertia_headers(page, only), 200, inertia_headers,
+                                 inertia_response(page, category_path, page['component'], ','.join(only)))
+
+    cassette.save()
+    return cassette.path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Generate a synthetic WBSC tournament as a cassette')
+    parser.add_argument('url', nargs='?', default='https://www.wbsceurope.org/en/events/synthetic-tournament',
+                        help='Tournament URL the cassette answers (default: .../events/synthetic-tournament)')
+    parser.add_argument('--games', type=int, default=2000, help='Number of games (default: 2000)')
+    parser.add_argument('--players', type=int, default=10000, help='Number of players (default: 10000)')
+    parser.add_argument('--rounds', type=int, default=5, help='Number of rounds (default: 5)')
+    parser.add_argument('--group-size', type=int, default=8, help='Teams per group (default: 8)')
+    parser.add_argument('--completed', type=float, default=0.8, help='Fraction of final games (default: 0.8)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    parser.add_argument('--cassette-dir', default=DEFAULT_CASSETTE_DIR, help='Cassette directory (default: ../cassettes)')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    started = time.perf_counter()
+    tournament = generate_tournament(args.games, args.players, args.rounds, args.group_size, args.completed,
+                                     seed=args.seed)
+    cassette_path = write_cassette(tournament, args.url, args.cassette_dir)
+
+    games = tournament.games_page['props']['games']
+    teams = {game['homeioc'] for game in games} | {game['awayioc'] for game in games}
+    print(f"🧪 {len(games)} games, {len(teams)} teams, {len(tournament.stats['batting'])} players "
+          f"in {time.perf_counter() - started:.1f}s")
+    print(f"   Cassette: {cassette_path} ({os.path.getsize(cassette_path) / 1e6:.1f} MB)")
+    print(f"   Replay: python wbsc_standings_scraper.py {args.url} --replay --cassette-dir {args.cassette_dir}")
@@ -0,0 +1,142 @@
+"""
+Text cleanup for scraped player and team names
+Mojibake sequences are repaired in a single regex pass and the cleaned
+names are memoized, since the same strings repeat on every page and in
+every stats category.
+"""
+
+import re
+import unicodedata
+import logging
+from functools import lru_cache
+
+# Maximum number of distinct raw strings kept in the repair cache. Every
+# stats category walks the same names in the same order, so all names of a
+# large tournament have to fit - an LRU smaller than that misses every lookup
+TEXT_CACHE_SIZE = 65536
+
+# Common encoding fixes for garbled characters
+MOJIBAKE_FIXES = {
+    # UTF-8 to Latin-1 corruptions
+    '√Å': 'Á',
+    '√°': 'á',
+    '√¢': 'à',
+    '√≠': 'í',
+    '√∏': 'ï',
+    '√ì': 'ì',
+    '√ñ': 'Ö',
+    '√∂': 'ö',
+    '√û': 'Ü',
+    '√º': 'ü',
+    '√ß': 'ß',
+    '√á': 'Ć',
+    '√¶': 'ć',
+    '√¨': 'È',
+    '√®': 'è',
+    '√©': 'É',
+    '√™': 'é',
+    '√≤': 'ò',
+    '√≥': 'ó',
+    '√Ω': 'Ω',
+    '√π': 'π',
+    '‚Äô': "'",
+    '‚Äú': '"',
+    '‚Äù': '"',
+    '‚Äì': '–',
+    '‚Äî': '—',
+    'ƒå': 'Č',
+    'ƒÜ': 'ć',
+    'ƒ∞': 'ž',
+    '≈†': 'Š',
+    '≈°': 'š',
+    '≈ü': 'Ź',
+    '≈∫': 'ź',
+    'Ãása': 'ása',
+    'NiÃása': 'Niása',
+    '√ÅS√°ra': 'ÁSára',
+    '√ÅB√°ra': 'ÁBára'
+}
+
+# One alternation over all sequences, longest first so that the long
+# name-specific fixes win over their prefixes
+_MOJIBAKE_PATTERN = re.compile('|'.join(
+    re.escape(wrong) for wrong in sorted(MOJIBAKE_FIXES, key=len, reverse=True)
+))
+
+# Boundary between an UPPERCASE surname and a Capitalized first name,
+# e.g. FEKETEAnna -> FEKETE Anna, CAMPIONIAlida -> CAMPIONI Alida
+_NAME_BOUNDARY_PATTERN = re.compile(r'(?<=[A-ZÀ-ÿ])(?=[A-ZÀ-ÿ][a-zà-ÿ])')
+
+# Over-separation after accented characters, e.g. "ROLFESOVÁ S ára" -> "ROLFESOVÁ Sára"
+_ACCENT_SPLIT_PATTERN = re.compile(r'([ÁÀÂÄÃÅáàâäãåÉÈÊËéèêëÍÌÎÏíìîïÓÒÔÖÕØóòôöõøÚÙÛÜúùûüÝýÿÇçÑñ]) ([A-Z]) ([a-z])')
+
+logger = logging.getLogger(__name__)
+
+
+def _replace_mojibake(match) -> str:
+    return MOJIBAKE_FIXES[match.group(0)]
+
+
+def separate_name_parts(name: str) -> str:
+    """
+    Separate surnames (UPPERCASE) from first names (mixed case)
+
+    Args:
+        name: Full name string where surname is in UPPERCASE
+
+    Returns:
+        Name with proper spacing between surname and first names
+    """
+    if not name or not isinstance(name, str):
+        return name
+
+    result = _NAME_BOUNDARY_PATTERN.sub(' ', name)
+
+    # Handle special cases where names are already partially separated
+    # Example: "FEKETEAnna Ilona" should become "FEKETE Anna Ilona"
+    if ' ' in name:
+        parts = name.split(' ')
+        first_part = parts[0]
+        separated_first = _NAME_BOUNDARY_PATTERN.sub(' ', first_part)
+        if separated_first != first_part:
+            result = separated_first + ' ' + ' '.join(parts[1:])
+
+    return _ACCENT_SPLIT_PATTERN.sub(r'\1 \2\3', result)
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def _fix_text_encoding_cached(text: str) -> str:
+    original_text = text
+
+    # ASCII strings cannot contain any of the mojibake sequences
+    if not text.isascii():
+        text = _MOJIBAKE_PATTERN.sub(_replace_mojibake, text)
+        text = unicodedata.normalize('NFC', text)
+
+    text = separate_name_parts(text)
+
+    if text != original_text:
+        logger.debug(f"Fixed encoding: '{original_text[:30]}...' -> '{text[:30]}...'")
+
+    return text.strip()
+
+
+def fix_text_encoding(text: str) -> str:
+    """
+    Fix text encoding issues commonly found in web scraping
+
+    Args:
+        text: Raw text that may contain encoding issues
+
+    Returns:
+        Cleaned text with proper Unicode characters and separated name parts
+    """
+    if not text or not isinstance(text, str):
+        return text
+
+    return _fix_text_encoding_cached(text)
+
+
+def text_cache_info():
+    """Hit/miss counters of the repair cache (functools cache_info)"""
+    return _fix_text_encoding_cached.cache_info()
@@ -0,0 +1,238 @@
+"""
+WBSC tiebreakers on per-group result matrices
+Head-to-head results, runs and innings of a group are kept in n x n NumPy
+matrices (row team against column team), so breaking a tie between any
+subset of teams is a sliced sum. What-if simulations evaluate thousands of
+outcomes of the remaining games at once on stacked copies of the matrices.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Remaining games up to this count are enumerated exactly, more are sampled
+EXHAUSTIVE_GAME_LIMIT = 16
+DEFAULT_SAMPLES = 20000
+
+# Scenarios evaluated per vectorized batch (bounds the S x n x n memory)
+SCENARIO_BATCH = 4096
+
+# Decimals compared when deciding whether two values are tied
+TIE_DECIMALS = 9
+
+
+def _runs(value) -> int:
+    """Runs of one inning cell ('' or 'X' when the half inning was not played)"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def innings_batted(game: Dict) -> Tuple[float, float]:
+    """
+    Innings batted by the home and the away team of a final game
+
+    The away team bats every inning played; the home team skips the bottom
+    of the last inning when it already leads. A walk-off inning counts as a
+    full inning since the game list has no outs per inning.
+
+    Returns:
+        (home innings, away innings), (0, 0) if the game length is unknown
+    """
+    played = int(game.get('innings_played') or 0)
+    if played <= 0:
+        return 0.0, 0.0
+
+    innings = game.get('innings') or {}
+    home = [_runs(value) for value in innings.get('home', [])[:played]]
+    away = [_runs(value) for value in innings.get('away', [])[:played]]
+
+    home_innings = float(played)
+    if sum(home[:played - 1]) > sum(away):
+        home_innings -= 1
+
+    return home_innings, float(played)
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Element-wise ratio, NaN where the denominator is zero"""
+    return np.divide(numerator, denominator, out=np.full(numerator.shape, np.nan), where=denominator > 0)
+
+
+def _split(teams: np.ndarray, values: np.ndarray) -> List[np.ndarray]:
+    """Team indices grouped by value, best (highest) value first"""
+    values = np.round(values, TIE_DECIMALS)
+    return [teams[values == value] for value in np.unique(values)[::-1]]
+
+
+def positions_from_tiers(tiers: List[Sequence[int]]) -> Dict[int, int]:
+    """Team index -> position; teams in one tier share it (1, 2, 2, 4, ...)"""
+    positions = {}
+    position = 1
+    for tier in tiers:
+        for team in tier:
+            positions[int(team)] = position
+        position += len(tier)
+    return positions
+
+
+class GroupMatrix:
+    def __init__(self, teams: Sequence[str]):
+        """
+        Initialize empty result matrices for a group
+
+        Args:
+            teams: Team keys; row/column i of every matrix belongs to teams[i]
+        """
+        self.teams = list(teams)
+        self.index = {team: i for i, team in enumerate(self.teams)}
+
+        n = len(self.teams)
+        # wins[i, j]: games team i won against team j
+        self.wins = np.zeros((n, n))
+        # ties[i, j]: tied games between team i and team j (symmetric)
+        self.ties = np.zeros((n, n))
+        # runs[i, j] / innings[i, j]: runs scored and innings batted by team i against team j
+        self.runs = np.zeros((n, n))
+        self.innings = np.zeros((n, n))
+
+    def add_result(self, home: str, away: str, home_runs: int, away_runs: int,
+                   home_innings: float = 0.0, away_innings: float = 0.0):
+        """Add one final game; runs only count for TQB when the innings are known"""
+        h, a = self.index[home], self.index[away]
+
+        if home_runs > away_runs:
+            self.wins[h, a] += 1
+        elif away_runs > home_runs:
+            self.wins[a, h] += 1
+        else:
+            self.ties[h, a] += 1
+            self.ties[a, h] += 1
+
+        if home_innings and away_innings:
+            self.runs[h, a] += home_runs
+            self.runs[a, h] += away_runs
+            self.innings[h, a] += home_innings
+            self.innings[a, h] += away_innings
+
+    def win_pct(self, teams: np.ndarray) -> np.ndarray:
+        """Winning percentage of each team counting only the games among the given teams"""
+        sub = np.ix_(teams, teams)
+        wins = self.wins[sub].sum(axis=1)
+        games = wins + self.wins[sub].sum(axis=0) + self.ties[sub].sum(axis=1)
+        return np.divide(wins, games, out=np.zeros(len(teams)), where=games > 0)
+
+    def tqb(self, teams: np.ndarray) -> np.ndarray:
+        """
+        Team Quality Balance over the games among the given teams
+
+        TQB = runs scored / innings batted - runs allowed / innings defended
+        (NaN for a team without innings data)
+        """
+        sub = np.ix_(teams, teams)
+        runs, innings = self.runs[sub], self.innings[sub]
+        return _ratio(runs.sum(axis=1), innings.sum(axis=1)) - _ratio(runs.sum(axis=0), innings.sum(axis=0))
+
+    def order(self) -> List[List[int]]:
+        """
+        Teams in standings order, as tiers of team indices
+
+        Teams are ranked by winning percentage; ties are broken by the
+        head-to-head record among the tied teams, then by their TQB in the
+        games among them. When a criterion separates only part of a tie, the
+        teams still tied start over with head-to-head. Teams left in one tier
+        could not be separated (ER-TQB and batting average need box scores).
+        """
+        everyone = np.arange(len(self.teams))
+        tiers = []
+        for tier in _split(everyone, self.win_pct(everyone)):
+            tiers.extend(self._break_tie(tier))
+        return tiers
+
+    def _break_tie(self, tier: np.ndarray) -> List[List[int]]:
+        """Split a tier of teams with equal winning percentage"""
+        if len(tier) < 2:
+            return [tier.tolist()]
+
+        for criterion in (self.win_pct, self.tqb):
+            values = criterion(tier)
+            if np.isnan(values).any():
+                continue
+            split = _split(tier, values)
+            if len(split) > 1:
+                tiers = []
+                for sub_tier in split:
+                    tiers.extend(self._break_tie(sub_tier))
+                return tiers
+
+        return [tier.tolist()]
+
+    def simulate(self, remaining: Sequence[Tuple[str, str]], samples: int = DEFAULT_SAMPLES,
+                 home_win_probability: float = 0.5, seed: Optional[int] = None) -> np.ndarray:
+        """
+        Finishing position odds over the outcomes of the remaining games
+
+        Up to EXHAUSTIVE_GAME_LIMIT games every outcome is enumerated, beyond
+        that the outcomes are sampled. In each scenario teams are ranked by
+        winning percentage, then by head-to-head among the tied teams; teams
+        still tied share the position, as the runs of unplayed games (TQB)
+        are unknown.
+
+        Args:
+            remaining: (home team, away team) of every game still to be played
+            samples: Scenarios drawn when there are too many games to enumerate
+            home_win_probability: Chance of a home win in each remaining game
+            seed: Seed for the sampled scenarios
+
+        Returns:
+            (teams x positions) array; [i, p] is the chance of team i finishing at position p + 1
+        """
+        n = len(self.teams)
+        home = np.array([self.index[team] for team, _ in remaining], dtype=int)
+        away = np.array([self.index[team] for _, team in remaining], dtype=int)
+        k = len(remaining)
+
+        if k <= EXHAUSTIVE_GAME_LIMIT:
+            # Row s is scenario s written in binary: bit g set = home team wins game g
+            outcomes = ((np.arange(2 ** k)[:, None] >> np.arange(k)) & 1).astype(bool)
+            weights = np.where(outcomes, home_win_probability, 1 - home_win_probability).prod(axis=1)
+        else:
+            outcomes = np.random.default_rng(seed).random((samples, k)) < home_win_probability
+            weights = np.ones(samples)
+
+        odds = np.zeros((n, n))
+        for start in range(0, len(outcomes), SCENARIO_BATCH):
+            batch = outcomes[start:start + SCENARIO_BATCH]
+            positions = self._scenario_positions(batch, home, away)
+            one_hot = positions[:, :, None] == np.arange(n)
+            odds += np.einsum('s,sip->ip', weights[start:start + SCENARIO_BATCH], one_hot)
+
+        return odds / weights.sum()
+
+    def _scenario_positions(self, outcomes: np.ndarray, home: np.ndarray, away: np.ndarray) -> np.ndarray:
+        """(scenarios x teams) 0-based positions for a batch of remaining game outcomes"""
+        scenarios = len(outcomes)
+        n = len(self.teams)
+
+        wins = np.broadcast_to(self.wins, (scenarios, n, n)).copy()
+        if outcomes.shape[1]:
+            winners = np.where(outcomes, home, away)
+            losers = np.where(outcomes, away, home)
+            scenario_index = np.broadcast_to(np.arange(scenarios)[:, None], winners.shape)
+            np.add.at(wins, (scenario_index, winners, losers), 1)
+
+        ties = self.ties.sum(axis=1)
+        total_wins = wins.sum(axis=2)
+        games = total_wins + wins.sum(axis=1) + ties
+        pct = np.round(np.divide(total_wins, games, out=np.zeros_like(total_wins), where=games > 0), TIE_DECIMALS)
+
+        # tied[s, i, j]: teams i and j have the same winning percentage in scenario s
+        tied = pct[:, :, None] == pct[:, None, :]
+        h2h_wins = (wins * tied).sum(axis=2)
+        h2h_games = h2h_wins + (wins * tied).sum(axis=1) + (self.ties * tied).sum(axis=2)
+        h2h = np.round(np.divide(h2h_wins, h2h_games, out=np.zeros_like(h2h_wins), where=h2h_games > 0), TIE_DECIMALS)
+
+        # ahead[s, i, j]: team j finishes ahead of team i
+        ahead = (pct[:, None, :] > pct[:, :, None]) | (tied & (h2h[:, None, :] > h2h[:, :, None]))
+        return ahead.sum(axis=2)
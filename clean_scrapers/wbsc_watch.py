@@ -0,0 +1,243 @@
+"""
+Live watch mode for a tournament
+Polls the schedule-and-results page with the incremental game sync and
+picks the next poll from the schedule: fast while a game is in progress,
+slow between games and asleep until shortly before the next game day.
+Every poll turns the change set into score-change events.
+"""
+
+import json
+import os
+import time
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from wbsc_game_sync import GameSyncState
+from wbsc_standings_engine import is_final_status
+
+# Poll intervals in seconds
+LIVE_INTERVAL = 30
+IDLE_INTERVAL = 600
+
+# Games are polled at the live interval from this long before their start
+PREGAME_WINDOW = timedelta(minutes=15)
+
+# A started game without a final status counts as live for this long
+MAX_GAME_DURATION = timedelta(hours=4)
+
+# With no game live and the next start further away than this, sleep until it
+SLEEP_THRESHOLD = timedelta(hours=2)
+
+# Failed polls are retried from the idle interval, doubling up to this
+MAX_RETRY_INTERVAL = 3600
+
+# Statuses of games that will not be played (never live)
+INACTIVE_STATUSES = frozenset(['POSTPONED', 'PPD', 'CANCELLED', 'CANC', 'SUSPENDED', 'SUSP'])
+
+
+def game_start(game: Dict) -> Optional[datetime]:
+    """Scheduled start of a processed game (or sync summary) as an aware datetime, or None"""
+    if game.get('start_utc'):
+        try:
+            return datetime.fromisoformat(game['start_utc'])
+        except ValueError:
+            pass
+
+    if game.get('start_time'):
+        try:
+            # Without an offset the start is taken as local time
+            return datetime.fromisoformat(game['start_time']).astimezone()
+        except ValueError:
+            pass
+
+    return None
+
+
+def is_live(game: Dict, now: datetime) -> bool:
+    """True if a game is (probably) in progress"""
+    status = str(game.get('status') or '').strip()
+    if is_final_status(status) or status.upper() in INACTIVE_STATUSES:
+        return False
+
+    start = game_start(game)
+    if start is None:
+        # Unscheduled game: only an in-game status (e.g. 'T3') says it is live
+        return bool(status)
+
+    return start - PREGAME_WINDOW <= now <= start + MAX_GAME_DURATION
+
+
+def next_poll_delay(games: List[Dict], now: datetime, live_interval: float = LIVE_INTERVAL,
+                    idle_interval: float = IDLE_INTERVAL) -> Tuple[Optional[float], str]:
+    """
+    Seconds until the next poll
+
+    Args:
+        games: Processed games or sync state summaries (status and start are read)
+
+    Returns:
+        (delay, reason); the delay is None when no game is live or scheduled any more
+    """
+    if any(is_live(game, now) for game in games):
+        return live_interval, 'live'
+
+    upcoming = [
+        start for start in (
+            game_start(game) for game in games
+            if not is_final_status(game.get('status'))
+            and str(game.get('status') or '').strip().upper() not in INACTIVE_STATUSES
+        )
+        if start is not None and start > now
+    ]
+    if not upcoming:
+        return None, 'finished'
+
+    until_window = (min(upcoming) - PREGAME_WINDOW - now).total_seconds()
+    if until_window > SLEEP_THRESHOLD.total_seconds():
+        return until_window, 'asleep'
+
+    return max(min(idle_interval, until_window), live_interval), 'between games'
+
+
+def _score(game: Dict) -> str:
+    return f"{game.get('away_team', '')} {game.get('away_runs', 0)}-{game.get('home_runs', 0)} {game.get('home_team', '')}"
+
+
+def change_set_events(change_set: Dict) -> List[Dict]:
+    """Score-change events of a change set (one per changed game with a new score or status)"""
+    events = []
+
+    for entry in change_set.get('changed', []):
+        changes = entry.get('changes', [])
+        if 'score' not in changes and 'status' not in changes:
+            continue
+
+        game = entry['game']
+        previous = entry.get('previous') or {}
+        if 'status' in changes and is_final_status(game.get('status')):
+            event_type = 'game_final'
+        elif 'status' in changes and not previous.get('status'):
+            event_type = 'game_started'
+        elif 'score' in changes:
+            event_type = 'score_change'
+        else:
+            event_type = 'status_change'
+
+        events.append({
+            'type': event_type,
+            'game_id': game.get('game_id'),
+            'round': game.get('round_name', ''),
+            'group': game.get('group_name', ''),
+            'home_team': game.get('home_team', ''),
+            'away_team': game.get('away_team', ''),
+            'home_runs': game.get('home_runs'),
+            'away_runs': game.get('away_runs'),
+            'status': game.get('status'),
+            'previous_home_runs': previous.get('home_runs'),
+            'previous_away_runs': previous.get('away_runs'),
+            'previous_status': previous.get('status'),
+            'summary': _score(game),
+            'detected_at': change_set.get('synced_at')
+        })
+
+    return events
+
+
+class GameWatcher:
+    def __init__(self, scraper, on_event: Optional[Callable[[Dict], None]] = None,
+                 events_path: Optional[str] = None):
+        """
+        Initialize the watcher
+
+        Args:
+            scraper: WBSCTournamentScraper of the tournament
+            on_event: Called with every score-change event
+            events_path: JSON Lines file the events are appended to
+        """
+        self.scraper = scraper
+        self.on_event = on_event
+        self.events_path = events_path
+        self.state = GameSyncState(scraper.base_url)
+        # State written before summaries carried the start times cannot schedule polls
+        if any('start_utc' not in entry.get('summary', {}) for entry in self.state.games.values()):
+            self.state.reset()
+
+        self.live_interval = LIVE_INTERVAL
+        self.idle_interval = IDLE_INTERVAL
+
+        self.polls = 0
+
+        # Injectable for tests
+        self.sleep = time.sleep
+        self.now = lambda: datetime.now(timezone.utc)
+
+        self.logger = logging.getLogger(__name__)
+
+    def poll_once(self) -> Optional[List[Dict]]:
+        """Sync the games once and emit the events of the changes; None if the sync failed"""
+        self.polls += 1
+        change_set = self.scraper.sync_games(self.state)
+        if change_set is None:
+            return None
+
+        events = change_set_events(change_set)
+        for event in events:
+            self._emit(event)
+        # The changes are only marked as seen once their events are out
+        self.state.commit()
+        return events
+
+    def _emit(self, event: Dict):
+        self.logger.info(f"{event['type']}: {event['summary']} [{event['status']}]")
+
+        if self.events_path:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.events_path)), exist_ok=True)
+                with open(self.events_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(event, ensure_ascii=False) + '\n')
+            except OSError as e:
+                self.logger.warning(f"Could not write event to {self.events_path}: {e}")
+
+        if self.on_event:
+            try:
+                self.on_event(event)
+            except Exception as e:
+                self.logger.error(f"Error in event handler: {e}")
+
+    def _retry_delay(self, failures: int) -> float:
+        """Backoff after failed polls: the idle interval, doubled per further failure"""
+        return min(self.idle_interval * 2 ** max(failures - 1, 0), max(MAX_RETRY_INTERVAL, self.idle_interval))
+
+    def run(self, max_polls: Optional[int] = None):
+        """Poll until the tournament is finished (or max_polls, or Ctrl+C)"""
+        failures = 0
+        try:
+            while max_polls is None or self.polls < max_polls:
+                try:
+                    events = self.poll_once()
+                except Exception as e:
+                    events = None
+                    self.logger.error(f"Error polling games: {e}")
+
+                # The sync state holds status and start of every game
+                schedule = [entry.get('summary', {}) for entry in self.state.games.values()]
+                if events is None or not schedule:
+                    # Without a successful sync there is no schedule to tell
+                    # whether the tournament is over - retry
+                    failures += 1
+                    delay, reason = self._retry_delay(failures), 'retry'
+                else:
+                    failures = 0
+                    delay, reason = next_poll_delay(schedule, self.now(), self.live_interval, self.idle_interval)
+                    if delay is None:
+                        self.logger.info("No live or scheduled games left, stopping")
+                        break
+
+                self.logger.info(f"Next poll in {delay:.0f}s ({reason})")
+                if max_polls is not None and self.polls >= max_polls:
+                    break
+                self.sleep(delay)
+
+        except KeyboardInterrupt:
+            self.logger.info("Watch stopped")
@@ -0,0 +1,232 @@
+"""
+Stats endpoint discovery through Chrome DevTools network logging
+If the stats table is filled by an XHR, the browser is only needed once to
+find that JSON endpoint; afterwards its pages are fetched with plain HTTP.
+Endpoint patterns are cached per domain and category so later runs skip the
+browser.
+"""
+
+import json
+import os
+import threading
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+DEFAULT_ENDPOINT_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '.cache', 'stats_endpoints.json')
+
+# Headers sent when replaying the endpoint outside the browser
+XHR_HEADERS = {
+    'X-Requested-With': 'XMLHttpRequest',
+    'Accept': 'application/json, text/javascript, */*; q=0.01'
+}
+
+# Page size requested from endpoints with start/length paging (DataTables server-side)
+MAX_PAGE_LENGTH = 1000
+
+logger = logging.getLogger(__name__)
+
+
+def enable_network_capture(driver):
+    """Turn on the DevTools Network domain (needs performance logging on the driver)"""
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.get_log('performance')  # Drop events from before this point
+
+
+def collect_json_responses(driver) -> List[Tuple[str, object]]:
+    """Decoded JSON bodies of all XHR/fetch responses seen since enable_network_capture()"""
+    responses = []
+
+    for entry in driver.get_log('performance'):
+        try:
+            message = json.loads(entry['message'])['message']
+        except (KeyError, ValueError):
+            continue
+
+        if message.get('method') != 'Network.responseReceived':
+            continue
+
+        params = message.get('params', {})
+        response = params.get('response', {})
+        if params.get('type') not in ('XHR', 'Fetch') or 'json' not in response.get('mimeType', ''):
+            continue
+
+        try:
+            body = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': params['requestId']})
+            responses.append((response['url'], json.loads(body.get('body', ''))))
+        except Exception as e:
+            logger.debug(f"Could not read response body for {response.get('url')}: {e}")
+
+    return responses
+
+
+def find_records(payload) -> Tuple[Optional[str], List]:
+    """
+    Locate the list of table records in a JSON payload
+
+    Returns:
+        (key holding the records or None for a top-level list, records)
+    """
+    if isinstance(payload, list):
+        return None, payload
+
+    if not isinstance(payload, dict):
+        return None, []
+
+    # DataTables server-side responses keep the rows in "data"
+    best_key, best_records = None, []
+    for key, value in payload.items():
+        if isinstance(value, list) and value and isinstance(value[0], (dict, list)):
+            if key == 'data' or len(value) > len(best_records):
+                best_key, best_records = key, value
+                if key == 'data':
+                    break
+
+    return best_key, best_records
+
+
+def names_category(url: str, payload, category: str) -> bool:
+    """Whether a captured response names the stats category in its URL or payload"""
+    if category.lower() in url.lower():
+        return True
+    return isinstance(payload, dict) and str(payload.get('category', '')).lower() == category.lower()
+
+
+def find_table_endpoint(responses: List[Tuple[str, object]], category: Optional[str] = None) -> Optional[Dict]:
+    """Pick the captured response that carries the most table records (preferring ones naming the category)"""
+    if category:
+        matching = [(url, payload) for url, payload in responses if names_category(url, payload, category)]
+        responses = matching or responses
+
+    best = None
+
+    for url, payload in responses:
+        records_key, records = find_records(payload)
+        if records and (best is None or len(records) > best['record_count']):
+            best = {'url': url, 'records_key': records_key, 'record_count': len(records)}
+
+    return best
+
+
+def _with_query(url: str, **params) -> str:
+    """Return the URL with the given query parameters replaced"""
+    parts = urlparse(url)
+    query = dict(parse_qsl(parts.query, keep_blank_values=True))
+    query.update({key: str(value) for key, value in params.items()})
+    return urlunparse(parts._replace(query=urlencode(query)))
+
+
+def fetch_endpoint_records(http_client, url: str, records_key: Optional[str], max_pages: int = 100) -> List:
+    """
+    Fetch every record of a captured endpoint with plain HTTP
+
+    Supports start/length paging (DataTables server-side), page paging
+    (Laravel paginator) and single-response endpoints.
+    """
+    query = dict(parse_qsl(urlparse(url).query))
+    records = []
+
+    for page_index in range(max_pages):
+        if 'start' in query and 'length' in query:
+            page_url = _with_query(url, start=page_index * MAX_PAGE_LENGTH, length=MAX_PAGE_LENGTH)
+        elif 'page' in query:
+            page_url = _with_query(url, page=page_index + 1)
+        elif page_index == 0:
+            page_url = url
+        else:
+            break
+
+        response = http_client.get(page_url, headers=XHR_HEADERS)
+        response.raise_for_status()
+        payload = response.json()
+
+        page_records = payload.get(records_key, []) if records_key else payload
+        if not page_records:
+            break
+        records.extend(page_records)
+
+        # Stop at the announced total when the endpoint reports one
+        total = payload.get('recordsFiltered', payload.get('recordsTotal', payload.get('total'))) \
+            if isinstance(payload, dict) else None
+        if total is not None and len(records) >= int(total):
+            break
+        if isinstance(payload, dict) and payload.get('last_page') and page_index + 1 >= int(payload['last_page']):
+            break
+
+    return records
+
+
+class EndpointCache:
+    def __init__(self, path: str = DEFAULT_ENDPOINT_CACHE):
+        """
+        Initialize the per-domain and category endpoint cache
+
+        Args:
+            path: JSON file holding the discovered endpoints
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _load_all(self) -> Dict:
+        """Endpoints by domain and category"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                endpoints = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        # Older caches kept a single endpoint per domain
+        return {domain: {entry['category']: entry} if 'template' in entry else entry
+                for domain, entry in endpoints.items()}
+
+    def get(self, domain: str, tournament: str, category: str) -> Optional[Dict]:
+        """
+        Endpoint for the tournament and category, if the cached pattern fits
+
+        Returns:
+            Endpoint dict with a concrete 'url', or None
+        """
+        # Array records follow the headers of the category's own table, so
+        # endpoints are never shared between categories
+        with self._lock:
+            endpoint = self._load_all().get(domain, {}).get(category)
+
+        if not endpoint:
+            return None
+
+        template = endpoint['template']
+        if '{tournament}' not in template and endpoint.get('tournament') != tournament:
+            return None
+
+        url = template.replace('{tournament}', tournament).replace('{category}', category)
+        return {**endpoint, 'url': url}
+
+    def store(self, domain: str, tournament: str, category: str, endpoint: Dict):
+        """Store a discovered endpoint as the category's pattern for the whole domain"""
+        template = endpoint['url']
+        if tournament and tournament in template:
+            template = template.replace(tournament, '{tournament}')
+        if f"={category}" in template:
+            template = template.replace(f"={category}", '={category}')
+
+        entry = {
+            'template': template,
+            'records_key': endpoint.get('records_key'),
+            'headers': endpoint.get('headers', []),
+            'tournament': tournament,
+            'category': category,
+            'discovered_at': datetime.now().isoformat()
+        }
+
+        with self._lock:
+            endpoints = self._load_all()
+            endpoints.setdefault(domain, {})[category] = entry
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(endpoints, f, indent=2, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.warning(f"Could not write endpoint cache: {e}")